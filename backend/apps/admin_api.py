@@ -5,8 +5,19 @@ Unifica todas as funcionalidades administrativas em uma única API,
 removendo redundâncias e padronizando endpoints.
 """
 
-from flask import Flask, jsonify, request, make_response, current_app
+from flask import (
+    Flask,
+    Response,
+    jsonify,
+    request,
+    make_response,
+    current_app,
+    has_request_context,
+    stream_with_context,
+)
 from functools import wraps
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
 import os
 import logging
 from datetime import datetime, timedelta
@@ -18,16 +29,41 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from config.config_loader import CONFIG
 from config import settings
-from backend.services.notification import notify_all
 from backend.apps.integration import BookmakerIntegration
-from backend.core.i18n import get_text
-from backend.database.database import PostgresDatabaseManager
+from backend.core.i18n import get_request_language, get_text
+from backend.database.database import (
+    REPLICA_ROUTER,
+    PostgresDatabaseManager,
+    ping_database,
+)
+from backend.database.counters import counters
+from backend.database.user_cache import login_users
+from backend.database.queries import QUERIES
+from backend.core.pagination import (
+    CursorError,
+    STREAM_FORMATS,
+    STREAM_MIMETYPES,
+    keyset_query,
+    next_cursor,
+    parse_page_args,
+    stream_rows,
+)
+from backend.core.hashing import HashingOverloadedError
+from backend.core.health import HealthRegistry, register_health_routes
+from backend.core.rate_limit import (
+    RateLimitExceeded,
+    rate_limit_class,
+    register_rate_limiting,
+)
+from backend.core.http_cache import register_response_optimizer, use_etag
+from backend.core.serialization import register_json_provider
 from backend.core.auth import (
     AuthManager,
     ROLE_ADMIN,
     ROLE_OPERATOR,
     ROLE_VIEWER,
     ROLE_PERMISSIONS,
+    permission_mask,
 )
 from backend.core.validation import (
     LoginRequestSchema,
@@ -39,6 +75,8 @@ from backend.core.validation import (
     security_headers,
     sanitize_text,
     log_security_event,
+    register_request_body_limit,
+    VALIDATION_STATS,
     ValidationError as CustomValidationError,
 )
 from flask_jwt_extended import (
@@ -62,9 +100,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _replica_session_key():
+    """Usuário da requisição (as escritas dele fixam as leituras no primário)."""
+    if not has_request_context():
+        return None
+    auth = getattr(current_app, "jwt_auth", None)
+    return auth.current_user() if auth is not None else None
+
+
 # Inicializar Flask
 def create_app(config_overrides=None):
     app = Flask(__name__)
+    # jsonify com orjson (ou json padrão), datas ISO 8601 e Decimal como número
+    register_json_provider(app)
     # Carregar config padrão
     app.secret_key = CONFIG["security"]["secret_key"]
     app.config["JWT_SECRET_KEY"] = CONFIG["security"]["secret_key"]
@@ -94,21 +142,66 @@ def create_app(config_overrides=None):
     )
     # Instanciar integração unificada
     app.bookmaker_integration = BookmakerIntegration()
+    # Recarga a quente do config.yaml (project.config_watch_seconds)
+    if not app.testing:
+        CONFIG.start_watching()
+    # Sondas de liveness/readiness (usadas pelo launcher e pelo orquestrador)
+    health = HealthRegistry("admin_api")
+    health.add_check("database", ping_database)
+    register_health_routes(app, health)
+    # ETag/304 e compressão gzip/brotli das respostas (server.compression_*)
+    register_response_optimizer(app)
+    # IP real do cliente atrás do nginx: X-Forwarded-For de server.proxy_hops proxies
+    proxy_hops = int(CONFIG["server"].get("proxy_hops") or 0)
+    if proxy_hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops)
+    # Corpos acima de MAX_CONTENT_LENGTH (server.max_upload_size_mb),
+    # com ou sem Content-Length
+    register_request_body_limit(app)
+    # Janela deslizante por IP/usuário e por classe de rota (security.rate_limit*)
+    register_rate_limiting(app)
+    # Leitura-após-escrita por usuário (postgres.read_after_write_seconds)
+    REPLICA_ROUTER.session_key = _replica_session_key
+
+    @app.errorhandler(HashingOverloadedError)
+    def hashing_overloaded(e):
+        """Rejeita logins na hora quando a fila de verificação de senhas está cheia."""
+        response = jsonify({"error": str(e), "code": "auth_overloaded"})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 503
+
+    @app.errorhandler(RequestEntityTooLarge)
+    def request_entity_too_large(e):
+        """Corpo acima de MAX_CONTENT_LENGTH (inclusive enviado sem Content-Length)."""
+        return (
+            jsonify({"error": "Payload excede o tamanho máximo", "code": "too_large"}),
+            413,
+        )
+
+    @app.errorhandler(RateLimitExceeded)
+    def rate_limit_exceeded(e):
+        """Cliente acima do limite de requisições da janela."""
+        response = jsonify({"error": str(e), "code": "rate_limited"})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 429
 
     # Decoradores para autenticação JWT com base em roles
     def role_required(allowed_roles):
         """Decorador para proteger rotas com base em roles JWT."""
+        # Pré-compilado na decoração da rota, não a cada requisição
+        allowed = frozenset(allowed_roles)
 
         def decorator(fn):
+
             @wraps(fn)
-            @jwt_required()
+            @app.jwt_auth.jwt_required
             def wrapper(*args, **kwargs):
                 identity = get_jwt_identity()
                 if not identity:
                     return jsonify({"error": "Acesso não autorizado"}), 401
 
                 user_role = identity.get("role", ROLE_VIEWER)
-                if user_role not in allowed_roles:
+                if user_role not in allowed:
                     return (
                         jsonify(
                             {
@@ -126,19 +219,20 @@ def create_app(config_overrides=None):
     # Decorator baseado em permissões em vez de roles
     def permission_required(permission):
         """Decorador para proteger rotas com base em permissões específicas."""
+        # Bitmask da rota calculado na inicialização (nome inválido falha aqui)
+        required = permission_mask(permission)
 
         def decorator(fn):
+
             @wraps(fn)
-            @jwt_required()
+            @app.jwt_auth.jwt_required
             def wrapper(*args, **kwargs):
-                identity = get_jwt_identity()
-                if not identity:
+                claims = get_jwt()
+                if not claims.get("sub"):
                     return jsonify({"error": "Acesso não autorizado"}), 401
 
-                user_role = identity.get("role", ROLE_VIEWER)
-
-                # Verificar se o role tem a permissão necessária
-                if not app.jwt_auth.has_permission(user_role, permission):
+                # Verificar no bitmask do token se a permissão está presente
+                if app.jwt_auth.claims_mask(claims) & required != required:
                     return (
                         jsonify(
                             {"error": "Permissão insuficiente", "required": permission}
@@ -166,6 +260,7 @@ def create_app(config_overrides=None):
 
     # Endpoints de autenticação com validação rigorosa
     @app.route("/api/auth/login", methods=["POST"])
+    @rate_limit_class("auth")
     @validate_json_schema(LoginRequestSchema)
     @security_headers()
     def jwt_login(validated_data):
@@ -174,7 +269,7 @@ def create_app(config_overrides=None):
         username = data["username"]
         password = data["password"]
         use_cookie = data.get("use_cookie", False)
-        lang = "pt"  # Substituir get_request_language() por 'pt' (ou idioma padrão)
+        lang = get_request_language()
 
         # Admin login
         if username == current_app.config[
@@ -219,11 +314,10 @@ def create_app(config_overrides=None):
                 )
 
         # Usuário comum (buscar no banco)
-        db = PostgresDatabaseManager()
-        user = db.fetch_one(
-            "SELECT id, username, password_hash, role FROM users WHERE username = %s",
-            (username,),
-        )
+        with PostgresDatabaseManager() as db:
+            user = login_users.get(
+                username, lambda name: db.fetch_one_named("user_login_lookup", (name,))
+            )
         if user and app.jwt_auth.verify_password(password, user["password_hash"]):
             role = user.get("role", ROLE_VIEWER)
             access_token = app.jwt_auth.create_token(
@@ -235,10 +329,11 @@ def create_app(config_overrides=None):
 
             # Atualizar último login
             try:
-                db.execute(
-                    "UPDATE users SET last_login = %s WHERE username = %s",
-                    (datetime.now().isoformat(), user["username"]),
-                )
+                with PostgresDatabaseManager() as db:
+                    db.execute_named(
+                        "user_update_last_login",
+                        (datetime.now().isoformat(), user["username"]),
+                    )
             except:
                 logger.warning(
                     f"Falha ao atualizar último login para usuário {username}"
@@ -287,6 +382,7 @@ def create_app(config_overrides=None):
         return jsonify({"error": get_text("login_failed", lang)}), 401
 
     @app.route("/api/auth/refresh", methods=["POST"])
+    @rate_limit_class("auth")
     @jwt_required(refresh=True)
     def refresh_token():
         """Endpoint para renovar access token usando refresh token."""
@@ -337,27 +433,22 @@ def create_app(config_overrides=None):
         """Endpoint para logout JWT (adiciona token à blacklist)."""
         jti = get_jwt()["jti"]
         exp = get_jwt()["exp"]
-        app.jwt_auth.revoke_token(jti, exp)
-
         identity = get_jwt_identity()
         user = identity.get("user")
+        app.jwt_auth.revoke_token(jti, exp, user)
+
         logger.info(f"Logout JWT realizado para usuário '{user}'")
+        message = get_text("logout_success", get_request_language())
 
         use_cookie = request.json and request.json.get("use_cookie", False)
 
         if use_cookie:
-            response = make_response(
-                jsonify(
-                    {"status": "success", "message": get_text("logout_success", "pt")}
-                )
-            )
+            response = make_response(jsonify({"status": "success", "message": message}))
             unset_jwt_cookies(response)
             return response, 200
         else:
             return (
-                jsonify(
-                    {"status": "success", "message": get_text("logout_success", "pt")}
-                ),
+                jsonify({"status": "success", "message": message}),
                 200,
             )
 
@@ -443,7 +534,6 @@ def create_app(config_overrides=None):
     @admin_required
     def list_user_tokens(username):
         """Lista tokens ativos/revogados de um usuário (apenas admin)."""
-        # O AuthManager deve implementar get_user_tokens para listar tokens (mock ou real)
         tokens_info = app.jwt_auth.get_user_tokens(username)
         return jsonify(tokens_info), 200
 
@@ -465,22 +555,20 @@ def create_app(config_overrides=None):
     @admin_required
     def revoke_user_tokens(username):
         """Revoga todos os tokens para um usuário (apenas admin)."""
-        db = PostgresDatabaseManager()
+        with PostgresDatabaseManager() as db:
+            user_exists = db.fetch_one_named("user_id_by_username", (username,))
+            if not user_exists and username != current_app.config["ADMIN_USERNAME"]:
+                return jsonify({"error": "Usuário não encontrado"}), 404
 
-        user_exists = db.fetch_one(
-            "SELECT id FROM users WHERE username = %s", (username,)
-        )
-        if not user_exists and username != current_app.config["ADMIN_USERNAME"]:
-            return jsonify({"error": "Usuário não encontrado"}), 404
-
-        success = app.jwt_auth.revoke_user_tokens(username, db)
+            revoked = app.jwt_auth.revoke_user_tokens(username, db)
 
-        if success:
+        if revoked is not None:
             return (
                 jsonify(
                     {
                         "status": "success",
                         "message": f"Todos os tokens para {username} foram revogados",
+                        "revoked_count": revoked,
                     }
                 ),
                 200,
@@ -521,12 +609,9 @@ def create_app(config_overrides=None):
     @admin_required
     def admin_dashboard():
         """Dashboard administrativo com dados sensíveis (somente admin)."""
-        db = PostgresDatabaseManager()
-        users_count = db.fetch_one("SELECT COUNT(*) as count FROM users")
-        surebets_count = db.fetch_one("SELECT COUNT(*) as count FROM surebets")
-        recent_surebets = db.fetch(
-            "SELECT * FROM surebets ORDER BY detected_at DESC LIMIT 10"
-        )
+        with PostgresDatabaseManager() as db:
+            counts = counters.get_counts(db)
+            recent_surebets = db.fetch_named("surebets_recent", (10,))
 
         identity = get_jwt_identity()
         return (
@@ -535,8 +620,8 @@ def create_app(config_overrides=None):
                     "user": identity.get("user"),
                     "role": identity.get("role"),
                     "stats": {
-                        "users": users_count["count"] if users_count else 0,
-                        "surebets": surebets_count["count"] if surebets_count else 0,
+                        "users": counts["users"],
+                        "surebets": counts["surebets"],
                     },
                     "recent_surebets": recent_surebets or [],
                     "timestamp": datetime.now().isoformat(),
@@ -549,11 +634,9 @@ def create_app(config_overrides=None):
     @operator_required
     def operator_dashboard():
         """Dashboard para operadores (admins e operadores)."""
-        db = PostgresDatabaseManager()
-        surebets_count = db.fetch_one("SELECT COUNT(*) as count FROM surebets")
-        active_surebets = db.fetch(
-            "SELECT * FROM surebets WHERE status = 'active' ORDER BY detected_at DESC LIMIT 15"
-        )
+        with PostgresDatabaseManager() as db:
+            surebets_count = counters.get(db, "surebets")
+            active_surebets = db.fetch_named("surebets_active_recent", (15,))
 
         identity = get_jwt_identity()
         return (
@@ -562,7 +645,7 @@ def create_app(config_overrides=None):
                     "user": identity.get("user"),
                     "role": identity.get("role"),
                     "stats": {
-                        "surebets": surebets_count["count"] if surebets_count else 0,
+                        "surebets": surebets_count,
                         "active": len(active_surebets) if active_surebets else 0,
                     },
                     "active_surebets": active_surebets or [],
@@ -576,8 +659,8 @@ def create_app(config_overrides=None):
     @viewer_required
     def user_dashboard():
         """Dashboard para usuários básicos (todos os roles têm acesso)."""
-        db = PostgresDatabaseManager()
-        total_opportunities = db.fetch_one("SELECT COUNT(*) as count FROM surebets")
+        with PostgresDatabaseManager() as db:
+            total_opportunities = counters.get(db, "surebets")
 
         identity = get_jwt_identity()
         return (
@@ -586,9 +669,7 @@ def create_app(config_overrides=None):
                     "user": identity.get("user"),
                     "role": identity.get("role"),
                     "stats": {
-                        "opportunities": (
-                            total_opportunities["count"] if total_opportunities else 0
-                        ),
+                        "opportunities": total_opportunities,
                     },
                     "timestamp": datetime.now().isoformat(),
                 }
@@ -604,11 +685,8 @@ def create_app(config_overrides=None):
         user = identity.get("user")
         role = identity.get("role")
 
-        db = PostgresDatabaseManager()
-        user_info = db.fetch_one(
-            "SELECT username, email, role, created_at, last_login FROM users WHERE username = %s",
-            (user,),
-        )
+        with PostgresDatabaseManager() as db:
+            user_info = db.fetch_one_named("user_profile", (user,))
 
         if not user_info:
             # Se for o admin (que não está na tabela users)
@@ -638,110 +716,108 @@ def create_app(config_overrides=None):
     @security_headers()
     def manage_users():
         """Gerenciar usuários (somente admin) com validação rigorosa."""
-        lang = "pt"  # Substituir get_request_language() por 'pt' (ou idioma padrão)
-        db = PostgresDatabaseManager()
-
-        if request.method == "GET":
-            users = (
-                db.fetch(
-                    """
-                SELECT id, username, email, role, created_at, last_login
-                FROM users
-                ORDER BY created_at DESC
-            """
-                )
-                or []
-            )
-            return jsonify({"users": users}), 200
-
-        elif request.method == "POST":
-            try:
-                data = request.get_json()
-                if not data:
-                    return jsonify({"error": "JSON payload obrigatório"}), 400
-
-                # Validar com Pydantic
-                validated_user = UserCreateSchema(**data)
-                user_data = validated_user.dict()
-
-                # Verificar se usuário já existe
-                exists = db.fetch_one(
-                    "SELECT id FROM users WHERE username = %s", (user_data["username"],)
-                )
-
-                if exists:
-                    # Atualizar usuário existente
-                    password_hash = app.jwt_auth.hash_password(user_data["password"])
-                    db.execute(
-                        """
-                        UPDATE users 
-                        SET password_hash = ?, email = ?, role = ?
-                        WHERE username = ?
-                    """,
-                        (
-                            password_hash,
-                            user_data["email"],
-                            user_data["role"],
-                            user_data["username"],
-                        ),
-                    )
-                    logger.info(f"Usuário '{user_data['username']}' atualizado")
-                    return (
-                        jsonify(
-                            {
-                                "status": "success",
-                                "message": "Usuário atualizado com sucesso",
-                            }
-                        ),
-                        200,
+        with PostgresDatabaseManager() as db:
+            if request.method == "GET":
+                users = db.fetch_named("users_list") or []
+                return jsonify({"users": users}), 200
+
+            elif request.method == "POST":
+                try:
+                    data = request.get_json()
+                    if not data:
+                        return jsonify({"error": "JSON payload obrigatório"}), 400
+
+                    # Validar com Pydantic
+                    validated_user = UserCreateSchema(**data)
+                    user_data = validated_user.dict()
+
+                    # Verificar se usuário já existe
+                    exists = db.fetch_one_named(
+                        "user_id_by_username", (user_data["username"],)
                     )
-                else:
-                    # Criar novo usuário
-                    password_hash = app.jwt_auth.hash_password(user_data["password"])
-                    db.insert(
-                        "users",
-                        {
-                            "username": user_data["username"],
-                            "password_hash": password_hash,
-                            "email": user_data["email"],
-                            "role": user_data["role"],
-                            "created_at": datetime.now().isoformat(),
-                            "last_login": None,
-                        },
-                    )
-                    logger.info(
-                        f"Novo usuário '{user_data['username']}' criado com role '{user_data['role']}'"
-                    )
-                    return (
-                        jsonify(
+
+                    if exists:
+                        # Atualizar usuário existente
+                        password_hash = app.jwt_auth.hash_password(
+                            user_data["password"]
+                        )
+                        db.execute(
+                            """
+                            UPDATE users 
+                            SET password_hash = ?, email = ?, role = ?
+                            WHERE username = ?
+                        """,
+                            (
+                                password_hash,
+                                user_data["email"],
+                                user_data["role"],
+                                user_data["username"],
+                            ),
+                        )
+                        login_users.invalidate(user_data["username"])
+                        logger.info(f"Usuário '{user_data['username']}' atualizado")
+                        return (
+                            jsonify(
+                                {
+                                    "status": "success",
+                                    "message": "Usuário atualizado com sucesso",
+                                }
+                            ),
+                            200,
+                        )
+                    else:
+                        # Criar novo usuário
+                        password_hash = app.jwt_auth.hash_password(
+                            user_data["password"]
+                        )
+                        db.insert(
+                            "users",
                             {
-                                "status": "success",
-                                "message": "Usuário criado com sucesso",
-                            }
-                        ),
-                        201,
-                    )
+                                "username": user_data["username"],
+                                "password_hash": password_hash,
+                                "email": user_data["email"],
+                                "role": user_data["role"],
+                                "created_at": datetime.now().isoformat(),
+                                "last_login": None,
+                            },
+                        )
+                        counters.invalidate()
+                        login_users.invalidate(user_data["username"])
+                        logger.info(
+                            f"Novo usuário '{user_data['username']}' criado com role '{user_data['role']}'"
+                        )
+                        return (
+                            jsonify(
+                                {
+                                    "status": "success",
+                                    "message": "Usuário criado com sucesso",
+                                }
+                            ),
+                            201,
+                        )
 
-            except CustomValidationError as e:
-                log_security_event(
-                    "VALIDATION_ERROR", f"User creation validation failed: {str(e)}"
-                )
-                return jsonify({"error": "Dados inválidos", "details": str(e)}), 400
-            except Exception as e:
-                logger.error(f"Erro ao gerenciar usuário: {e}")
-                return jsonify({"error": str(e)}), 500
+                except CustomValidationError as e:
+                    log_security_event(
+                        "VALIDATION_ERROR", f"User creation validation failed: {str(e)}"
+                    )
+                    return jsonify({"error": "Dados inválidos", "details": str(e)}), 400
+                except Exception as e:
+                    logger.error(f"Erro ao gerenciar usuário: {e}")
+                    return jsonify({"error": str(e)}), 500
 
     @app.route("/api/admin/users/<int:user_id>", methods=["DELETE"])
     @admin_required
     def delete_user(user_id):
         """Excluir usuário (somente admin)."""
-        db = PostgresDatabaseManager()
-        user = db.fetch_one("SELECT username FROM users WHERE id = %s", (user_id,))
+        with PostgresDatabaseManager() as db:
+            user = db.fetch_one_named("user_username_by_id", (user_id,))
 
-        if not user:
-            return jsonify({"error": "Usuário não encontrado"}), 404
+            if not user:
+                return jsonify({"error": "Usuário não encontrado"}), 404
 
-        db.execute("DELETE FROM users WHERE id = %s", (user_id,))
+            db.execute("DELETE FROM users WHERE id = %s", (user_id,))
+        counters.invalidate()
+        login_users.invalidate(user["username"])
         logger.info(f"Usuário ID {user_id} ('{user['username']}') excluído")
 
         return (
@@ -752,7 +828,7 @@ def create_app(config_overrides=None):
     @app.route("/api/admin/settings", methods=["GET", "POST"])
     def admin_settings():
         """Gerenciamento de configurações do sistema."""
-        lang = "pt"  # Substituir get_request_language() por 'pt' (ou idioma padrão)
+        lang = get_request_language()
 
         if request.method == "GET":
             safe_settings = {
@@ -789,13 +865,17 @@ def create_app(config_overrides=None):
             data = request.get_json()
             message = data.get("message", "Teste de notificação")
 
+            # Importado sob demanda: o módulo carrega FastAPI e asyncpg
+            from backend.services.notification import notify_all
+
             result = notify_all(message)
+            lang = get_request_language()
 
             if result:
                 logger.info(f"Notificação de teste enviada")
-                return jsonify({"status": get_text("notification_sent", "pt")}), 200
+                return jsonify({"status": get_text("notification_sent", lang)}), 200
             else:
-                return jsonify({"error": get_text("test_fail", "pt")}), 500
+                return jsonify({"error": get_text("test_fail", lang)}), 500
 
         except Exception as e:
             logger.error(f"Erro ao enviar notificação: {e}")
@@ -805,37 +885,47 @@ def create_app(config_overrides=None):
     def admin_db_overview():
         """Visão geral do banco de dados."""
         try:
-            db = PostgresDatabaseManager()
+            with PostgresDatabaseManager() as db:
+                counts = counters.get_counts(db)
+                recent_events = db.fetch_named("events_recent", (5,))
+                recent_surebets = db.fetch_named("surebets_recent", (5,))
 
-            events_count = db.fetch_one("SELECT COUNT(*) as count FROM events")
-            surebets_count = db.fetch_one("SELECT COUNT(*) as count FROM surebets")
-            users_count = db.fetch_one("SELECT COUNT(*) as count FROM users")
-
-            recent_events = db.fetch(
-                "SELECT * FROM events ORDER BY created_at DESC LIMIT 5"
-            )
-            recent_surebets = db.fetch(
-                "SELECT * FROM surebets ORDER BY detected_at DESC LIMIT 5"
-            )
+            # A versão é o conteúdo sem o carimbo de hora: mesmo dado -> 304
+            unchanged = use_etag(counts, recent_events, recent_surebets)
+            if unchanged is not None:
+                return unchanged
 
             overview = {
                 "statistics": {
-                    "total_events": events_count["count"] if events_count else 0,
-                    "total_surebets": surebets_count["count"] if surebets_count else 0,
-                    "total_users": users_count["count"] if users_count else 0,
+                    "total_events": counts["events"],
+                    "total_surebets": counts["surebets"],
+                    "total_users": counts["users"],
                 },
                 "recent_events": recent_events or [],
                 "recent_surebets": recent_surebets or [],
                 "last_updated": datetime.now().isoformat(),
             }
 
-            db.close()
             return jsonify(overview), 200
 
         except Exception as e:
             logger.error(f"Erro ao buscar visão geral do DB: {e}")
             return jsonify({"error": str(e)}), 500
 
+    @app.route("/api/admin/db-queries", methods=["GET"])
+    @admin_required
+    def admin_db_queries():
+        """Métricas das consultas nomeadas e estado das réplicas de leitura."""
+        stats = QUERIES.get_stats()
+        stats["replication"] = REPLICA_ROUTER.get_status()
+        return jsonify(stats), 200
+
+    @app.route("/api/admin/validation-stats", methods=["GET"])
+    @admin_required
+    def admin_validation_stats():
+        """Requisições aceitas/rejeitadas e latência da validação de payloads JSON."""
+        return jsonify(VALIDATION_STATS.get_stats()), 200
+
     @app.route("/api/admin/insert-bet", methods=["POST"])
     @validate_json_schema(BetInsertSchema)
     @security_headers()
@@ -843,22 +933,22 @@ def create_app(config_overrides=None):
         """Insere nova aposta no sistema com validação Pydantic."""
         try:
             bet_data = validated_data  # Dados já validados pelo decorador
-            lang = "pt"  # Substituir get_request_language() por 'pt' (ou idioma padrão)
+            lang = get_request_language()
 
-            db = PostgresDatabaseManager()
             try:
-                bet_id = db.insert(
-                    "bets",
-                    {
-                        "event_name": bet_data["event"],
-                        "market": bet_data["market"],
-                        "selection": bet_data["selection"],
-                        "odd": bet_data["odd"],
-                        "bookmaker": bet_data["bookmaker"],
-                        "created_by": "admin",
-                        "created_at": datetime.now().isoformat(),
-                    },
-                )
+                with PostgresDatabaseManager() as db:
+                    bet_id = db.insert(
+                        "bets",
+                        {
+                            "event_name": bet_data["event"],
+                            "market": bet_data["market"],
+                            "selection": bet_data["selection"],
+                            "odd": bet_data["odd"],
+                            "bookmaker": bet_data["bookmaker"],
+                            "created_by": "admin",
+                            "created_at": datetime.now().isoformat(),
+                        },
+                    )
 
                 logger.info(f"Aposta inserida com ID {bet_id} por 'admin'")
                 return (
@@ -876,26 +966,70 @@ def create_app(config_overrides=None):
             logger.error(f"Erro ao inserir aposta: {e}")
             return jsonify({"error": str(e)}), 500
 
+    def list_with_keyset(select_sql, order_column, key, default_limit):
+        """
+        Lista registros com paginação keyset ou exportação em streaming.
+
+        Parâmetros de URL: ``limit``, ``cursor`` (retornado em ``next_cursor``)
+        e ``format`` (``json``, ``ndjson`` ou ``json-array``).
+        """
+        try:
+            page = parse_page_args(request.args, default_limit)
+        except CursorError as e:
+            return jsonify({"error": str(e)}), 400
+
+        query, params = keyset_query(
+            select_sql, order_column, page["position"], page["limit"]
+        )
+        db = PostgresDatabaseManager()
+
+        if page["format"] in STREAM_FORMATS:
+
+            def generate():
+                try:
+                    yield from stream_rows(db.stream(query, params), page["format"])
+                finally:
+                    db.close()
+
+            return Response(
+                stream_with_context(generate()),
+                mimetype=STREAM_MIMETYPES[page["format"]],
+            )
+
+        # Páginas têm só duas formas (primeira / após cursor):
+        # ambas viram consultas preparadas
+        query_name = f"{key}_page_{'after' if page['position'] else 'first'}"
+        QUERIES.ensure(query_name, query)
+        try:
+            rows = db.fetch_named(query_name, params) or []
+        finally:
+            db.close()
+        return (
+            jsonify(
+                {
+                    key: rows,
+                    "limit": page["limit"],
+                    "next_cursor": next_cursor(rows, order_column, page["limit"]),
+                }
+            ),
+            200,
+        )
+
     @app.route("/api/admin/bets", methods=["GET"])
     @jwt_required()
     def get_bets():
-        """Lista apostas do sistema."""
+        """Lista apostas do sistema (paginação por cursor em created_at, id)."""
         try:
-            db = PostgresDatabaseManager()
-            bets = (
-                db.fetch(
-                    """
-                SELECT b.id, b.event_name, b.market, b.selection, b.odd, 
+            return list_with_keyset(
+                """
+                SELECT b.id, b.event_name, b.market, b.selection, b.odd,
                        b.bookmaker, b.created_by, b.created_at
                 FROM bets b
-                ORDER BY b.created_at DESC
-                LIMIT 100
-            """
-                )
-                or []
+                """,
+                "created_at",
+                "bets",
+                default_limit=100,
             )
-            db.close()
-            return jsonify({"bets": bets}), 200
         except Exception as e:
             logger.error(f"Erro ao buscar apostas: {e}")
             return jsonify({"error": str(e)}), 500
@@ -903,27 +1037,24 @@ def create_app(config_overrides=None):
     @app.route("/api/admin/surebets", methods=["GET"])
     @jwt_required()
     def get_surebets():
-        """Lista surebets detectadas."""
+        """Lista surebets detectadas (paginação por cursor em detected_at, id)."""
         try:
-            db = PostgresDatabaseManager()
-            surebets = (
-                db.fetch(
-                    """
-                SELECT id, event_name, market, profit_percentage, 
+            return list_with_keyset(
+                """
+                SELECT id, event_name, market, profit_percentage,
                        bookmakers, detected_at, status
                 FROM surebets
-                ORDER BY detected_at DESC
-                LIMIT 50
-            """
-                )
-                or []
+                """,
+                "detected_at",
+                "surebets",
+                default_limit=50,
             )
-            return jsonify({"surebets": surebets}), 200
         except Exception as e:
             logger.error(f"Erro ao buscar surebets: {e}")
             return jsonify({"error": str(e)}), 500
 
     @app.route("/api/opportunities", methods=["POST"])
+    @rate_limit_class("scrape")
     @validate_args_schema(SearchParamsSchema)
     @security_headers()
     def get_opportunities():
@@ -1015,6 +1146,7 @@ def create_app(config_overrides=None):
         return 0.0
 
     @app.route("/api/games/live", methods=["GET"])
+    @rate_limit_class("scrape")
     def get_live_games():
         """Busca jogos ao vivo."""
         try:
@@ -1045,6 +1177,7 @@ def create_app(config_overrides=None):
             return jsonify({"error": str(e)}), 500
 
     @app.route("/api/games/upcoming", methods=["GET"])
+    @rate_limit_class("scrape")
     def get_upcoming_games():
         """Busca jogos futuros."""
         try:
@@ -1126,14 +1259,32 @@ def create_app(config_overrides=None):
     return app
 
 
-# Instanciar app padrão para produção
-app = create_app()
+_app = None
+
+
+def get_app():
+    """App padrão do processo, criado no primeiro uso."""
+    global _app
+    if _app is None:
+        _app = create_app()
+    return _app
+
+
+def __getattr__(name):
+    # ``admin_api.app`` é criado sob demanda: importar o módulo (testes,
+    # ferramentas) não inicializa adaptadores, JWT nem o observador do config
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # --- Testes automatizados ---
 # Os testes de integração já cobrem login, refresh, logout, expiração, roles e blacklist.
 # Certifique-se de rodar: pytest backend/tests/integration/test_jwt_auth.py -v
 
+
 if __name__ == "__main__":
+    app = get_app()
     if not app.config.get("ADMIN_PASSWORD_HASH"):
         logger.critical(
             "ADMIN_PASSWORD_HASH não definido. API não pode iniciar de forma segura."
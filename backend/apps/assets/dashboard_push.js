@@ -0,0 +1,14 @@
+// Canal de push do dashboard: a cada nova versão do snapshot no servidor,
+// dispara o callback que envia à tabela apenas as linhas alteradas.
+(function () {
+    if (!window.EventSource) {
+        return; // Sem SSE: o dcc.Interval de segurança continua atualizando
+    }
+    var source = new EventSource("/dashboard/stream");
+    source.addEventListener("snapshot", function () {
+        var trigger = document.getElementById("push-trigger");
+        if (trigger) {
+            trigger.click();
+        }
+    });
+})();
@@ -11,18 +11,27 @@ import dash_bootstrap_components as dbc
 import sys
 import os
 import logging
+import threading
+import time
 import dash
 import plotly.graph_objs as go
-from datetime import datetime
-from typing import Dict, List, Any
+from flask import Response, stream_with_context
 
 # Adicionar o diretório raiz ao sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 # Importar módulos unificados
+from backend.core.health import HealthRegistry, register_health_routes
 from backend.core.i18n import I18n
-from adapters import get_all_adapters, get_bookmaker_names
+from backend.services.dashboard_charts import DashboardCharts
+from backend.services.dashboard_data import (
+    DashboardDataService,
+    diff_rows,
+    query_opportunities,
+)
+from backend.apps.adapters import get_all_adapters, get_bookmaker_names
 from config import settings
+from config.config_loader import CONFIG
 
 # Configuração de logging
 logging.basicConfig(
@@ -42,6 +51,22 @@ i18n = I18n()
 BOOKMAKER_ADAPTERS = get_all_adapters()
 BOOKMAKERS = [{"label": name.title(), "value": name} for name in get_bookmaker_names()]
 
+# Snapshot de oportunidades/jogos compartilhado por todas as sessões do processo
+DASHBOARD_DATA = DashboardDataService(lambda: BOOKMAKER_ADAPTERS)
+DASHBOARD_CHARTS = DashboardCharts()
+
+# Canal de push (SSE): reconexão do EventSource e intervalo de keep-alive
+PUSH_RETRY_MS = 3000
+PUSH_KEEPALIVE_SECONDS = 15
+# Cada stream ocupa uma thread do worker gthread: encerra após um tempo fixo
+# (o EventSource reconecta sozinho) e usa no máximo metade das threads, para
+# que sobrem threads para os callbacks. As threads só mudam com reinício.
+PUSH_STREAM_LIFETIME_SECONDS = 300
+PUSH_BUSY_RETRY_MS = 30000
+PUSH_MAX_STREAMS = max(int(CONFIG["server"].get("threads") or 2) // 2, 1)
+_push_streams = 0
+_push_streams_lock = threading.Lock()
+
 # Inicializar aplicação Dash
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.DARKLY])
 app.title = "Surebets Hunter Pro"
@@ -199,10 +224,17 @@ def create_opportunities_card() -> dbc.Card:
                                         "color": "lightgreen",
                                     }
                                 ],
-                                sort_action="native",
-                                filter_action="native",
+                                # Paginação, ordenação e filtro feitos no servidor
+                                sort_action="custom",
+                                sort_mode="single",
+                                sort_by=[],
+                                filter_action="custom",
+                                filter_query="",
+                                page_action="custom",
+                                page_current=0,
+                                page_size=settings.UI_ITEMS_PER_PAGE,
+                                page_count=0,
                                 row_selectable="single",
-                                page_size=15,
                                 export_format="csv",
                             )
                         ],
@@ -529,10 +561,19 @@ app.layout = dbc.Container(
                                 ),
                                 create_stats_card(),
                                 create_charts_card(),
-                                # Intervalo para atualização automática
+                                # Versão do snapshot exibida na tabela (base dos deltas)
+                                dcc.Store(id="opportunities-version", data=""),
+                                # Clicado por assets/dashboard_push.js
+                                # a cada novo snapshot
+                                html.Button(
+                                    id="push-trigger",
+                                    n_clicks=0,
+                                    style={"display": "none"},
+                                ),
+                                # Atualização de segurança caso o canal de push caia
                                 dcc.Interval(
                                     id="refresh-interval",
-                                    interval=5000,  # 5 segundos
+                                    interval=30000,  # 30 segundos
                                     n_intervals=0,
                                 ),
                             ]
@@ -722,125 +763,203 @@ app.layout = dbc.Container(
 @app.callback(
     [
         Output("opportunities-table", "data"),
+        Output("opportunities-table", "page_count"),
+        Output("opportunities-version", "data"),
         Output("error-message", "children"),
         Output("total-opportunities", "children"),
         Output("avg-profit", "children"),
     ],
     [
         Input("refresh-interval", "n_intervals"),
+        Input("push-trigger", "n_clicks"),
         Input("manual-refresh", "n_clicks"),
         Input("sport-filter", "value"),
         Input("profit-slider", "value"),
         Input("bookmaker-filter", "value"),
         Input("search-input", "value"),
+        Input("opportunities-table", "page_current"),
+        Input("opportunities-table", "page_size"),
+        Input("opportunities-table", "sort_by"),
+        Input("opportunities-table", "filter_query"),
     ],
+    [State("opportunities-version", "data")],
     prevent_initial_call=False,
 )
 def update_opportunities_table(
-    n_intervals, n_clicks, sports, min_profit, bookmakers, search
+    n_intervals,
+    n_pushes,
+    n_clicks,
+    sports,
+    min_profit,
+    bookmakers,
+    search,
+    page_current,
+    page_size,
+    sort_by,
+    filter_query,
+    shown_version,
 ):
-    """Atualiza a tabela de oportunidades com dados unificados."""
+    """
+    Atualiza a página atual da tabela de oportunidades a partir do snapshot
+    compartilhado.
+
+    Filtros, ordenação e paginação são resolvidos no servidor sobre os
+    índices do snapshot; o navegador recebe só a página exibida. Em
+    atualizações automáticas envia apenas o delta (``Patch``) entre a versão
+    exibida e a atual; mudanças de filtro ou de página enviam a página toda.
+    """
     try:
-        # Coletar dados de todos os adaptadores
-        all_opportunities = []
-
-        for adapter_name, adapter in BOOKMAKER_ADAPTERS.items():
-            if not bookmakers or adapter_name in bookmakers:
-                for sport in sports or ["soccer"]:
-                    live_odds = adapter.get_live_odds(sport, limit=20)
-
-                    for event in live_odds:
-                        for market in event.get("markets", []):
-                            # Calcular surebet mock (simplificado)
-                            selections = market.get("selections", [])
-                            if len(selections) >= 2:
-                                profit = calculate_mock_profit(selections)
-
-                                if profit >= min_profit:
-                                    opportunity = {
-                                        "event": f"🏟️ {event['name']}",
-                                        "market": market["name"],
-                                        "profit": f"{profit:.2f}%",
-                                        "bookmakers": adapter_name.title(),
-                                        "actions": f"[📊 Detalhes](#{event['id']})",
-                                    }
+        triggered = dash.callback_context.triggered_id
+        if triggered == "manual-refresh":
+            snapshot = DASHBOARD_DATA.refresh()
+        else:
+            snapshot = DASHBOARD_DATA.get_snapshot()
+        incremental = (
+            triggered in ("refresh-interval", "push-trigger") and shown_version
+        )
+        if incremental and snapshot.version == shown_version:
+            return [dash.no_update] * 6
 
-                                    # Filtro de busca
-                                    if (
-                                        not search
-                                        or search.lower()
-                                        in opportunity["event"].lower()
-                                        or search.lower()
-                                        in opportunity["market"].lower()
-                                    ):
-                                        all_opportunities.append(opportunity)
+        page_size = page_size or settings.UI_ITEMS_PER_PAGE
+        query = dict(
+            sports=sports,
+            min_profit=min_profit,
+            bookmakers=bookmakers,
+            search=search,
+            sort_by=sort_by,
+            filter_query=filter_query,
+            page=page_current,
+            page_size=page_size,
+        )
+        page_rows, total_ops, avg_profit = query_opportunities(snapshot, **query)
+        page_count = max((total_ops + page_size - 1) // page_size, 1)
+        error = (
+            dbc.Alert(f"Erro: {snapshot.error}", color="warning")
+            if snapshot.error
+            else ""
+        )
 
-        # Estatísticas
-        total_ops = len(all_opportunities)
-        avg_profit = sum(
-            float(op["profit"].replace("%", "")) for op in all_opportunities
-        ) / max(total_ops, 1)
+        data = page_rows
+        shown = DASHBOARD_DATA.get_version(shown_version) if incremental else None
+        if shown is not None:
+            old_rows, _, _ = query_opportunities(shown, **query)
+            data = opportunities_patch(old_rows, page_rows)
 
-        return all_opportunities, "", str(total_ops), f"{avg_profit:.1f}%"
+        return (
+            data,
+            page_count,
+            snapshot.version,
+            error,
+            str(total_ops),
+            f"{avg_profit:.1f}%",
+        )
 
     except Exception as e:
         logger.error(f"Erro ao atualizar oportunidades: {e}")
-        return [], dbc.Alert(f"Erro: {str(e)}", color="danger"), "0", "0%"
+        return [], 1, "", dbc.Alert(f"Erro: {str(e)}", color="danger"), "0", "0%"
+
 
+def opportunities_patch(old_rows, new_rows):
+    """
+    ``Patch`` com as linhas alteradas, ou a lista completa se mudou quase tudo
+    ou se a ordem das linhas mudou.
+    """
+    operations = diff_rows(old_rows, new_rows)
+    if operations is None:
+        return new_rows
+    removed, changed, added = operations
+    if len(removed) + len(changed) + len(added) > len(new_rows) // 2:
+        return new_rows
+    patch = dash.Patch()
+    for index in removed:
+        del patch[index]
+    for index, row in changed:
+        patch[index] = row
+    for row in added:
+        patch.append(row)
+    return patch
 
-def calculate_mock_profit(selections: List[Dict[str, Any]]) -> float:
-    """Calcula lucro mock para demonstração."""
-    if len(selections) < 2:
-        return 0
 
-    # Fórmula simplificada de surebet
-    inverse_sum = sum(1 / selection["odds"] for selection in selections[:2])
-    if inverse_sum < 1:
-        return (1 - inverse_sum) * 100
-    return 0
+def _snapshot_ready():
+    """Pronto quando já existe um snapshot varrido (erros de casas não bloqueiam)."""
+    snapshot = DASHBOARD_DATA.get_snapshot()
+    if snapshot.scanned_at is None:
+        raise RuntimeError("Nenhuma varredura concluída")
+    return {"version": snapshot.version}
+
+
+HEALTH = register_health_routes(app.server, HealthRegistry("dashboard"))
+HEALTH.add_check("snapshot", _snapshot_ready)
+
+
+def _acquire_push_stream():
+    global _push_streams
+    with _push_streams_lock:
+        if _push_streams >= PUSH_MAX_STREAMS:
+            return False
+        _push_streams += 1
+        return True
+
+
+def _release_push_stream():
+    global _push_streams
+    with _push_streams_lock:
+        _push_streams -= 1
+
+
+@app.server.route("/dashboard/stream")
+def dashboard_stream():
+    """
+    Canal SSE: avisa o navegador a cada nova versão do snapshot.
+
+    O stream termina após ``PUSH_STREAM_LIFETIME_SECONDS`` e o EventSource
+    reconecta em ``PUSH_RETRY_MS``. Com ``PUSH_MAX_STREAMS`` abertos no worker,
+    a conexão é encerrada na hora pedindo nova tentativa em
+    ``PUSH_BUSY_RETRY_MS``; enquanto isso o ``dcc.Interval`` segue atualizando.
+    """
+    DASHBOARD_DATA.start_background()
+
+    def events():
+        if not _acquire_push_stream():
+            yield f"retry: {PUSH_BUSY_RETRY_MS}\n\n"
+            return
+        try:
+            deadline = time.monotonic() + PUSH_STREAM_LIFETIME_SECONDS
+            version = DASHBOARD_DATA.get_snapshot().version
+            yield f"retry: {PUSH_RETRY_MS}\nevent: snapshot\ndata: {version}\n\n"
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                current = DASHBOARD_DATA.wait_for_change(
+                    version, min(PUSH_KEEPALIVE_SECONDS, remaining)
+                )
+                if current == version:
+                    # Comentário SSE mantém a conexão viva através de proxies
+                    yield ": ping\n\n"
+                    continue
+                version = current
+                yield f"event: snapshot\ndata: {version}\n\n"
+        finally:
+            _release_push_stream()
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.callback(
     [Output("live-games-table", "data"), Output("upcoming-games-table", "data")],
-    [Input("refresh-games", "n_intervals")],
+    [Input("refresh-games", "n_intervals"), Input("push-trigger", "n_clicks")],
     prevent_initial_call=False,
 )
-def update_games_tables(n_intervals):
-    """Atualiza as tabelas de jogos."""
+def update_games_tables(n_intervals, n_pushes):
+    """Atualiza as tabelas de jogos a partir do snapshot compartilhado."""
     try:
-        live_games = []
-        upcoming_games = []
-
-        for adapter_name, adapter in BOOKMAKER_ADAPTERS.items():
-            # Jogos ao vivo
-            live_data = adapter.get_live_odds("soccer", limit=5)
-            for game in live_data:
-                live_games.append(
-                    {
-                        "name": game["name"],
-                        "status": "AO VIVO",
-                        "start_time": datetime.fromisoformat(
-                            game["start_time"].replace("Z", "+00:00")
-                        ).strftime("%H:%M"),
-                        "bookmaker": adapter_name.title(),
-                    }
-                )
-
-            # Jogos futuros
-            upcoming_data = adapter.get_upcoming_odds("soccer", limit=5)
-            for game in upcoming_data:
-                upcoming_games.append(
-                    {
-                        "name": game["name"],
-                        "status": "PROGRAMADO",
-                        "start_time": datetime.fromisoformat(
-                            game["start_time"].replace("Z", "+00:00")
-                        ).strftime("%d/%m %H:%M"),
-                        "bookmaker": adapter_name.title(),
-                    }
-                )
-
-        return live_games[:10], upcoming_games[:10]
+        snapshot = DASHBOARD_DATA.get_snapshot()
+        return list(snapshot.live_games), list(snapshot.upcoming_games)
 
     except Exception as e:
         logger.error(f"Erro ao atualizar jogos: {e}")
@@ -852,50 +971,28 @@ def update_games_tables(n_intervals):
         Output("profit-distribution-chart", "figure"),
         Output("bookmaker-comparison-chart", "figure"),
     ],
-    [Input("opportunities-table", "data")],
+    [
+        Input("opportunities-version", "data"),
+        Input("sport-filter", "value"),
+        Input("profit-slider", "value"),
+        Input("bookmaker-filter", "value"),
+        Input("search-input", "value"),
+        Input("opportunities-table", "filter_query"),
+    ],
     prevent_initial_call=False,
 )
-def update_charts(opportunities_data):
-    """Atualiza os gráficos de análise."""
-    try:
-        if not opportunities_data:
-            # Gráficos vazios
-            empty_fig = go.Figure()
-            empty_fig.update_layout(title="Aguardando dados...", template="plotly_dark")
-            return empty_fig, empty_fig
-
-        # Gráfico de distribuição de lucros
-        profits = [float(op["profit"].replace("%", "")) for op in opportunities_data]
-        profit_fig = go.Figure(data=[go.Histogram(x=profits, nbinsx=10)])
-        profit_fig.update_layout(
-            title="Distribuição de Lucros",
-            xaxis_title="Lucro (%)",
-            yaxis_title="Frequência",
-            template="plotly_dark",
-        )
+def update_charts(version, sports, min_profit, bookmakers, search, filter_query):
+    """
+    Atualiza os gráficos de análise com todas as oportunidades filtradas.
 
-        # Gráfico de comparação de bookmakers
-        bookmaker_counts = {}
-        for op in opportunities_data:
-            bm = op["bookmakers"]
-            bookmaker_counts[bm] = bookmaker_counts.get(bm, 0) + 1
-
-        bm_fig = go.Figure(
-            data=[
-                go.Bar(
-                    x=list(bookmaker_counts.keys()), y=list(bookmaker_counts.values())
-                )
-            ]
-        )
-        bm_fig.update_layout(
-            title="Oportunidades por Bookmaker",
-            xaxis_title="Bookmaker",
-            yaxis_title="Quantidade",
-            template="plotly_dark",
+    As figuras vêm do cache por versão do snapshot e filtros (``DASHBOARD_CHARTS``).
+    """
+    try:
+        snapshot = DASHBOARD_DATA.get_version(version) or DASHBOARD_DATA.get_snapshot()
+        return DASHBOARD_CHARTS.figures(
+            snapshot, sports, min_profit, bookmakers, search, filter_query
         )
 
-        return profit_fig, bm_fig
-
     except Exception as e:
         logger.error(f"Erro ao atualizar gráficos: {e}")
         empty_fig = go.Figure()
@@ -926,4 +1023,5 @@ def admin_login(n_clicks, password, session_data):
 
 if __name__ == "__main__":
     logger.info("Iniciando dashboard consolidado do Surebets Hunter Pro")
+    DASHBOARD_DATA.start_background()
     app.run_server(debug=settings.DEBUG, host="0.0.0.0", port=settings.PORT)
@@ -9,11 +9,17 @@ import logging
 from datetime import datetime, timedelta
 import random
 from config.config_loader import CONFIG
-from backend.services.scraper import BettingScraper
 
 logger = logging.getLogger(__name__)
 
 
+def _new_scraper():
+    """Cria o scraper; o Selenium só é importado quando há scraping de fato."""
+    from backend.services.scraper import BettingScraper
+
+    return BettingScraper()
+
+
 class UnifiedBookmakerAdapter:
     def __init__(self, bookmaker_name: str):
         self.bookmaker_name = bookmaker_name
@@ -53,7 +59,7 @@ class UnifiedBookmakerAdapter:
         if self.is_mock_mode:
             return self._generate_mock_live_odds(sport, limit)
         # Scraping real por casa de aposta
-        scraper = BettingScraper()
+        scraper = _new_scraper()
         odds = []
         if self.bookmaker_name == "bet365":
             odds = scraper.get_odds_bet365("https://www.bet365.com/#/IP/EV1")
@@ -82,7 +88,7 @@ class UnifiedBookmakerAdapter:
     ) -> List[Dict[str, Any]]:
         if self.is_mock_mode:
             return self._generate_mock_upcoming_odds(sport, limit)
-        scraper = BettingScraper()
+        scraper = _new_scraper()
         odds = []
         if self.bookmaker_name == "bet365":
             odds = scraper.get_odds_bet365("https://www.bet365.com/#/AC/B1/C1/D8/E765_F196/G40/")
@@ -167,7 +173,17 @@ class BookmakerIntegration:
     def __init__(self, bookmakers=None):
         if bookmakers is None:
             bookmakers = ["bet365", "pinnacle", "betfair", "superodds"]
-        self.adapters = {name: UnifiedBookmakerAdapter(name) for name in bookmakers}
+        self.bookmakers = list(bookmakers)
+        self._adapters = None
+
+    @property
+    def adapters(self) -> Dict[str, UnifiedBookmakerAdapter]:
+        # Adaptadores construídos no primeiro uso, não na criação do app
+        if self._adapters is None:
+            self._adapters = {
+                name: UnifiedBookmakerAdapter(name) for name in self.bookmakers
+            }
+        return self._adapters
 
     def get_adapter(self, name: str) -> UnifiedBookmakerAdapter:
         return self.adapters[name]
@@ -1,9 +1,25 @@
-from flask_jwt_extended import JWTManager, create_access_token, create_refresh_token
-from werkzeug.security import check_password_hash, generate_password_hash
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, g, request
+import flask_jwt_extended
+from flask_jwt_extended import (
+    JWTManager,
+    create_access_token,
+    create_refresh_token,
+    get_jwt,
+    get_jwt_header,
+    get_jwt_identity,
+    verify_jwt_in_request,
+)
+from backend.core.hashing import PASSWORD_HASHER
 from datetime import timedelta, datetime
-import redis
+import hashlib
+import heapq
 import os
 import logging
+import threading
+import time
+import uuid
 from config.config_loader import CONFIG
 
 # Configuração de logging
@@ -45,16 +61,186 @@ ROLE_PERMISSIONS = {
     },
 }
 
+# Bits de permissão usados no claim compacto ``perms`` dos tokens
+PERMISSION_BITS = {
+    name: 1 << index
+    for index, name in enumerate(
+        [
+            "can_manage_users",
+            "can_delete_data",
+            "can_configure_system",
+            "can_manage_odds",
+            "can_place_bets",
+            "can_view_reports",
+            "can_view_dashboard",
+        ]
+    )
+}
+
+
+def permissions_to_mask(permissions):
+    """Converte um dicionário ``{permissão: bool}`` em bitmask."""
+    mask = 0
+    for name, allowed in permissions.items():
+        if allowed:
+            mask |= PERMISSION_BITS[name]
+    return mask
+
+
+def mask_to_permissions(mask):
+    """Converte um bitmask de volta no dicionário de permissões."""
+    return {name: bool(mask & bit) for name, bit in PERMISSION_BITS.items()}
+
+
+def permission_mask(*permissions):
+    """Bitmask exigido por uma rota; falha na inicialização para nomes desconhecidos."""
+    unknown = [name for name in permissions if name not in PERMISSION_BITS]
+    if unknown:
+        raise ValueError(f"Permissões desconhecidas: {', '.join(unknown)}")
+    mask = 0
+    for name in permissions:
+        mask |= PERMISSION_BITS[name]
+    return mask
+
+
+ROLE_PERMISSION_MASKS = {
+    role: permissions_to_mask(permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+# Tokens decodificados mantidos em memória por AuthManager
+DECODED_TOKEN_CACHE_SIZE = 4096
+# Um acerto no cache grava em ``g`` os atributos privados que o
+# flask_jwt_extended preenche em ``verify_jwt_in_request`` e lê em get_jwt(),
+# get_jwt_header() e current_user. O formato foi conferido nesta versão,
+# fixada no requirements.txt; em outra, o cache fica desligado até ser
+# revalidado (TestDecodedTokenCache falha na atualização).
+TOKEN_CACHE_JWT_EXTENDED_VERSION = "4.7.1"
+
 # Exemplo de uso de configuração:
 REDIS_URL = CONFIG.get("redis", {}).get("url", "redis://localhost:6379/0")
 
+# Cache local de JTIs revogados, sincronizado via pub/sub do Redis
+BLACKLIST_KEY_PREFIX = "token_blacklist:"
+BLACKLIST_CHANNEL = "token_blacklist:events"
+BLACKLIST_LOCAL_CACHE = bool(CONFIG.get("redis", {}).get("blacklist_local_cache", True))
+BLACKLIST_RESYNC_SECONDS = 5.0
+BLACKLIST_PING_SECONDS = 15.0
+
+# Índices de tokens no Redis (ZSETs com score = expiração do token)
+REVOKED_INDEX_KEY = "tokens:revoked"
+REVOKED_INDEX_MIGRATED_KEY = "tokens:revoked:migrated"
+USER_ISSUED_KEY = "tokens:user:{username}:issued"
+USER_REVOKED_KEY = "tokens:user:{username}:revoked"
+# Os índices por usuário vivem pelo menos tanto quanto o token mais longo (refresh)
+TOKEN_INDEX_TTL_SECONDS = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRES_DAYS", "30")) * 86400
+
+
+class ExpiringStore:
+    """
+    Mapa chave -> timestamp de expiração com remoção preguiçosa.
+
+    Consultas são O(1) (comparam a expiração gravada com o relógio); a
+    remoção das chaves vencidas usa um min-heap ordenado pela expiração e
+    custa O(log n) amortizado por inserção. Threads de requisição e o
+    assinante do Redis usam a mesma instância, então toda leitura e escrita
+    acontece sob ``_lock``.
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._expiry = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def add(self, key, exp_timestamp):
+        with self._lock:
+            self._add(key, exp_timestamp)
+
+    def _add(self, key, exp_timestamp):
+        exp_timestamp = float(exp_timestamp)
+        self._expiry[key] = exp_timestamp
+        heapq.heappush(self._heap, (exp_timestamp, key))
+        self._purge(limit=2)
+
+    def contains(self, key):
+        with self._lock:
+            exp = self._expiry.get(key)
+        return exp is not None and exp > self._clock()
+
+    __contains__ = contains
+
+    def get(self, key, default=None):
+        with self._lock:
+            exp = self._expiry.get(key)
+        return exp if exp is not None and exp > self._clock() else default
+
+    def purge(self, limit=None):
+        """Remove chaves vencidas (no máximo ``limit``) e retorna quantas saíram."""
+        with self._lock:
+            return self._purge(limit)
+
+    def _purge(self, limit=None):
+        now = self._clock()
+        heap = self._heap
+        removed = 0
+        while heap and heap[0][0] <= now and (limit is None or removed < limit):
+            exp, key = heapq.heappop(heap)
+            # Entradas antigas de chaves regravadas com outra expiração são ignoradas
+            if self._expiry.get(key) == exp:
+                del self._expiry[key]
+                removed += 1
+        if len(heap) > 2 * len(self._expiry) + 64:
+            self._compact()
+        return removed
+
+    def _compact(self):
+        self._heap = [(exp, key) for key, exp in self._expiry.items()]
+        heapq.heapify(self._heap)
+
+    def update(self, items):
+        with self._lock:
+            for key, exp in items:
+                self._add(key, exp)
+
+    def items(self):
+        now = self._clock()
+        with self._lock:
+            return [(key, exp) for key, exp in self._expiry.items() if exp > now]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._expiry)
+
 
 class TokenBlacklist:
-    def __init__(self, redis_url=None):
-        self.redis = None
+    """
+    Blacklist de JTIs revogados e índice de tokens emitidos por usuário.
+
+    No Redis, cada revogação grava ``token_blacklist:<jti>`` (com TTL) e entra
+    no ZSET global ``tokens:revoked``; cada usuário tem ZSETs de JTIs emitidos
+    e revogados. Todos usam a expiração do token como score, de modo que
+    tamanho, listagem e revogação em massa nunca varrem o keyspace.
+
+    Com Redis, mantém também uma cópia local dos JTIs revogados: um assinante
+    do canal ``BLACKLIST_CHANNEL`` aplica cada revogação publicada e, a cada
+    (re)conexão, recarrega o conjunto completo do Redis. Enquanto o assinante
+    está sincronizado, ``is_blacklisted`` responde localmente; caso contrário
+    consulta o Redis com ``EXISTS``.
+
+    O assinante pertence ao processo que o iniciou: com ``preload_app`` o app é
+    criado no mestre do Gunicorn, então cada worker descarta a cópia herdada no
+    fork e inicia o próprio assinante no primeiro uso.
+    """
+
+    def __init__(self, redis_url=None, client=None, local_cache=BLACKLIST_LOCAL_CACHE):
+        self.redis = client
         if redis_url is None:
             redis_url = REDIS_URL
-        if redis_url:
+        if self.redis is None and redis_url:
+            # Importado só quando a blacklist usa Redis de fato
+            import redis
+
             try:
                 self.redis = redis.from_url(redis_url)
                 logger.info(f"Conectado ao Redis na URL: {redis_url}")
@@ -66,89 +252,373 @@ class TokenBlacklist:
                 )
                 self.redis = None
 
+        self._local = ExpiringStore()
+        self._synced = False
+        self._stop = threading.Event()
+        self._listener = None
+        self._listener_pid = None
+        self._local_cache = bool(self.redis and local_cache and client is None)
+        self.local_hits = 0
+        self.redis_checks = 0
+
         if not self.redis:
             # Fallback para uma implementação em memória para desenvolvimento
             logger.warning("Usando implementação em memória para blacklist de tokens")
-            self._blacklist = {}
+            self._blacklist = ExpiringStore()
+            self._user_tokens = {}
+        else:
+            self._ensure_listener()
+
+    # ============= CACHE LOCAL =============
+
+    def _ensure_listener(self):
+        """Inicia o assinante no processo atual (de novo nos workers, após o fork)."""
+        if not self._local_cache:
+            return
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        if self._listener_pid is not None:
+            # Processo filho: a thread do assinante não sobrevive ao fork e a cópia
+            # herdada (e a trava dela) pode ter parado no meio de uma atualização
+            self._synced = False
+            self._local = ExpiringStore()
+            self._stop = threading.Event()
+            self._listener = None
+        self._listener_pid = pid
+        self.start_listener()
+
+    def start_listener(self):
+        """Inicia a thread que mantém o cache local sincronizado com o Redis."""
+        if self._listener is None or not self._listener.is_alive():
+            self._stop.clear()
+            self._listener = threading.Thread(
+                target=self._listen, name="token-blacklist-sync", daemon=True
+            )
+            self._listener.start()
+
+    def stop_listener(self):
+        self._stop.set()
+        self._synced = False
+
+    def _listen(self):
+        while not self._stop.is_set():
+            pubsub = self.redis.pubsub()
+            try:
+                pubsub.subscribe(BLACKLIST_CHANNEL)
+                last_ping = time.monotonic()
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._handle_message(message)
+                    if time.monotonic() - last_ping >= BLACKLIST_PING_SECONDS:
+                        # Detecta conexões mortas que não geram erro na leitura
+                        pubsub.ping()
+                        last_ping = time.monotonic()
+            except Exception as e:
+                self._synced = False
+                logger.warning(f"Sincronização da blacklist interrompida: {e}")
+                self._stop.wait(BLACKLIST_RESYNC_SECONDS)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+        self._synced = False
+
+    def _handle_message(self, message):
+        if message["type"] == "subscribe":
+            # Revogações publicadas enquanto desconectado foram perdidas: recarrega tudo
+            self._synced = False
+            self.sync_from_redis()
+            self._synced = True
+            logger.info(f"Blacklist local sincronizada ({len(self._local)} tokens)")
+        elif message["type"] == "message":
+            self._apply_event(message["data"])
 
-    def add_to_blacklist(self, jti, exp_timestamp):
+    def _apply_event(self, data):
+        """Aplica uma revogação publicada no formato ``<jti> <exp>``."""
+        if isinstance(data, bytes):
+            data = data.decode()
+        jti, _, exp = data.partition(" ")
+        self._local.add(jti, exp or 0)
+
+    def sync_from_redis(self):
+        """Recarrega o cache local com todos os JTIs revogados no Redis."""
+        self._migrate_legacy_keys()
+        revoked = self.redis.zrangebyscore(
+            REVOKED_INDEX_KEY, time.time(), "+inf", withscores=True
+        )
+        # Revogações só entram (e vencem): mesclar no cache atual preserva as
+        # gravadas por outras threads durante a leitura
+        self._local.update([(_decode(jti), exp) for jti, exp in revoked])
+        return len(self._local)
+
+    def _migrate_legacy_keys(self):
+        """Indexa (uma vez) revogações gravadas antes do índice ``tokens:revoked``."""
+        if self.redis.exists(REVOKED_INDEX_MIGRATED_KEY):
+            return
+        now = time.time()
+        keys = list(self.redis.scan_iter(match=f"{BLACKLIST_KEY_PREFIX}*", count=1000))
+        if keys:
+            pipe = self.redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.ttl(key)
+            entries = {}
+            for key, ttl in zip(keys, pipe.execute()):
+                # ttl -2: chave removida durante a varredura
+                if ttl == -2:
+                    continue
+                jti = _decode(key)[len(BLACKLIST_KEY_PREFIX) :]
+                entries[jti] = now + (ttl if ttl >= 0 else TOKEN_INDEX_TTL_SECONDS)
+            if entries:
+                self.redis.zadd(REVOKED_INDEX_KEY, entries)
+            logger.info(f"Índice de revogações migrado ({len(entries)} tokens)")
+        self.redis.set(REVOKED_INDEX_MIGRATED_KEY, "1")
+
+    # ============= OPERAÇÕES =============
+
+    def add_to_blacklist(self, jti, exp_timestamp, username=None):
         """Adiciona um token à blacklist"""
         try:
             if self.redis:
+                self._ensure_listener()
                 # Calcular TTL (tempo até expiração)
                 ttl = max(0, int(exp_timestamp - datetime.timestamp(datetime.now())))
-                self.redis.set(f"token_blacklist:{jti}", "1", ex=ttl)
+                if ttl == 0:
+                    # Token já expirado: não há o que revogar
+                    return True
+                pipe = self.redis.pipeline()
+                self._queue_revocation(pipe, jti, exp_timestamp, ttl, username)
+                pipe.execute()
+                self._local.add(jti, exp_timestamp)
                 logger.debug(
                     f"Token {jti} adicionado à blacklist no Redis (expira em {ttl}s)"
                 )
             else:
-                self._blacklist[jti] = exp_timestamp
-                # Limpa tokens expirados da blacklist em memória
-                now = datetime.timestamp(datetime.now())
-                self._blacklist = {
-                    j: exp for j, exp in self._blacklist.items() if exp > now
-                }
+                self._blacklist.add(jti, exp_timestamp)
                 logger.debug(f"Token {jti} adicionado à blacklist em memória")
             return True
         except Exception as e:
             logger.error(f"Erro ao adicionar token à blacklist: {e}")
             return False
 
+    @staticmethod
+    def _queue_revocation(pipe, jti, exp_timestamp, ttl, username=None):
+        pipe.set(f"{BLACKLIST_KEY_PREFIX}{jti}", "1", ex=ttl)
+        pipe.zadd(REVOKED_INDEX_KEY, {jti: exp_timestamp})
+        if username:
+            key = USER_REVOKED_KEY.format(username=username)
+            pipe.zadd(key, {jti: exp_timestamp})
+            pipe.expire(key, max(TOKEN_INDEX_TTL_SECONDS, ttl))
+        pipe.publish(BLACKLIST_CHANNEL, f"{jti} {exp_timestamp}")
+
     def is_blacklisted(self, jti):
-        """Verifica se um token está na blacklist"""
+        """
+        Verifica se um token está na blacklist.
+
+        Falha fechada: se a consulta der erro, o token é tratado como revogado.
+        """
         try:
             if self.redis:
-                result = bool(self.redis.exists(f"token_blacklist:{jti}"))
+                self._ensure_listener()
+                if self._synced:
+                    self.local_hits += 1
+                    return self._local.contains(jti)
+                self.redis_checks += 1
+                result = bool(self.redis.exists(f"{BLACKLIST_KEY_PREFIX}{jti}"))
                 logger.debug(
                     f"Token {jti} verificado no Redis: {'bloqueado' if result else 'válido'}"
                 )
                 return result
 
-            # Limpar tokens expirados da blacklist em memória
-            now = datetime.timestamp(datetime.now())
-            self._blacklist = {
-                j: exp for j, exp in self._blacklist.items() if exp > now
-            }
-            result = jti in self._blacklist
+            result = self._blacklist.contains(jti)
             logger.debug(
                 f"Token {jti} verificado em memória: {'bloqueado' if result else 'válido'}"
             )
             return result
         except Exception as e:
-            logger.error(f"Erro ao verificar token na blacklist: {e}")
-            return False
+            logger.error(f"Erro ao verificar token na blacklist, token recusado: {e}")
+            return True
 
     def clear_expired(self):
         """Limpa tokens expirados da blacklist (apenas para implementação em memória)"""
         if not self.redis:
-            now = datetime.timestamp(datetime.now())
-            old_count = len(self._blacklist)
-            self._blacklist = {
-                j: exp for j, exp in self._blacklist.items() if exp > now
-            }
-            new_count = len(self._blacklist)
-            logger.info(
-                f"Limpeza de blacklist: {old_count - new_count} tokens expirados removidos"
-            )
-            return old_count - new_count
+            removed = self._blacklist.purge()
+            logger.info(f"Limpeza de blacklist: {removed} tokens expirados removidos")
+            return removed
         return 0
 
+    def get_cache_status(self):
+        """Estado do cache local (apenas com Redis)."""
+        return {
+            "synced": self._synced,
+            "size": len(self._local),
+            "local_hits": self.local_hits,
+            "redis_checks": self.redis_checks,
+        }
+
     def get_blacklist_size(self):
         """Retorna o tamanho atual da blacklist"""
         if self.redis:
             try:
-                size = self.redis.keys("token_blacklist:*")
-                return len(size)
+                pipe = self.redis.pipeline()
+                pipe.zremrangebyscore(REVOKED_INDEX_KEY, "-inf", time.time())
+                pipe.zcard(REVOKED_INDEX_KEY)
+                return pipe.execute()[1]
             except:
                 return "N/A (Redis)"
+        self._blacklist.purge()
         return len(self._blacklist)
 
+    # ============= TOKENS POR USUÁRIO =============
+
+    def register_token(self, username, jti, exp_timestamp):
+        """Registra um token emitido no índice do usuário."""
+        try:
+            if self.redis:
+                key = USER_ISSUED_KEY.format(username=username)
+                now = time.time()
+                pipe = self.redis.pipeline()
+                pipe.zadd(key, {jti: exp_timestamp})
+                pipe.zremrangebyscore(key, "-inf", now)
+                pipe.expire(
+                    key, max(TOKEN_INDEX_TTL_SECONDS, int(exp_timestamp - now) + 1)
+                )
+                pipe.execute()
+            else:
+                self._user_tokens.setdefault(username, ExpiringStore()).add(
+                    jti, exp_timestamp
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao registrar token do usuário {username}: {e}")
+            return False
+
+    def get_user_tokens(self, username):
+        """Retorna ``(ativos, revogados)``: listas de JTIs não expirados do usuário."""
+        now = time.time()
+        if self.redis:
+            issued_key = USER_ISSUED_KEY.format(username=username)
+            revoked_key = USER_REVOKED_KEY.format(username=username)
+            pipe = self.redis.pipeline()
+            pipe.zremrangebyscore(issued_key, "-inf", now)
+            pipe.zremrangebyscore(revoked_key, "-inf", now)
+            pipe.zrange(issued_key, 0, -1)
+            pipe.zrange(revoked_key, 0, -1)
+            issued, revoked = pipe.execute()[2:]
+            issued = [_decode(jti) for jti in issued]
+            revoked = [_decode(jti) for jti in revoked]
+        else:
+            store = self._user_tokens.get(username)
+            issued = [jti for jti, _ in store.items()] if store else []
+            revoked = [jti for jti in issued if self._blacklist.contains(jti)]
+        revoked_set = set(revoked)
+        return [jti for jti in issued if jti not in revoked_set], revoked
+
+    def revoke_user(self, username):
+        """Revoga os tokens ativos do usuário e retorna quantos foram revogados."""
+        now = time.time()
+        if self.redis:
+            self._ensure_listener()
+            issued_key = USER_ISSUED_KEY.format(username=username)
+            revoked_key = USER_REVOKED_KEY.format(username=username)
+            pipe = self.redis.pipeline()
+            pipe.zrangebyscore(issued_key, now, "+inf", withscores=True)
+            pipe.zrangebyscore(revoked_key, now, "+inf")
+            issued, revoked = pipe.execute()
+            revoked = {_decode(jti) for jti in revoked}
+            pending = [
+                (_decode(jti), exp)
+                for jti, exp in issued
+                if _decode(jti) not in revoked
+            ]
+            if pending:
+                pipe = self.redis.pipeline()
+                for jti, exp in pending:
+                    self._queue_revocation(
+                        pipe, jti, exp, max(1, int(exp - now)), username
+                    )
+                pipe.execute()
+                for jti, exp in pending:
+                    self._local.add(jti, exp)
+            return len(pending)
+
+        store = self._user_tokens.get(username)
+        pending = [(jti, exp) for jti, exp in store.items()] if store else []
+        pending = [
+            (jti, exp) for jti, exp in pending if not self._blacklist.contains(jti)
+        ]
+        for jti, exp in pending:
+            self._blacklist.add(jti, exp)
+        return len(pending)
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class DecodedTokenCache:
+    """
+    LRU de access tokens já verificados, indexado pelo SHA-256 do token.
+
+    Um token só entra no cache depois de passar pela verificação completa do
+    flask_jwt_extended; qualquer alteração no token muda a chave, então a
+    assinatura não precisa ser verificada de novo. Expiração e revogação
+    continuam sendo checadas a cada uso.
+    """
+
+    def __init__(self, max_size=DECODED_TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._tokens = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(encoded_token):
+        return hashlib.sha256(encoded_token.encode()).digest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._tokens.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, jwt_header, jwt_data):
+        with self._lock:
+            self._tokens[key] = (jwt_header, jwt_data)
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > self.max_size:
+                self._tokens.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def get_stats(self):
+        return {"size": len(self._tokens), "hits": self.hits, "misses": self.misses}
+
 
 class AuthManager:
     def __init__(self, app=None):
         self.jwt = None
         self.blacklist = TokenBlacklist(os.getenv("REDIS_URL"))
         self.refresh_tokens = {}  # Para controle avançado de refresh tokens
+        self.token_cache = DecodedTokenCache()
+        self.token_cache_enabled = (
+            flask_jwt_extended.__version__ == TOKEN_CACHE_JWT_EXTENDED_VERSION
+        )
+        if not self.token_cache_enabled:
+            logger.warning(
+                f"flask_jwt_extended {flask_jwt_extended.__version__} não validado "
+                f"para o cache (esperado {TOKEN_CACHE_JWT_EXTENDED_VERSION}); "
+                "cache desligado"
+            )
         if app:
             self.init_app(app)
 
@@ -179,9 +649,11 @@ class AuthManager:
         @self.jwt.additional_claims_loader
         def add_claims_to_jwt(identity):
             role = identity.get("role", ROLE_VIEWER)
-            permissions = ROLE_PERMISSIONS.get(role, ROLE_PERMISSIONS[ROLE_VIEWER])
             return {
-                "permissions": permissions,
+                # Bitmask compacto (ver PERMISSION_BITS) em vez do dicionário completo
+                "perms": ROLE_PERMISSION_MASKS.get(
+                    role, ROLE_PERMISSION_MASKS[ROLE_VIEWER]
+                ),
                 "created_at": datetime.now().timestamp(),
             }
 
@@ -203,45 +675,143 @@ class AuthManager:
                 "code": "invalid_token",
             }, 401
 
-    def revoke_token(self, token_jti, exp_timestamp):
-        """Revoga um token adicionando-o à blacklist"""
-        return self.blacklist.add_to_blacklist(token_jti, exp_timestamp)
+    # ============= VERIFICAÇÃO COM CACHE =============
 
-    def revoke_user_tokens(self, user_identity, db_connection=None):
-        """Revoga todos os tokens de um usuário"""
-        if db_connection:
+    def jwt_required(self, fn):
+        """
+        Equivalente a ``@jwt_required()`` que reaproveita tokens já verificados.
+
+        Apenas access tokens enviados no header ``Authorization`` usam o cache;
+        os demais casos seguem a verificação completa do flask_jwt_extended.
+        """
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = self._token_cache_key()
+            if key is None or not self._load_cached_token(key):
+                verify_jwt_in_request()
+                if key is not None:
+                    self.token_cache.put(key, get_jwt_header(), get_jwt())
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    def current_identity(self):
+        """
+        Identidade do access token do header ``Authorization``, ou ``None``.
+
+        Usa o cache de ``jwt_required``, então o token só é decodificado na
+        primeira requisição que o traz. Token ausente, inválido, expirado ou
+        revogado resulta em ``None`` em vez de erro.
+        """
+        if self._bearer_token() is None:
+            return None
+        key = self._token_cache_key()
+        if key is None or not self._load_cached_token(key):
             try:
-                # Se tivermos uma conexão com o banco, registrar os tokens revogados
-                db_connection.execute(
-                    "INSERT INTO revoked_tokens (user_id, revoked_at) VALUES (?, ?)",
-                    (user_identity, datetime.now().isoformat()),
-                )
-                logger.info(
-                    f"Registrado revogação de todos os tokens para o usuário {user_identity}"
-                )
-                return True
-            except Exception as e:
-                logger.error(f"Erro ao registrar revogação de tokens: {e}")
+                verify_jwt_in_request(locations="headers")
+            except Exception:
+                return None
+            if key is not None:
+                self.token_cache.put(key, get_jwt_header(), get_jwt())
+        return get_jwt_identity()
+
+    def current_user(self):
+        """Nome do usuário do access token do header ``Authorization``, ou ``None``."""
+        identity = self.current_identity()
+        return identity.get("user") if isinstance(identity, dict) else None
 
-        return False
+    def _token_cache_key(self):
+        if not self.token_cache_enabled:
+            return None
+        encoded = self._bearer_token()
+        return self.token_cache.key(encoded) if encoded else None
+
+    @staticmethod
+    def _bearer_token():
+        if request.method == "OPTIONS":
+            return None
+        header_name = current_app.config.get("JWT_HEADER_NAME", "Authorization")
+        header_type = current_app.config.get("JWT_HEADER_TYPE", "Bearer")
+        parts = request.headers.get(header_name, "").split()
+        if len(parts) == 2 and parts[0] == header_type:
+            return parts[1]
+        return None
+
+    def _load_cached_token(self, key):
+        entry = self.token_cache.get(key)
+        if entry is None:
+            return False
+        jwt_header, jwt_data = entry
+        leeway = current_app.config.get("JWT_DECODE_LEEWAY", 0)
+        if isinstance(leeway, timedelta):
+            leeway = leeway.total_seconds()
+        exp = jwt_data.get("exp")
+        if (
+            (exp is not None and exp + leeway <= time.time())
+            or jwt_data.get("type") != "access"
+            or self.blacklist.is_blacklisted(jwt_data["jti"])
+        ):
+            # Verificação completa produz a resposta de erro adequada
+            self.token_cache.discard(key)
+            return False
+        # Mesmos atributos que verify_jwt_in_request grava (ver
+        # TOKEN_CACHE_JWT_EXTENDED_VERSION); sem user_lookup_loader, o usuário é None
+        g._jwt_extended_jwt_user = None
+        g._jwt_extended_jwt_header = jwt_header
+        g._jwt_extended_jwt = jwt_data
+        g._jwt_extended_jwt_location = "headers"
+        return True
+
+    def revoke_token(self, token_jti, exp_timestamp, username=None):
+        """Revoga um token adicionando-o à blacklist"""
+        return self.blacklist.add_to_blacklist(token_jti, exp_timestamp, username)
+
+    def revoke_user_tokens(self, user_identity, db_connection=None):
+        """Revoga os tokens de um usuário e retorna quantos (None em erro)"""
+        try:
+            revoked = self.blacklist.revoke_user(user_identity)
+            logger.info(f"{revoked} tokens revogados para o usuário {user_identity}")
+            return revoked
+        except Exception as e:
+            logger.error(f"Erro ao revogar tokens do usuário {user_identity}: {e}")
+            return None
 
     @staticmethod
     def hash_password(password):
-        return generate_password_hash(password)
+        return PASSWORD_HASHER.hash(password)
 
     @staticmethod
     def verify_password(password, password_hash):
-        return check_password_hash(password_hash, password)
+        """Verifica a senha no executor limitado (levanta HashingOverloadedError)"""
+        return PASSWORD_HASHER.verify(password, password_hash)
 
-    @staticmethod
-    def create_token(identity, role):
+    def create_token(self, identity, role):
         """Cria um access token com informações do usuário"""
-        return create_access_token(identity={"user": identity, "role": role})
+        return self._issue_token(
+            create_access_token, identity, role, "JWT_ACCESS_TOKEN_EXPIRES"
+        )
 
-    @staticmethod
-    def create_refresh_token(identity, role):
+    def create_refresh_token(self, identity, role):
         """Cria um refresh token com informações do usuário"""
-        return create_refresh_token(identity={"user": identity, "role": role})
+        return self._issue_token(
+            create_refresh_token, identity, role, "JWT_REFRESH_TOKEN_EXPIRES"
+        )
+
+    def _issue_token(self, factory, identity, role, expires_config_key):
+        """Emite o token com JTI conhecido e o registra no índice do usuário."""
+        jti = str(uuid.uuid4())
+        token = factory(
+            identity={"user": identity, "role": role}, additional_claims={"jti": jti}
+        )
+        expires = current_app.config.get(expires_config_key)
+        if isinstance(expires, timedelta):
+            lifetime = expires.total_seconds()
+        else:
+            # flask_jwt_extended também aceita segundos (int) ou False (sem expiração)
+            lifetime = expires or TOKEN_INDEX_TTL_SECONDS
+        self.blacklist.register_token(identity, jti, time.time() + lifetime)
+        return token
 
     @staticmethod
     def is_role_authorized(required_roles, user_role):
@@ -256,26 +826,37 @@ class AuthManager:
         role_perms = ROLE_PERMISSIONS.get(role, ROLE_PERMISSIONS[ROLE_VIEWER])
         return role_perms.get(permission, False)
 
+    @staticmethod
+    def claims_mask(claims):
+        """Bitmask de permissões do token (tokens antigos: derivado do role)."""
+        mask = claims.get("perms")
+        if mask is None:
+            identity = claims.get("sub") or {}
+            role = (
+                identity.get("role", ROLE_VIEWER)
+                if isinstance(identity, dict)
+                else ROLE_VIEWER
+            )
+            mask = ROLE_PERMISSION_MASKS.get(role, ROLE_PERMISSION_MASKS[ROLE_VIEWER])
+        return mask
+
     def get_blacklist_status(self):
         """Retorna status da blacklist para monitoramento"""
         return {
             "size": self.blacklist.get_blacklist_size(),
             "using_redis": self.blacklist.redis is not None,
+            "local_cache": (
+                self.blacklist.get_cache_status()
+                if self.blacklist.redis is not None
+                else None
+            ),
+            "decoded_tokens": self.token_cache.get_stats(),
             "timestamp": datetime.now().isoformat(),
         }
 
     def get_user_tokens(self, username):
-        """Retorna lista de tokens ativos/revogados para um usuário (mock para demo/testes)."""
-        # Em produção, isso deveria consultar um storage real de tokens emitidos/blacklistados        # Mock: retorna apenas tokens da blacklist em memória (apenas para desenvolvimento)
-        active = []
-        revoked = []
-        if hasattr(self.blacklist, "_blacklist"):
-            now = datetime.timestamp(datetime.now())
-            for jti, exp in self.blacklist._blacklist.items():
-                # Aqui não temos username real, pois a blacklist só armazena jti e exp
-                # Em produção, seria necessário um storage real com relação jti <-> usuário
-                if exp > now:
-                    revoked.append(jti)
+        """Retorna lista de tokens ativos/revogados para um usuário."""
+        active, revoked = self.blacklist.get_user_tokens(username)
         return {
             "username": username,
             "active_tokens": active,
@@ -0,0 +1,122 @@
+"""
+Verificação de senhas fora do worker WSGI.
+
+O KDF das senhas (PBKDF2/scrypt do Werkzeug) é intencionalmente caro. Em uma
+rajada de logins (ex.: após um deploy que invalida sessões) executá-lo inline
+em cada worker consome toda a CPU e atrasa os demais endpoints. Aqui os
+cálculos rodam num executor com poucas threads (o hashlib libera o GIL) e uma
+fila limitada: acima do limite a requisição é rejeitada imediatamente com
+``HashingOverloadedError`` (HTTP 503 + ``Retry-After`` na API).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import logging
+import os
+import threading
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from config.config_loader import CONFIG
+
+logger = logging.getLogger(__name__)
+
+_security = CONFIG.get("security", {})
+HASHING_WORKERS = int(_security.get("hashing_workers") or os.cpu_count() or 1)
+HASHING_MAX_PENDING = int(_security.get("hashing_max_pending") or HASHING_WORKERS * 4)
+HASHING_TIMEOUT_SECONDS = float(_security.get("hashing_timeout_seconds", 5))
+HASHING_RETRY_AFTER_SECONDS = 1
+
+
+class HashingOverloadedError(Exception):
+    """Fila de verificação de senhas cheia (ou resposta lenta demais)."""
+
+    def __init__(self, message, retry_after=HASHING_RETRY_AFTER_SECONDS):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Executor limitado para gerar e verificar hashes de senha.
+
+    ``max_pending`` conta os cálculos em execução mais os enfileirados.
+    """
+
+    def __init__(
+        self,
+        workers=HASHING_WORKERS,
+        max_pending=HASHING_MAX_PENDING,
+        timeout=HASHING_TIMEOUT_SECONDS,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._stats_lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hash"
+                    )
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            logger.warning("Fila de verificação de senhas cheia; requisição rejeitada")
+            raise HashingOverloadedError("Serviço de autenticação sobrecarregado")
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # O slot só é liberado quando o cálculo termina, mesmo após timeout
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._stats_lock:
+                self.rejected += 1
+            raise HashingOverloadedError(
+                "Tempo limite na verificação de senha"
+            ) from None
+
+    def _release(self, _future):
+        self._slots.release()
+        with self._stats_lock:
+            self.completed += 1
+
+    def verify(self, password, password_hash):
+        """Verifica a senha contra o hash armazenado."""
+        return self._run(check_password_hash, password_hash, password)
+
+    def hash(self, password):
+        """Gera o hash de uma nova senha."""
+        return self._run(generate_password_hash, password)
+
+    def get_stats(self):
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+# Executor compartilhado pelo processo
+PASSWORD_HASHER = PasswordHasher()
@@ -0,0 +1,112 @@
+"""
+Sondas de liveness e readiness dos serviços HTTP.
+
+``/health/live`` responde 200 enquanto o worker consegue atender
+requisições; não consulta dependências, para que um banco fora do ar não
+faça o orquestrador reiniciar workers saudáveis. ``/health/ready`` executa as
+verificações registradas pelo serviço (banco, snapshot do dashboard, ...) e
+responde 503 quando alguma falha ou quando o worker está encerrando. O
+resultado das verificações fica em cache por alguns segundos, para que
+sondas frequentes não gerem carga nas dependências.
+"""
+
+from typing import Any, Callable, Dict, Optional
+import logging
+import os
+import threading
+import time
+
+from flask import jsonify
+
+logger = logging.getLogger(__name__)
+
+# Validade do resultado das verificações de readiness
+READINESS_CACHE_SECONDS = 2.0
+
+
+class HealthRegistry:
+    """Verificações de readiness de um serviço e o estado do worker."""
+
+    def __init__(
+        self,
+        service: str,
+        cache_seconds: float = READINESS_CACHE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.service = service
+        self.cache_seconds = cache_seconds
+        self._clock = clock
+        self._started_at = clock()
+        self._checks: Dict[str, Callable[[], Any]] = {}
+        self._draining = False
+        self._lock = threading.Lock()
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_at = 0.0
+
+    def add_check(self, name: str, check: Callable[[], Any]):
+        """Registra ``check()``; exceções tornam o serviço não pronto."""
+        self._checks[name] = check
+        self._cached = None
+
+    def mark_draining(self):
+        """Worker encerrando: readiness passa a 503 para sair do balanceamento."""
+        self._draining = True
+        self._cached = None
+
+    def liveness(self) -> Dict[str, Any]:
+        return {
+            "status": "alive",
+            "service": self.service,
+            "pid": os.getpid(),
+            "uptime_seconds": round(self._clock() - self._started_at, 1),
+        }
+
+    def readiness(self) -> Dict[str, Any]:
+        """Resultado das verificações (``ready`` indica se todas passaram)."""
+        now = self._clock()
+        cached = self._cached
+        if cached is not None and now - self._cached_at < self.cache_seconds:
+            return cached
+        with self._lock:
+            if self._cached is not None and now - self._cached_at < self.cache_seconds:
+                return self._cached
+            checks = {}
+            for name, check in self._checks.items():
+                try:
+                    detail = check()
+                    checks[name] = (
+                        {"ok": True, "detail": detail} if detail else {"ok": True}
+                    )
+                except Exception as e:
+                    logger.warning(f"Verificação de readiness '{name}' falhou: {e}")
+                    checks[name] = {"ok": False, "error": str(e)}
+            ready = not self._draining and all(
+                result["ok"] for result in checks.values()
+            )
+            self._cached = {
+                "status": "ready" if ready else "unavailable",
+                "ready": ready,
+                "service": self.service,
+                "draining": self._draining,
+                "checks": checks,
+            }
+            self._cached_at = now
+            return self._cached
+
+
+def register_health_routes(app, registry: HealthRegistry):
+    """Adiciona ``/health``, ``/health/live`` e ``/health/ready`` ao app Flask."""
+
+    def live():
+        return jsonify(registry.liveness()), 200
+
+    def ready():
+        result = registry.readiness()
+        return jsonify(result), 200 if result["ready"] else 503
+
+    # /health é o alias usado pelo HEALTHCHECK do Docker (liveness)
+    app.add_url_rule("/health", "health", live, methods=["GET"])
+    app.add_url_rule("/health/live", "health_live", live, methods=["GET"])
+    app.add_url_rule("/health/ready", "health_ready", ready, methods=["GET"])
+    app.health = registry
+    return registry
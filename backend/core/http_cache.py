@@ -0,0 +1,196 @@
+"""
+ETags condicionais e compressão das respostas da API.
+
+Dashboards consultam os mesmos endpoints a cada poucos segundos e, na maior
+parte das vezes, recebem o mesmo conteúdo. ``ResponseOptimizer`` roda no
+``after_request`` do app Flask e:
+
+- atribui um ETag fraco às respostas ``GET``/``HEAD`` 200: a versão que o
+  endpoint declarou com ``use_etag(...)`` ou, na falta dela, o hash do corpo;
+- responde ``304 Not Modified`` sem corpo quando o ``If-None-Match`` do
+  cliente confere;
+- comprime com brotli (se instalado) ou gzip os corpos maiores que
+  ``server.compression_min_bytes``, conforme o ``Accept-Encoding``
+  (``server.compression_*`` acompanham a recarga do config.yaml).
+
+Endpoints que conhecem uma versão barata do conteúdo chamam ``use_etag``
+antes do trabalho pesado e devolvem o 304 direto, sem montar o payload.
+Respostas em streaming (exportações NDJSON) passam sem alteração.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional
+import gzip
+import hashlib
+import json
+import logging
+import threading
+
+from flask import Response, g, request
+
+from config.config_loader import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Padrões de server.compression_min_bytes (corpos menores não compensam a
+# compressão) e server.compression_level (gzip 1-9 e qualidade do brotli; 0 desativa)
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_LEVEL = 6
+
+COMPRESSIBLE_MIMETYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/",
+)
+
+
+@lru_cache(maxsize=None)
+def _brotli():
+    """Módulo ``brotli`` (dependência opcional) ou ``None``."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def make_etag(*parts: Any) -> str:
+    """Hash estável de ``parts`` (bytes ou valores serializáveis em JSON)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+        digest.update(part)
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status=304)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def use_etag(*parts: Any) -> Optional[Response]:
+    """
+    Declara a versão da resposta atual a partir de ``parts``.
+
+    Retorna a resposta 304 quando o cliente já tem essa versão (o endpoint
+    deve devolvê-la) ou ``None`` para seguir montando o payload.
+    """
+    etag = make_etag(*parts)
+    g.response_etag = etag
+    if request.method in ("GET", "HEAD") and request.if_none_match.contains_weak(etag):
+        return not_modified(etag)
+    return None
+
+
+class ResponseOptimizer:
+    """``after_request`` com ETag/304 e compressão, com contadores de monitoramento."""
+
+    def __init__(
+        self,
+        min_bytes: Optional[int] = None,
+        level: Optional[int] = None,
+    ):
+        self._lock = threading.Lock()
+        self._stats = {
+            "not_modified": 0,
+            "compressed": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+        }
+        # Valores passados explicitamente não mudam com a recarga do config.yaml
+        self._overrides = {"min_bytes": min_bytes, "level": level}
+        self.min_bytes = COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes
+        self.level = COMPRESSION_LEVEL if level is None else level
+        if min_bytes is None or level is None:
+            CONFIG.subscribe(self._apply_config, "server")
+
+    def _apply_config(self, config):
+        server = config["server"]
+        if self._overrides["min_bytes"] is None:
+            self.min_bytes = int(
+                server.get("compression_min_bytes", COMPRESSION_MIN_BYTES)
+            )
+        if self._overrides["level"] is None:
+            self.level = int(server.get("compression_level", COMPRESSION_LEVEL))
+
+    def __call__(self, response: Response) -> Response:
+        if response.direct_passthrough or response.is_streamed:
+            return response
+        if request.method in ("GET", "HEAD") and response.status_code == 200:
+            self._apply_etag(response)
+            if response.status_code == 304:
+                return response
+        if self.level > 0 and self._compressible(response):
+            self._compress(response)
+        return response
+
+    def _apply_etag(self, response: Response):
+        etag, _ = response.get_etag()
+        if etag is None:
+            etag = g.pop("response_etag", None) or make_etag(response.get_data())
+            response.set_etag(etag, weak=True)
+        if request.if_none_match.contains_weak(etag):
+            response.status_code = 304
+            response.set_data(b"")
+            self._count(not_modified=1)
+
+    def _compressible(self, response: Response) -> bool:
+        if "Content-Encoding" in response.headers or response.status_code in (204, 304):
+            return False
+        mimetype = response.mimetype or ""
+        return any(mimetype.startswith(prefix) for prefix in COMPRESSIBLE_MIMETYPES)
+
+    def _encoding(self) -> Optional[str]:
+        accepted = request.accept_encodings
+        if _brotli() is not None and accepted["br"]:
+            return "br"
+        if accepted["gzip"]:
+            return "gzip"
+        return None
+
+    def _compress(self, response: Response):
+        # Caches intermediários guardam uma variante por Accept-Encoding
+        response.vary.add("Accept-Encoding")
+        data = response.get_data()
+        if len(data) < self.min_bytes:
+            return
+        encoding = self._encoding()
+        if encoding is None:
+            return
+        if encoding == "br":
+            compressed = _brotli().compress(data, quality=min(self.level, 11))
+        else:
+            compressed = gzip.compress(data, compresslevel=min(self.level, 9), mtime=0)
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        self._count(compressed=1, bytes_in=len(data), bytes_out=len(compressed))
+
+    def _count(self, **increments: int):
+        with self._lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["ratio"] = (
+            round(stats["bytes_out"] / stats["bytes_in"], 3)
+            if stats["bytes_in"]
+            else None
+        )
+        stats["min_bytes"] = self.min_bytes
+        stats["level"] = self.level
+        stats["brotli"] = _brotli() is not None
+        return stats
+
+
+def register_response_optimizer(app, optimizer: Optional[ResponseOptimizer] = None):
+    """Instala o ``ResponseOptimizer`` no app (em ``app.response_optimizer``)."""
+    optimizer = optimizer or ResponseOptimizer()
+    app.after_request(optimizer)
+    app.response_optimizer = optimizer
+    return optimizer
@@ -5,11 +5,27 @@ Consolida todas as traduções e funcionalidades de idioma em um módulo central
 Remove redundâncias entre diferentes partes do sistema.
 """
 
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+import json
+import logging
 import os
+import sys
+import threading
+
+from flask import has_request_context, request
+
 from config.config_loader import CONFIG
 
-# Dicionário centralizado com todas as traduções do sistema
+logger = logging.getLogger(__name__)
+
+# Pacotes de idioma adicionais: <código>.json neste diretório, carregados sob demanda
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+
+# Idioma base, sempre embutido; último elo de toda cadeia de fallback
+BASE_LANGUAGE = "pt"
+
+# Traduções embutidas (demais idiomas ficam em LOCALES_DIR)
 LANGUAGES = {
     "pt": {
         # Dashboard e UI principal
@@ -73,135 +89,187 @@ LANGUAGES = {
         "search": "Buscar",
         "bookmaker": "Casa de Apostas",
     },
-    "en": {
-        # Dashboard e UI principal
-        "dashboard_title": "🤑 Surebets Hunter Pro",
-        "filters": "Active Filters",
-        "sport": "Sport",
-        "bookmakers": "Bookmakers",
-        "min_profit": "Minimum Profit (%)",
-        "real_time_opportunities": "Real-Time Opportunities",
-        "search_event_market": "Search for event or market...",
-        "update_now": "Update Now",
-        "details": "Opportunity Details",
-        "close": "Close",
-        "admin": "Administration",
-        "settings": "General Settings",
-        "save_settings": "Save Settings",
-        "notifications": "Notifications",
-        "send_test": "Send Test",
-        "login": "Login",
-        "logout": "Logout",
-        "username": "Username",
-        "password": "Password",
-        "cancel": "Cancel",
-        # Jogos e eventos
-        "games": "Games",
-        "live_games": "Live Games",
-        "upcoming_games": "Upcoming Games",
-        "status": "Status",
-        "start_time": "Start Time",
-        "event": "Event",
-        "market": "Market",
-        "selection": "Selection",
-        "odd": "Odd",
-        "actions": "Actions",
-        # Apostas e inserção de dados
-        "insert_bet": "Insert New Bet",
-        "success_bet": "Bet successfully inserted!",
-        "fill_all": "Fill in all fields!",
-        "invalid_odd": "Invalid odd!",
-        "odd_gt_1": "Odd must be greater than 1.00!",
-        "error": "Error",
-        "profit": "Profit (%)",
-        # Banco de dados e administração
-        "db": "Database",
-        "missing_field": "Required field missing",
-        "bet_inserted": "Bet inserted in database!",
-        "notification_sent": "Notification sent!",
-        "fail_register_event": "Failed to register event.",
-        "unauthorized": "Unauthorized access. Login required.",
-        # Autenticação
-        "login_success": "Login successful!",
-        "login_failed": "Login failed. Check your credentials.",
-        "logout_success": "Logout successful!",
-        "settings_saved": "Settings saved!",
-        # Erros e mensagens do sistema
-        "test_sent": "Notification sent!",
-        "test_fail": "Failed to send notification.",
-        # Interface Tkinter
-        "games_tab": "Games",
-        "admin_tab": "Administration",
-        "search": "Search",
-        "bookmaker": "Bookmaker",
-    },
-    "pt-br": {
-        # Traduções em português brasileiro (pode ser igual ao "pt" ou customizado)
-        "dashboard_title": "🤑 Surebets Hunter Pro",
-        "filters": "Filtros Ativos",
-        "sport": "Esporte",
-        "bookmakers": "Casas de Apostas",
-        "min_profit": "Lucro Mínimo (%)",
-        "real_time_opportunities": "Oportunidades em Tempo Real",
-        "search_event_market": "Buscar evento ou mercado...",
-        "update_now": "Atualizar Agora",
-        "details": "Detalhes da Oportunidade",
-        "close": "Fechar",
-        "admin": "Administração",
-        "settings": "Configurações Gerais",
-        "save_settings": "Salvar Configurações",
-        "notifications": "Notificações",
-        "send_test": "Enviar Teste",
-        "login": "Entrar",
-        "logout": "Sair",
-        "username": "Nome de usuário",
-        "password": "Senha",
-        "cancel": "Cancelar",
-        # Jogos e eventos
-        "games": "Jogos",
-        "live_games": "Jogos ao Vivo",
-        "upcoming_games": "Próximos Jogos",
-        "status": "Status",
-        "start_time": "Início",
-        "event": "Evento",
-        "market": "Mercado",
-        "selection": "Seleção",
-        "odd": "Odd",
-        "actions": "Ações",
-        # Apostas e inserção de dados
-        "insert_bet": "Inserir Nova Aposta",
-        "success_bet": "Aposta inserida com sucesso!",
-        "fill_all": "Preencha todos os campos!",
-        "invalid_odd": "Odd inválida!",
-        "odd_gt_1": "Odd deve ser maior que 1.00!",
-        "error": "Erro",
-        "profit": "Lucro (%)",
-        # Banco de dados e administração
-        "db": "Banco de Dados",
-        "missing_field": "Campo obrigatório ausente",
-        "bet_inserted": "Aposta inserida no banco!",
-        "notification_sent": "Notificação enviada!",
-        "fail_register_event": "Falha ao registrar evento.",
-        "unauthorized": "Acesso não autorizado. Requer login.",
-        # Autenticação
-        "login_success": "Login realizado com sucesso!",
-        "login_failed": "Falha no login. Verifique suas credenciais.",
-        "logout_success": "Logout realizado com sucesso!",
-        "settings_saved": "Configurações salvas!",
-        # Erros e mensagens do sistema
-        "test_sent": "Notificação enviada!",
-        "test_fail": "Falha ao enviar notificação.",
-        # Interface Tkinter
-        "games_tab": "Jogos",
-        "admin_tab": "Administração",
-        "search": "Buscar",
-        "bookmaker": "Casa de Apostas",
-    },
 }
 
 # Idioma padrão do sistema
 DEFAULT_LANGUAGE = CONFIG["ui"].get("language", "pt")
 
+# Cabeçalhos Accept-Language distintos lembrados pela negociação
+NEGOTIATION_CACHE_SIZE = 1024
+
+
+def normalize_language(lang: str) -> str:
+    """Normaliza um código de idioma (``pt_BR`` -> ``pt-br``)."""
+    return lang.strip().lower().replace("_", "-")
+
+
+class TranslationCatalog:
+    """
+    Catálogo compilado de traduções.
+
+    Cada idioma é compilado uma vez em um mapa imutável que já inclui a
+    cadeia de fallback (``pt-br`` -> ``pt``, depois o idioma padrão e o
+    idioma base), então cada consulta é um único ``dict.get``. Pacotes em
+    ``locales_dir`` só são lidos quando o idioma é pedido pela primeira vez.
+    """
+
+    def __init__(
+        self,
+        builtin: Dict[str, Dict[str, str]] = LANGUAGES,
+        locales_dir: str = LOCALES_DIR,
+        default_language: str = DEFAULT_LANGUAGE,
+    ):
+        self.builtin = builtin
+        self.locales_dir = locales_dir
+        self.default_language = normalize_language(default_language)
+        self._available: Optional[frozenset] = None
+        self._compiled: Dict[str, Mapping[str, str]] = {}
+        self._resolved: Dict[str, str] = {}
+        self._negotiated: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    # ============= IDIOMAS DISPONÍVEIS =============
+
+    def available(self) -> frozenset:
+        """Idiomas embutidos mais os pacotes encontrados em ``locales_dir``."""
+        if self._available is None:
+            files = set()
+            if os.path.isdir(self.locales_dir):
+                files = {
+                    normalize_language(name[:-5])
+                    for name in os.listdir(self.locales_dir)
+                    if name.endswith(".json")
+                }
+            self._available = frozenset(files | set(self.builtin))
+        return self._available
+
+    def resolve(self, lang: Optional[str]) -> str:
+        """Retorna o idioma disponível mais próximo (região -> idioma -> padrão)."""
+        if not lang:
+            lang = self.default_language
+        resolved = self._resolved.get(lang)
+        if resolved is None:
+            resolved = self._resolve(lang)
+            if len(self._resolved) >= NEGOTIATION_CACHE_SIZE:
+                self._resolved.clear()
+            self._resolved[lang] = resolved
+        return resolved
+
+    def supports(self, lang: str) -> bool:
+        """Indica se o idioma (ou o idioma sem a região) está disponível."""
+        code = normalize_language(lang)
+        available = self.available()
+        return code in available or code.split("-", 1)[0] in available
+
+    def _resolve(self, lang: str) -> str:
+        available = self.available()
+        for candidate in (lang, self.default_language):
+            code = normalize_language(candidate)
+            if code in available:
+                return code
+            base = code.split("-", 1)[0]
+            if base in available:
+                return base
+        return BASE_LANGUAGE
+
+    def fallback_chain(self, lang: str) -> List[str]:
+        """Cadeia de idiomas consultados para ``lang``, do mais específico ao base."""
+        available = self.available()
+        chain = []
+        for candidate in (lang, self.default_language, BASE_LANGUAGE):
+            full = normalize_language(candidate)
+            for code in (full, full.split("-", 1)[0]):
+                if code in available and code not in chain:
+                    chain.append(code)
+        return chain
+
+    # ============= COMPILAÇÃO =============
+
+    def _load(self, lang: str) -> Dict[str, str]:
+        if lang in self.builtin:
+            return self.builtin[lang]
+        path = os.path.join(self.locales_dir, f"{lang}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Erro ao carregar pacote de idioma '{lang}': {e}")
+            return {}
+
+    def get_map(self, lang: Optional[str] = None) -> Mapping[str, str]:
+        """Mapa imutável de traduções do idioma, com fallbacks já aplicados."""
+        code = self.resolve(lang)
+        compiled = self._compiled.get(code)
+        if compiled is None:
+            with self._lock:
+                compiled = self._compiled.get(code)
+                if compiled is None:
+                    merged: Dict[str, str] = {}
+                    # Do menos para o mais específico: o último sobrescreve
+                    for link in reversed(self.fallback_chain(code)):
+                        for key, text in self._load(link).items():
+                            merged[sys.intern(key)] = text
+                    compiled = MappingProxyType(merged)
+                    self._compiled[code] = compiled
+                    logger.debug(f"Idioma '{code}' compilado ({len(merged)} chaves)")
+        return compiled
+
+    def gettext(self, key: str, lang: Optional[str] = None) -> str:
+        return self.get_map(lang).get(key, key)
+
+    # ============= NEGOCIAÇÃO =============
+
+    def negotiate(self, accept_language: Optional[str]) -> str:
+        """Escolhe o idioma a partir de um cabeçalho ``Accept-Language``."""
+        if not accept_language:
+            return self.resolve(None)
+        lang = self._negotiated.get(accept_language)
+        if lang is None:
+            lang = self._negotiate(accept_language)
+            if len(self._negotiated) >= NEGOTIATION_CACHE_SIZE:
+                self._negotiated.clear()
+            self._negotiated[accept_language] = lang
+        return lang
+
+    def _negotiate(self, accept_language: str) -> str:
+        available = self.available()
+        weighted = []
+        for position, part in enumerate(accept_language.split(",")):
+            tag, _, params = part.partition(";")
+            tag = normalize_language(tag)
+            if not tag:
+                continue
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    continue
+            if quality > 0:
+                weighted.append((-quality, position, tag))
+        for _, _, tag in sorted(weighted):
+            if tag == "*":
+                break
+            if tag in available:
+                return tag
+            base = tag.split("-", 1)[0]
+            if base in available:
+                return base
+        return self.resolve(None)
+
+    def set_default_language(self, lang: str):
+        """Troca o idioma padrão e descarta os mapas compilados."""
+        with self._lock:
+            self.default_language = normalize_language(lang)
+            self._compiled.clear()
+            self._resolved.clear()
+            self._negotiated.clear()
+
+
+# Catálogo compartilhado pelo processo
+CATALOG = TranslationCatalog()
+
 
 def get_text(key: str, lang: Optional[str] = None) -> str:
     """
@@ -212,17 +280,21 @@ def get_text(key: str, lang: Optional[str] = None) -> str:
         lang: O código do idioma a ser usado (padrão: idioma do sistema)
 
     Returns:
-        O texto traduzido ou a própria chave se não encontrado
+        O texto traduzido (com fallback para o idioma base) ou a própria chave
+        se não encontrado
     """
-    if lang is None:
-        lang = DEFAULT_LANGUAGE
+    return CATALOG.get_map(lang).get(key, key)
 
-    # Garante que usamos um idioma suportado
-    if lang not in LANGUAGES:
-        lang = DEFAULT_LANGUAGE
 
-    # Retorna a tradução ou a chave se não encontrada
-    return LANGUAGES[lang].get(key, key)
+def get_request_language() -> str:
+    """
+    Idioma da requisição Flask atual, negociado pelo cabeçalho Accept-Language.
+
+    Fora de uma requisição retorna o idioma padrão do sistema.
+    """
+    if not has_request_context():
+        return CATALOG.resolve(None)
+    return CATALOG.negotiate(request.headers.get("Accept-Language"))
 
 
 def get_supported_languages() -> List[str]:
@@ -232,10 +304,10 @@ def get_supported_languages() -> List[str]:
     Returns:
         Lista de códigos de idioma suportados
     """
-    return list(LANGUAGES.keys())
+    return sorted(CATALOG.available())
 
 
-def get_language_dict(lang: Optional[str] = None) -> Dict[str, str]:
+def get_language_dict(lang: Optional[str] = None) -> Mapping[str, str]:
     """
     Retorna o dicionário completo de traduções para um idioma.
 
@@ -243,15 +315,9 @@ def get_language_dict(lang: Optional[str] = None) -> Dict[str, str]:
         lang: O código do idioma (padrão: idioma do sistema)
 
     Returns:
-        Dicionário com todas as traduções do idioma
+        Mapa imutável com todas as traduções do idioma
     """
-    if lang is None:
-        lang = DEFAULT_LANGUAGE
-
-    if lang not in LANGUAGES:
-        lang = DEFAULT_LANGUAGE
-
-    return LANGUAGES[lang]
+    return CATALOG.get_map(lang)
 
 
 def set_system_language(lang: str) -> bool:
@@ -266,8 +332,9 @@ def set_system_language(lang: str) -> bool:
     """
     global DEFAULT_LANGUAGE
 
-    if lang in LANGUAGES:
+    if CATALOG.supports(lang):
         DEFAULT_LANGUAGE = lang
+        CATALOG.set_default_language(lang)
         os.environ["SYSTEM_LANGUAGE"] = lang
         return True
 
@@ -299,11 +366,11 @@ class I18n:
 
     def set_language(self, lang: str) -> bool:
         """Define o idioma para esta instância."""
-        if lang in LANGUAGES:
+        if CATALOG.supports(lang):
             self.lang = lang
             return True
         return False
 
-    def get_dict(self) -> Dict[str, str]:
+    def get_dict(self) -> Mapping[str, str]:
         """Retorna o dicionário de traduções para o idioma atual."""
         return get_language_dict(self.lang)
@@ -0,0 +1,132 @@
+"""
+Paginação keyset (cursor) e exportação em streaming para listagens da API.
+
+Os cursores codificam a última posição retornada (timestamp, id), permitindo
+percorrer históricos longos sem OFFSET e com custo constante por página.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import base64
+import json
+
+from backend.core.serialization import dumps
+
+# Limites de página aceitos pelos endpoints de listagem
+MAX_PAGE_SIZE = 1000
+
+# Formatos de resposta suportados
+FORMAT_JSON = "json"
+FORMAT_NDJSON = "ndjson"
+FORMAT_JSON_ARRAY = "json-array"
+STREAM_FORMATS = {FORMAT_NDJSON, FORMAT_JSON_ARRAY}
+
+STREAM_MIMETYPES = {
+    FORMAT_NDJSON: "application/x-ndjson",
+    FORMAT_JSON_ARRAY: "application/json",
+}
+
+
+class CursorError(Exception):
+    """Exceção para cursores de paginação inválidos."""
+
+
+def encode_cursor(timestamp: Any, row_id: int) -> str:
+    """Codifica a posição (timestamp, id) em um cursor opaco e seguro para URL."""
+    if isinstance(timestamp, (datetime, date)):
+        timestamp = timestamp.isoformat()
+    payload = json.dumps({"ts": timestamp, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decodifica um cursor gerado por ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        timestamp = payload["ts"]
+        row_id = int(payload["id"])
+        # Garante que o timestamp é uma data válida antes de ir ao banco
+        datetime.fromisoformat(str(timestamp))
+    except Exception as e:
+        raise CursorError(f"Cursor inválido: {cursor}") from e
+    return timestamp, row_id
+
+
+def parse_page_args(args: Dict[str, Any], default_limit: int) -> Dict[str, Any]:
+    """
+    Lê ``limit``, ``cursor`` e ``format`` dos argumentos da requisição.
+
+    Em modo streaming o limite é opcional (exporta até o fim do histórico).
+    """
+    fmt = (args.get("format") or FORMAT_JSON).lower()
+    if fmt != FORMAT_JSON and fmt not in STREAM_FORMATS:
+        raise CursorError(f"Formato não suportado: {fmt}")
+
+    raw_limit = args.get("limit")
+    if raw_limit in (None, ""):
+        limit = None if fmt in STREAM_FORMATS else default_limit
+    else:
+        try:
+            limit = int(raw_limit)
+        except (TypeError, ValueError) as e:
+            raise CursorError("limit deve ser um número inteiro") from e
+        if limit < 1 or (fmt == FORMAT_JSON and limit > MAX_PAGE_SIZE):
+            raise CursorError(f"limit deve estar entre 1 e {MAX_PAGE_SIZE}")
+
+    cursor = args.get("cursor")
+    position = decode_cursor(cursor) if cursor else None
+    return {"format": fmt, "limit": limit, "position": position}
+
+
+def keyset_query(
+    select_sql: str,
+    order_column: str,
+    position: Optional[Tuple[str, int]],
+    limit: Optional[int],
+) -> Tuple[str, List[Any]]:
+    """
+    Monta a consulta keyset ordenada por ``(order_column, id)`` decrescente.
+
+    ``select_sql`` não deve conter WHERE/ORDER BY/LIMIT.
+    """
+    params: List[Any] = []
+    query = select_sql
+    if position is not None:
+        query += f" WHERE ({order_column}, id) < (%s, %s)"
+        params.extend(position)
+    query += f" ORDER BY {order_column} DESC, id DESC"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+    return query, params
+
+
+def next_cursor(
+    rows: List[Dict[str, Any]], order_column: str, limit: Optional[int]
+) -> Optional[str]:
+    """Retorna o cursor da próxima página ou None se a página não estiver cheia."""
+    if not rows or limit is None or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last[order_column], last["id"])
+
+
+def dumps_row(row: Dict[str, Any]) -> str:
+    """Serializa uma linha em JSON compacto."""
+    return dumps(row)
+
+
+def stream_rows(rows: Iterable[Dict[str, Any]], fmt: str) -> Iterator[str]:
+    """Gera o corpo da resposta em NDJSON ou como array JSON incremental."""
+    if fmt == FORMAT_NDJSON:
+        for row in rows:
+            yield dumps_row(row) + "\n"
+        return
+
+    yield "["
+    first = True
+    for row in rows:
+        yield ("" if first else ",") + dumps_row(row)
+        first = False
+    yield "]"
@@ -0,0 +1,376 @@
+"""
+Limite de requisições por janela deslizante, no Redis ou em memória.
+
+Cada cliente é identificado pelo usuário do JWT (quando autenticado) ou pelo
+IP (atrás do nginx, o ``ProxyFix`` da API restaura o IP do cliente a partir
+de ``X-Forwarded-For``). Uma requisição consome unidades de até dois buckets:
+
+- o bucket do cliente (``security.rate_limit_per_minute`` por IP,
+  ``security.rate_limit.per_user_per_minute`` por usuário), cobrado pelo
+  *custo* da rota: endpoints que disparam scraping custam mais que uma
+  leitura comum;
+- o bucket da classe da rota (``security.rate_limit.classes``), contado em
+  requisições, que limita cada cliente nos endpoints caros.
+
+A janela deslizante é aproximada por duas janelas fixas: o uso estimado é a
+contagem da janela atual mais a da anterior, ponderada pela fração dela que
+ainda cai nos últimos ``window`` segundos. No Redis, todos os buckets de uma
+requisição são verificados e cobrados por um único script Lua (uma ida ao
+servidor, sem corridas entre workers); sem Redis, o mesmo cálculo é feito em
+memória, por processo. Requisições recusadas não consomem unidades.
+
+As variáveis ``RATELIMIT_STORAGE_URL``, ``RATELIMIT_DEFAULT`` e
+``RATELIMIT_LOGIN_ATTEMPTS`` (``"100 per hour"``) do docker-compose
+sobrepõem o config.yaml. Os limites acompanham a recarga a quente do
+config.yaml; a conexão com o Redis é feita uma vez, na criação do app.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import logging
+import math
+import os
+import re
+import threading
+import time
+
+from flask import current_app, request
+
+from config.config_loader import CONFIG
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit"
+
+# Endpoints nunca limitados (sondas do orquestrador)
+EXEMPT_ENDPOINTS = {"health", "health_live", "health_ready", "static"}
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE = re.compile(
+    r"^\s*(\d+)\s*(?:per|/)\s*(second|minute|hour|day)s?\s*$", re.IGNORECASE
+)
+
+# Script da janela deslizante para N buckets.
+# KEYS: janela atual e anterior de cada bucket, em pares.
+# ARGV: por bucket, limite, peso da janela anterior, custo e TTL em ms.
+# Retorna {0} se cobrou todos, ou {i, atual, anterior} do primeiro bucket estourado.
+SLIDING_WINDOW_SCRIPT = """
+local buckets = #KEYS / 2
+for i = 1, buckets do
+  local base = (i - 1) * 4
+  local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+  local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+  local used = previous * tonumber(ARGV[base + 2]) + current
+  if used + tonumber(ARGV[base + 3]) > tonumber(ARGV[base + 1]) then
+    return {i, current, previous}
+  end
+end
+for i = 1, buckets do
+  local base = (i - 1) * 4
+  redis.call('INCRBY', KEYS[2 * i - 1], ARGV[base + 3])
+  redis.call('PEXPIRE', KEYS[2 * i - 1], ARGV[base + 4])
+end
+return {0}
+"""
+
+
+class RateLimitExceeded(Exception):
+    """Cliente acima do limite; ``retry_after`` em segundos."""
+
+    def __init__(self, message: str, retry_after: int, bucket: str):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.bucket = bucket
+
+
+def parse_rate(text: Optional[str]) -> Optional[Tuple[int, int]]:
+    """``"100 per hour"`` / ``"5/minute"`` -> ``(limite, janela em segundos)``."""
+    if not text:
+        return None
+    match = _RATE.match(text)
+    if not match:
+        logger.warning(f"Limite de requisições inválido ignorado: {text!r}")
+        return None
+    return int(match.group(1)), _PERIODS[match.group(2).lower()]
+
+
+def retry_after(
+    limit: int, window: int, elapsed: float, current: float, previous: float, cost: int
+) -> int:
+    """Segundos até ``cost`` unidades caberem no bucket."""
+    if cost > limit:
+        return window
+    room = limit - cost
+    if current <= room:
+        # Basta a janela anterior perder peso o suficiente
+        wait = window * (1 - (room - current) / previous) - elapsed if previous else 0
+    else:
+        # Só na próxima janela, quando a atual passa a ser a anterior
+        wait = (window - elapsed) + window * (1 - room / current)
+    return max(1, math.ceil(wait))
+
+
+class SlidingWindowLimiter:
+    """Contadores de janela deslizante no Redis (script Lua) ou em memória."""
+
+    # Entradas em memória a partir das quais janelas vencidas são descartadas
+    MEMORY_PURGE_THRESHOLD = 10_000
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        client=None,
+        clock: Callable[[], float] = time.time,
+        prefix: str = KEY_PREFIX,
+    ):
+        self.redis = client
+        self._clock = clock
+        self.prefix = prefix
+        if self.redis is None and redis_url:
+            # Importado só quando o limite usa Redis de fato
+            import redis
+
+            try:
+                self.redis = redis.from_url(redis_url)
+                self.redis.ping()
+            except redis.exceptions.ConnectionError as e:
+                logger.warning(
+                    f"Falha na conexão com Redis: {e}. "
+                    "Limite de requisições em memória."
+                )
+                self.redis = None
+        self._script = (
+            self.redis.register_script(SLIDING_WINDOW_SCRIPT) if self.redis else None
+        )
+        # chave -> [índice da janela, contagem atual, contagem anterior, janela]
+        self._windows: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.redis_errors = 0
+
+    def hit(
+        self, buckets: Sequence[Tuple[str, int, int, int]]
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Cobra ``custo`` de cada bucket ``(chave, limite, janela, custo)``.
+
+        Cobra todos ou nenhum: retorna ``None`` se a requisição foi aceita ou
+        ``(chave, retry_after)`` do primeiro bucket estourado.
+        """
+        now = self._clock()
+        windows = []
+        for key, limit, window, cost in buckets:
+            index = int(now // window)
+            elapsed = now - index * window
+            windows.append((key, limit, window, cost, index, elapsed))
+
+        result = None
+        if self._script is not None:
+            try:
+                result = self._hit_redis(windows)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Redis indisponível para o limite de requisições: {e}")
+        if result is None:
+            result = self._hit_memory(windows)
+
+        if result == (0,):
+            self.allowed += 1
+            return None
+        self.rejected += 1
+        position, current, previous = result
+        key, limit, window, cost, _, elapsed = windows[position - 1]
+        return key, retry_after(
+            limit, window, elapsed, float(current), float(previous), cost
+        )
+
+    def _window_key(self, key: str, window: int, index: int) -> str:
+        return f"{self.prefix}:{key}:{window}:{index}"
+
+    def _hit_redis(self, windows) -> Tuple:
+        keys, args = [], []
+        for key, limit, window, cost, index, elapsed in windows:
+            keys += [
+                self._window_key(key, window, index),
+                self._window_key(key, window, index - 1),
+            ]
+            args += [limit, repr(1 - elapsed / window), cost, window * 2000]
+        return tuple(int(value) for value in self._script(keys=keys, args=args))
+
+    def _hit_memory(self, windows) -> Tuple:
+        with self._lock:
+            states = []
+            for position, (key, limit, window, cost, index, elapsed) in enumerate(
+                windows, 1
+            ):
+                state = self._memory_state(f"{key}:{window}", index, window)
+                current, previous = state[1], state[2]
+                if previous * (1 - elapsed / window) + current + cost > limit:
+                    return position, current, previous
+                states.append((state, cost))
+            for state, cost in states:
+                state[1] += cost
+            if len(self._windows) > self.MEMORY_PURGE_THRESHOLD:
+                self._purge(self._clock())
+        return (0,)
+
+    def _memory_state(self, key: str, index: int, window: int) -> List[float]:
+        state = self._windows.get(key)
+        if state is None or state[0] < index - 1:
+            state = self._windows[key] = [index, 0, 0, window]
+        elif state[0] == index - 1:
+            state[:3] = [index, 0, state[1]]
+        return state
+
+    def _purge(self, now: float):
+        # Sem contagem na janela atual nem na anterior, o bucket está zerado
+        stale = [
+            key
+            for key, state in self._windows.items()
+            if state[0] < int(now // state[3]) - 1
+        ]
+        for key in stale:
+            del self._windows[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "redis" if self._script is not None else "memory",
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "redis_errors": self.redis_errors,
+            "tracked_windows": len(self._windows),
+        }
+
+
+class RouteClass:
+    """Custo de uma classe de rotas e limite próprio por cliente."""
+
+    def __init__(self, cost: int = 1, rate: Optional[Tuple[int, int]] = None):
+        self.cost = cost
+        self.rate = rate
+
+
+def _redis_url() -> Optional[str]:
+    return os.getenv("RATELIMIT_STORAGE_URL") or CONFIG.get("redis", {}).get("url")
+
+
+def _classes_from_config(settings) -> Dict[str, RouteClass]:
+    classes = {}
+    for name, entry in (settings.get("classes") or {}).items():
+        per_minute = entry.get("per_minute")
+        classes[name] = RouteClass(
+            cost=int(entry.get("cost", 1)),
+            rate=(int(per_minute), 60) if per_minute else None,
+        )
+    login_rate = parse_rate(os.getenv("RATELIMIT_LOGIN_ATTEMPTS"))
+    if login_rate:
+        classes.setdefault("auth", RouteClass()).rate = login_rate
+    return classes
+
+
+def rate_limit_class(name: str):
+    """Marca a view com a classe de rota ``name`` (logo abaixo de ``@app.route``)."""
+
+    def decorator(fn):
+        fn.rate_limit_class = name
+        return fn
+
+    return decorator
+
+
+def _client_key() -> Tuple[str, bool]:
+    """
+    ``user:<nome>`` com access token válido, senão ``ip:<endereço>``.
+
+    O token é lido pelo ``AuthManager`` do app (``app.jwt_auth``), com o mesmo
+    cache de tokens decodificados do ``jwt_required``.
+    """
+    auth = getattr(current_app, "jwt_auth", None)
+    user = auth.current_user() if auth is not None else None
+    if user:
+        return f"user:{user}", True
+    return f"ip:{request.remote_addr or 'unknown'}", False
+
+
+class RequestRateLimiter:
+    """
+    Aplica os limites às requisições do app Flask (``before_request``).
+
+    Limites não informados vêm de ``security`` no config.yaml e são
+    atualizados a cada recarga.
+    """
+
+    def __init__(
+        self,
+        limiter: Optional[SlidingWindowLimiter] = None,
+        ip_rate: Optional[Tuple[int, int]] = None,
+        user_rate: Optional[Tuple[int, int]] = None,
+        classes: Optional[Dict[str, RouteClass]] = None,
+    ):
+        self.limiter = limiter or SlidingWindowLimiter(_redis_url())
+        self._overrides = (ip_rate, user_rate, classes)
+        self.enabled = True
+        self.ip_rate = ip_rate
+        self.user_rate = user_rate
+        self.classes = classes
+        CONFIG.subscribe(self._apply_config, "security")
+
+    def _apply_config(self, config):
+        security = config["security"]
+        settings = security.get("rate_limit") or {}
+        ip_rate, user_rate, classes = self._overrides
+        self.enabled = bool(settings.get("enabled", True))
+        self.ip_rate = (
+            ip_rate
+            or parse_rate(os.getenv("RATELIMIT_DEFAULT"))
+            or (
+                int(security.get("rate_limit_per_minute", 100)),
+                60,
+            )
+        )
+        self.user_rate = user_rate or (
+            int(settings.get("per_user_per_minute", self.ip_rate[0])),
+            60,
+        )
+        self.classes = (
+            classes if classes is not None else _classes_from_config(settings)
+        )
+
+    def buckets(self, client: str, authenticated: bool, route_class: Optional[str]):
+        """Buckets ``(chave, limite, janela, custo)`` cobrados pela requisição."""
+        limit, window = self.user_rate if authenticated else self.ip_rate
+        spec = self.classes.get(route_class) if route_class else None
+        buckets = [(client, limit, window, spec.cost if spec else 1)]
+        if spec is not None and spec.rate is not None:
+            buckets.append((f"{route_class}:{client}", spec.rate[0], spec.rate[1], 1))
+        return buckets
+
+    def __call__(self):
+        app = current_app
+        if not app.config.get("RATELIMIT_ENABLED", self.enabled and not app.testing):
+            return None
+        if request.method == "OPTIONS" or request.endpoint in EXEMPT_ENDPOINTS:
+            return None
+        view = app.view_functions.get(request.endpoint)
+        route_class = getattr(view, "rate_limit_class", None)
+        client, authenticated = _client_key()
+        exceeded = self.limiter.hit(self.buckets(client, authenticated, route_class))
+        if exceeded is not None:
+            bucket, wait = exceeded
+            logger.warning(
+                f"Limite de requisições excedido ({bucket}) em {request.path}"
+            )
+            raise RateLimitExceeded(
+                "Limite de requisições excedido; tente novamente mais tarde",
+                wait,
+                bucket,
+            )
+        return None
+
+
+def register_rate_limiting(app, rate_limiter: Optional[RequestRateLimiter] = None):
+    """Instala o limite no app Flask (disponível em ``app.rate_limiter``)."""
+    rate_limiter = rate_limiter or RequestRateLimiter()
+    app.before_request(rate_limiter)
+    app.rate_limiter = rate_limiter
+    return rate_limiter
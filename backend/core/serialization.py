@@ -0,0 +1,110 @@
+"""
+Serialização JSON compartilhada pelos apps (Flask, FastAPI e exportações).
+
+Usa o ``orjson`` quando instalado e cai no ``json`` da biblioteca padrão caso
+contrário, com a mesma saída nos dois casos para os tipos que aparecem nas
+respostas: ``datetime``/``date``/``time`` em ISO 8601, ``Decimal`` (colunas
+``NUMERIC`` do PostgreSQL) como número, ``UUID`` como texto e conjuntos como
+listas. A saída é compacta, em UTF-8 e preserva a ordem das chaves.
+
+- ``JSONProvider``: provider do Flask (``jsonify``), registrado com
+  ``register_json_provider(app)``;
+- ``FastJSONResponse``: ``default_response_class`` do FastAPI;
+- ``dumps``/``dumps_bytes``/``loads``: uso direto (streams, WebSocket).
+"""
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+import json
+
+from flask.json.provider import JSONProvider as FlaskJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Nome do backend em uso (exposto em métricas e no benchmark)
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(value: Any) -> Any:
+    """Tipos que nenhum dos backends serializa nativamente."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def _stdlib_default(value: Any) -> Any:
+    # O orjson já trata estes tipos nativamente
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return _default(value)
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serializa ``obj`` em JSON compacto (UTF-8)."""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS).decode(
+            "utf-8"
+        )
+
+    loads = orjson.loads
+
+else:
+
+    def dumps(obj: Any) -> str:
+        """Serializa ``obj`` em JSON compacto."""
+        return json.dumps(
+            obj, default=_stdlib_default, ensure_ascii=False, separators=(",", ":")
+        )
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return dumps(obj).encode("utf-8")
+
+    loads = json.loads
+
+
+class JSONProvider(FlaskJSONProvider):
+    """Provider do Flask sobre ``dumps``/``loads`` deste módulo."""
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Gera bytes direto, sem passar por str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def register_json_provider(app):
+    """Troca o provider JSON do app Flask pelo ``JSONProvider``."""
+    app.json = JSONProvider(app)
+    return app.json
+
+
+def fast_json_response_class():
+    """``JSONResponse`` do Starlette/FastAPI que serializa com ``dumps_bytes``."""
+    from fastapi.responses import JSONResponse
+
+    class FastJSONResponse(JSONResponse):
+        def render(self, content: Any) -> bytes:
+            return dumps_bytes(content)
+
+    return FastJSONResponse
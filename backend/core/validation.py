@@ -6,12 +6,19 @@ Implementa validação de entrada usando Pydantic e sanitização contra XSS/SQL
 from typing import Dict, Any, Optional, List
 import re
 import html
-import bleach
 import logging
-from pydantic import BaseModel, validator, EmailStr, Field, ValidationError
-from marshmallow import Schema, fields, validate
-from functools import wraps
+import threading
+import time
+from pydantic import BaseModel, ConfigDict, validator, EmailStr, Field, ValidationError
+from pydantic import ValidationError as PydanticValidationError
+from functools import lru_cache, wraps
 from flask import request, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.wrappers import Response
+
+from backend.core.serialization import dumps
+
+from config.config_loader import CONFIG
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +26,21 @@ logger = logging.getLogger(__name__)
 ALLOWED_TAGS = ["b", "i", "u", "em", "strong", "p", "br"]
 ALLOWED_ATTRIBUTES = {}
 
+# Limites aplicados antes da validação dos payloads JSON
+# (recarregados com o config.yaml)
+MAX_JSON_BODY_BYTES = 1024 * 1024
+MAX_JSON_STRING_LENGTH = 10000
+
+
+def _apply_limits(config):
+    global MAX_JSON_BODY_BYTES, MAX_JSON_STRING_LENGTH
+    security = config.get("security", {})
+    MAX_JSON_BODY_BYTES = int(security.get("max_json_body_bytes", 1024 * 1024))
+    MAX_JSON_STRING_LENGTH = int(security.get("max_json_string_length", 10000))
+
+
+CONFIG.subscribe(_apply_limits, "security")
+
 
 class SecurityError(Exception):
     """Exceção para violações de segurança."""
@@ -30,10 +52,16 @@ class ValidationError(Exception):
 
 # ============= SCHEMAS PYDANTIC =============
 
+# Validadores construídos na primeira validação (ou em ``build_schemas``),
+# não no import do módulo
+_SCHEMA_CONFIG = ConfigDict(defer_build=True)
+
 
 class LoginRequestSchema(BaseModel):
     """Schema para validação de login."""
 
+    model_config = _SCHEMA_CONFIG
+
     username: str = Field(
         ..., min_length=3, max_length=50, pattern=r"^[a-zA-Z0-9_.-]+$"
     )
@@ -69,6 +97,8 @@ class LoginRequestSchema(BaseModel):
 class UserCreateSchema(BaseModel):
     """Schema para criação de usuário."""
 
+    model_config = _SCHEMA_CONFIG
+
     username: str = Field(
         ..., min_length=3, max_length=50, pattern=r"^[a-zA-Z0-9_.-]+$"
     )
@@ -98,6 +128,8 @@ class UserCreateSchema(BaseModel):
 class BetInsertSchema(BaseModel):
     """Schema para inserção de apostas."""
 
+    model_config = _SCHEMA_CONFIG
+
     event: str = Field(..., min_length=3, max_length=200)
     market: str = Field(..., min_length=2, max_length=100)
     selection: str = Field(..., min_length=2, max_length=100)
@@ -120,6 +152,8 @@ class BetInsertSchema(BaseModel):
 class SearchParamsSchema(BaseModel):
     """Schema para parâmetros de busca."""
 
+    model_config = _SCHEMA_CONFIG
+
     query: Optional[str] = Field(None, max_length=100)
     page: Optional[int] = Field(1, ge=1, le=1000)
     limit: Optional[int] = Field(20, ge=1, le=100)
@@ -133,45 +167,124 @@ class SearchParamsSchema(BaseModel):
         return v
 
 
+def build_schemas():
+    """Constrói os validadores adiados (chamado pelo mestre antes do fork)."""
+    for schema in (
+        LoginRequestSchema,
+        UserCreateSchema,
+        BetInsertSchema,
+        SearchParamsSchema,
+    ):
+        schema.model_rebuild(force=True)
+
+
 # ============= SCHEMAS MARSHMALLOW (ALTERNATIVA) =============
 
 
-class UserMarshmallowSchema(Schema):
-    """Schema Marshmallow para usuários."""
+@lru_cache(maxsize=None)
+def _user_marshmallow_schema():
+    # Marshmallow só é importado por quem usa o schema alternativo
+    from marshmallow import Schema, fields, validate
 
-    username = fields.Str(required=True, validate=validate.Length(min=3, max=50))
-    email = fields.Email(required=True)
-    password = fields.Str(required=True, validate=validate.Length(min=8, max=128))
-    role = fields.Str(
-        required=True, validate=validate.OneOf(["admin", "operator", "viewer"])
-    )
+    class UserMarshmallowSchema(Schema):
+        """Schema Marshmallow para usuários."""
+
+        username = fields.Str(required=True, validate=validate.Length(min=3, max=50))
+        email = fields.Email(required=True)
+        password = fields.Str(required=True, validate=validate.Length(min=8, max=128))
+        role = fields.Str(
+            required=True, validate=validate.OneOf(["admin", "operator", "viewer"])
+        )
+
+    return UserMarshmallowSchema
+
+
+def __getattr__(name):
+    if name == "UserMarshmallowSchema":
+        return _user_marshmallow_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============= FUNÇÕES DE SANITIZAÇÃO =============
 
 
+# Caracteres de controle e invisíveis (inclui zero-width, RLO, etc)
+_CONTROL_CHARS_TABLE = dict.fromkeys(
+    [
+        *range(0x00, 0x09),
+        0x0B,
+        0x0C,
+        *range(0x0E, 0x20),
+        *range(0x7F, 0x85),
+        *range(0x86, 0xA0),
+        0x200B,
+        0x200C,
+        0x200D,
+        *range(0x202A, 0x202F),
+        0xFEFF,
+    ]
+)
+
+# Palavras-chave perigosas (alert, javascript, etc), removidas nesta ordem
+DANGEROUS_KEYWORDS = [
+    r"alert",
+    r"javascript",
+    r"onerror",
+    r"onload",
+    r"<script>",
+    r"</script>",
+    r"drop table",
+    r"insert into",
+    r"delete from",
+    r"update set",
+]
+_DANGEROUS_KEYWORD_RES = [re.compile(kw, re.IGNORECASE) for kw in DANGEROUS_KEYWORDS]
+_ANY_DANGEROUS_KEYWORD_RE = re.compile("|".join(DANGEROUS_KEYWORDS), re.IGNORECASE)
+
+# Textos curtos (nomes de times, mercados) repetem muito entre respostas
+SANITIZE_CACHE_SIZE = 8192
+SANITIZE_CACHE_MAX_LENGTH = 256
+
+
 def sanitize_text(text: str) -> str:
     """
     Sanitiza texto contra XSS, SQLi, Unicode invisível e outros ataques, sem bloquear dados legítimos de scraping.
+
+    Texto sem ``<``, ``>`` ou ``&`` não passa pelo bleach (que não o alteraria);
+    o resultado de textos curtos é memorizado.
     """
     if not isinstance(text, str):
         return str(text)
+    if len(text) <= SANITIZE_CACHE_MAX_LENGTH:
+        return _sanitize_cached(text)
+    return _sanitize(text)
+
 
-    # Remover caracteres de controle e invisíveis (inclui zero-width, RLO, etc)
-    text = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x84\x86-\x9f\u200b\u200c\u200d\u202a-\u202e\ufeff]", "", text)
+def _sanitize(text: str) -> str:
+    text = " ".join(text.translate(_CONTROL_CHARS_TABLE).split())
+    if "<" in text or ">" in text or "&" in text:
+        # Marcação ou entidades: precisa do parser HTML
+        return _sanitize_html(text)
+    if _ANY_DANGEROUS_KEYWORD_RE.search(text):
+        for regex in _DANGEROUS_KEYWORD_RES:
+            text = regex.sub("", text)
+    return html.escape(text, quote=True)
 
-    # Remover múltiplos espaços
-    text = re.sub(r"\s+", " ", text).strip()
 
-    # Usar bleach para sanitização XSS (sem tags, sem atributos)
+_sanitize_cached = lru_cache(maxsize=SANITIZE_CACHE_SIZE)(_sanitize)
+
+
+def _sanitize_html(text: str) -> str:
+    """Pipeline completo com bleach, para texto com marcação ou entidades."""
+    # Usar bleach para sanitização XSS (sem tags, sem atributos); importado
+    # sob demanda, pois a maior parte do texto nunca chega aqui
+    import bleach
+
     text = bleach.clean(text, tags=[], attributes={}, strip=True)
 
     # Remover palavras-chave perigosas (alert, javascript, etc)
-    dangerous_keywords = [
-        r"alert", r"javascript", r"onerror", r"onload", r"<script>", r"</script>", r"drop table", r"insert into", r"delete from", r"update set"
-    ]
-    for kw in dangerous_keywords:
-        text = re.sub(kw, "", text, flags=re.IGNORECASE)
+    for regex in _DANGEROUS_KEYWORD_RES:
+        text = regex.sub("", text)
 
     # Escape HTML (apenas após bleach e filtro de palavras)
     text = html.escape(text, quote=True)
@@ -181,37 +294,148 @@ def sanitize_text(text: str) -> str:
     return text
 
 
+# ============= DETECÇÃO DE ATAQUES =============
+
+SQL_INJECTION_PATTERNS = [
+    r"(;\s*--)",
+    r"(;\s*\/\*)",
+    r"(\/\*.*\*\/)",  # Comentários /* ... */
+    r"(\bunion\b.*\bselect\b)",
+    r"(\bdrop\b.*\btable\b)",
+    r"(\binsert\b.*\binto\b)",
+    r"(\bdelete\b.*\bfrom\b)",
+    r"(\bupdate\b.*\bset\b)",
+    r"(['\"]?\s*or\s*['\"]?\s*\d+\s*=\s*['\"]?\d+)",  # OR 1=1
+    r"(['\"]?\s*and\s*['\"]?\s*\d+\s*=\s*['\"]?\d+)",  # AND 1=1
+    r"(['\"]\s*or\s*['\"]?1['\"]?=['\"]?1)",
+    r"(['\"]\s*and\s*['\"]?1['\"]?=['\"]?1)",
+    r"(waitfor\s+delay)",
+    r"(sleep\s*\()",
+    r"(select\s*\(.*\))",  # subqueries
+    r"(ascii\s*\()",
+    r"(\b(and|or)\b.*\(\s*select.*\))",  # AND (SELECT ...)
+    r"(\/\*\*\/|\/\*.*?\*\/)",  # /**/ comments
+]
+
+XSS_PATTERNS = [
+    r"<script.*?>.*?</script>",
+    r"javascript:",
+    r"on\w+\s*=",
+    r"<iframe.*?>",
+    r"<object.*?>",
+    r"<embed.*?>",
+    r"expression\s*\(",
+    r"url\s*\(",
+    r"<meta.*?>",
+    r"<link.*?>",
+]
+
+# Nomes e mercados esportivos comuns nunca são tratados como XSS
+XSS_SAFE_KEYWORDS = (
+    "over",
+    "under",
+    "draw",
+    "team",
+    "score",
+    "goals",
+    "match",
+    "winner",
+    "handicap",
+    "corner",
+    "yellow card",
+    "red card",
+)
+
+
+# Literais que cada padrão exige no texto (minúsculo) para poder casar. Funcionam
+# como pré-filtro: só os padrões cujos gatilhos aparecem no texto são executados.
+SQL_INJECTION_TRIGGERS = [
+    (";", "--"),
+    (";", "/*"),
+    ("/*", "*/"),
+    ("union", "select"),
+    ("drop", "table"),
+    ("insert", "into"),
+    ("delete", "from"),
+    ("update", "set"),
+    ("or", "="),
+    ("and", "="),
+    ("or", "="),
+    ("and", "="),
+    ("waitfor", "delay"),
+    ("sleep", "("),
+    ("select", "("),
+    ("ascii", "("),
+    ("select", "(", ")"),
+    ("/*", "*/"),
+]
+
+XSS_TRIGGERS = [
+    ("<script", "</script"),
+    ("javascript:",),
+    ("on", "="),
+    ("<iframe",),
+    ("<object",),
+    ("<embed",),
+    ("expression", "("),
+    ("url", "("),
+    ("<meta",),
+    ("<link",),
+]
+
+
+class PatternScanner:
+    """
+    Conjunto de regexes pré-compiladas com pré-filtro por literais.
+
+    Para texto ASCII, cada padrão só roda se todos os seus gatilhos estiverem
+    presentes (busca de substring em C, bem mais barata que a regex). Texto
+    com não-ASCII roda todos os padrões, pois ``re.IGNORECASE`` equipara
+    caracteres como ``ſ`` e ``s`` que o pré-filtro não conhece.
+    """
+
+    def __init__(self, patterns: List[str], triggers: List[tuple]):
+        if len(patterns) != len(triggers):
+            raise ValueError("Cada padrão precisa da sua lista de gatilhos")
+        self.patterns = list(patterns)
+        self._compiled = [re.compile(p, re.IGNORECASE) for p in patterns]
+        self._triggers = [frozenset(t) for t in triggers]
+        self._all_triggers = frozenset().union(*self._triggers)
+
+    def search(self, text_lower: str) -> Optional[str]:
+        """Retorna o primeiro padrão que casa com o texto (já em minúsculas)."""
+        if text_lower.isascii():
+            present = {t for t in self._all_triggers if t in text_lower}
+            if not present:
+                return None
+            candidates = zip(self.patterns, self._compiled, self._triggers)
+            for pattern, regex, triggers in candidates:
+                if triggers <= present and regex.search(text_lower):
+                    return pattern
+            return None
+        for pattern, regex in zip(self.patterns, self._compiled):
+            if regex.search(text_lower):
+                return pattern
+        return None
+
+
+SQL_INJECTION_SCANNER = PatternScanner(SQL_INJECTION_PATTERNS, SQL_INJECTION_TRIGGERS)
+XSS_SCANNER = PatternScanner(XSS_PATTERNS, XSS_TRIGGERS)
+
+
 def detect_sql_injection(text: str) -> bool:
     """
     Detecta tentativas de SQL injection, incluindo variantes clássicas, booleanas, comentários e subqueries.
     """
     if not isinstance(text, str):
         return False
-    sql_patterns = [
-        r"(;\s*--)",
-        r"(;\s*\/\*)",
-        r"(\/\*.*\*\/)",  # Comentários /* ... */
-        r"(\bunion\b.*\bselect\b)",
-        r"(\bdrop\b.*\btable\b)",
-        r"(\binsert\b.*\binto\b)",
-        r"(\bdelete\b.*\bfrom\b)",
-        r"(\bupdate\b.*\bset\b)",
-        r"(['\"]?\s*or\s*['\"]?\s*\d+\s*=\s*['\"]?\d+)",  # OR 1=1
-        r"(['\"]?\s*and\s*['\"]?\s*\d+\s*=\s*['\"]?\d+)", # AND 1=1
-        r"(['\"]\s*or\s*['\"]?1['\"]?=['\"]?1)",
-        r"(['\"]\s*and\s*['\"]?1['\"]?=['\"]?1)",
-        r"(waitfor\s+delay)",
-        r"(sleep\s*\()",
-        r"(select\s*\(.*\))",  # subqueries
-        r"(ascii\s*\()",
-        r"(\b(and|or)\b.*\(\s*select.*\))", # AND (SELECT ...)
-        r"(\/\*\*\/|\/\*.*?\*\/)", # /**/ comments
-    ]
-    text_lower = text.lower()
-    for pattern in sql_patterns:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            logger.warning(f"Possível SQL injection detectado: {pattern}")
-            return True
+    # Caminho rápido: palavras simples (nomes, números) não casam com nenhum padrão
+    if text.isalnum():
+        return False
+    pattern = SQL_INJECTION_SCANNER.search(text.lower())
+    if pattern:
+        logger.warning(f"Possível SQL injection detectado: {pattern}")
+        return True
     return False
 
 
@@ -221,29 +445,17 @@ def detect_xss(text: str) -> bool:
     """
     if not isinstance(text, str):
         return False
-    xss_patterns = [
-        r"<script.*?>.*?</script>",
-        r"javascript:",
-        r"on\w+\s*=",
-        r"<iframe.*?>",
-        r"<object.*?>",
-        r"<embed.*?>",
-        r"expression\s*\(",
-        r"url\s*\(",
-        r"<meta.*?>",
-        r"<link.*?>",
-    ]
+    # Todo padrão de XSS exige um destes caracteres
+    if not any(char in text for char in "<:=("):
+        return False
     text_lower = text.lower()
     # Permitir nomes e mercados esportivos comuns
-    safe_keywords = [
-        "over", "under", "draw", "team", "score", "goals", "match", "winner", "handicap", "corner", "yellow card", "red card"
-    ]
-    if any(kw in text_lower for kw in safe_keywords):
+    if any(kw in text_lower for kw in XSS_SAFE_KEYWORDS):
         return False
-    for pattern in xss_patterns:
-        if re.search(pattern, text_lower, re.IGNORECASE):
-            logger.warning(f"Possível XSS detectado: {pattern}")
-            return True
+    pattern = XSS_SCANNER.search(text_lower)
+    if pattern:
+        logger.warning(f"Possível XSS detectado: {pattern}")
+        return True
     return False
 
 
@@ -266,41 +478,146 @@ def sanitize_filename(filename: str) -> str:
 # ============= DECORADORES DE VALIDAÇÃO =============
 
 
+class ValidationStats:
+    """Requisições aceitas/rejeitadas (por motivo) e latência, por schema."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, schema: str, outcome: str, elapsed_ms: float):
+        with self._lock:
+            entry = self._schemas.get(schema)
+            if entry is None:
+                entry = self._schemas[schema] = {
+                    "accepted": 0,
+                    "rejected": {},
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+            if outcome == "accepted":
+                entry["accepted"] += 1
+            else:
+                entry["rejected"][outcome] = entry["rejected"].get(outcome, 0) + 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna os contadores por schema para monitoramento."""
+        with self._lock:
+            result = {}
+            for schema, entry in sorted(self._schemas.items()):
+                rejected = sum(entry["rejected"].values())
+                count = entry["accepted"] + rejected
+                result[schema] = {
+                    "accepted": entry["accepted"],
+                    "rejected": rejected,
+                    "rejected_by_reason": dict(entry["rejected"]),
+                    "avg_ms": round(entry["total_ms"] / count, 3) if count else 0.0,
+                    "max_ms": round(entry["max_ms"], 3),
+                }
+        return {
+            "max_body_bytes": MAX_JSON_BODY_BYTES,
+            "max_string_length": MAX_JSON_STRING_LENGTH,
+            "schemas": result,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._schemas.clear()
+
+
+VALIDATION_STATS = ValidationStats()
+
+
+def scan_json_strings(data: Any, max_length: Optional[int] = None) -> Optional[str]:
+    """
+    Percorre o JSON decodificado uma única vez verificando apenas as strings
+    (chaves e folhas).
+
+    Retorna o motivo da rejeição (``"too_long"`` ou ``"suspicious"``) ou None.
+    """
+    if max_length is None:
+        max_length = MAX_JSON_STRING_LENGTH
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            if len(node) > max_length:
+                return "too_long"
+            if detect_sql_injection(node) or detect_xss(node):
+                return "suspicious"
+        elif isinstance(node, dict):
+            stack.extend(node.keys())
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None
+
+
 def validate_json_schema(schema_class):
     """
     Decorador para validar JSON usando Pydantic e passar validated_data como argumento nomeado para a view.
     """
+    # Validador compilado do schema, resolvido uma vez por rota
+    model_validate = schema_class.model_validate
+    schema_name = schema_class.__name__
 
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "error"
             try:
-                data = request.get_json()
+                # Rejeitar corpos grandes antes de decodificar; sem Content-Length
+                # (chunked), a leitura é interrompida ao passar do limite
+                length = request.content_length
+                if length and length > MAX_JSON_BODY_BYTES:
+                    raise RequestEntityTooLarge()
+                limit_request_body(MAX_JSON_BODY_BYTES)
+
+                data = request.get_json(silent=True)
                 if not data:
+                    outcome = "empty"
                     return jsonify({"error": "JSON payload obrigatório"}), 400
+                if not isinstance(data, dict):
+                    outcome = "invalid"
+                    return jsonify({"error": "JSON payload deve ser um objeto"}), 400
 
                 # Verificar tentativas de ataques antes da validação
-                json_str = str(data)
-                if detect_sql_injection(json_str):
+                problem = scan_json_strings(data)
+                if problem == "too_long":
+                    outcome = problem
+                    return (
+                        jsonify({"error": "Campo de texto excede o tamanho máximo"}),
+                        400,
+                    )
+                if problem == "suspicious":
+                    outcome = problem
                     logger.warning(
-                        f"Tentativa de SQL injection bloqueada: {request.remote_addr}"
+                        "Conteúdo suspeito (SQL injection/XSS) bloqueado: "
+                        f"{request.remote_addr}"
                     )
                     return jsonify({"error": "Conteúdo suspeito detectado"}), 400
 
-                if detect_xss(json_str):
-                    logger.warning(f"Tentativa de XSS bloqueada: {request.remote_addr}")
-                    return jsonify({"error": "Conteúdo suspeito detectado"}), 400
-
                 # Validar com Pydantic
-                validated_data = schema_class(**data)
-                kwargs["validated_data"] = validated_data.dict()
-
-            except ValidationError as e:
+                kwargs["validated_data"] = model_validate(data).model_dump()
+                outcome = "accepted"
+
+            except RequestEntityTooLarge:
+                outcome = "too_large"
+                return jsonify({"error": "Payload excede o tamanho máximo"}), 413
+            except PydanticValidationError as e:
+                outcome = "invalid"
                 logger.warning(f"Erro de validação: {e}")
                 return jsonify({"error": "Dados inválidos", "details": str(e)}), 400
             except Exception as e:
                 logger.error(f"Erro na validação: {e}")
                 return jsonify({"error": "Erro interno de validação"}), 500
+            finally:
+                VALIDATION_STATS.record(
+                    schema_name, outcome, (time.perf_counter() - start) * 1000
+                )
 
             return f(*args, **kwargs)
 
@@ -309,6 +626,100 @@ def validate_json_schema(schema_class):
     return decorator
 
 
+# ============= LIMITE DO CORPO DAS REQUISIÇÕES =============
+
+
+class BoundedInput:
+    """
+    ``wsgi.input`` sem Content-Length (chunked) limitado a ``limit`` bytes.
+
+    Levanta ``RequestEntityTooLarge`` assim que o corpo passa do limite, em
+    vez de truncá-lo; nunca lê mais que um byte além dele.
+    """
+
+    def __init__(self, stream, limit: int):
+        self._stream = stream
+        self.limit = limit
+        self.consumed = 0
+
+    def _bounded_size(self, size: Optional[int]) -> int:
+        remaining = self.limit - self.consumed + 1
+        if size is None or size < 0 or size > remaining:
+            return remaining
+        return size
+
+    def _count(self, data: bytes) -> bytes:
+        self.consumed += len(data)
+        if self.consumed > self.limit:
+            raise RequestEntityTooLarge()
+        return data
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return self._count(self._stream.read(self._bounded_size(size)))
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        return self._count(self._stream.readline(self._bounded_size(size)))
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+
+def limit_request_body(max_bytes: int):
+    """Reduz o limite do corpo da requisição atual (rotas com limite próprio)."""
+    stream = request.environ.get("wsgi.input")
+    if isinstance(stream, BoundedInput):
+        stream.limit = min(stream.limit, max_bytes)
+
+
+class RequestBodyLimit:
+    """
+    Middleware WSGI que aplica ``MAX_CONTENT_LENGTH`` a qualquer corpo.
+
+    O Werkzeug só consulta ``MAX_CONTENT_LENGTH`` ao ler formulários; corpos
+    lidos com ``get_json``/``get_data`` e corpos sem Content-Length (chunked,
+    repassados pelo Gunicorn com ``wsgi.input_terminated``) passariam sem
+    limite. Corpos declarados acima do limite recebem 413 sem serem lidos; os
+    sem tamanho declarado são lidos através de ``BoundedInput``.
+    """
+
+    def __init__(self, wsgi_app, app):
+        self.wsgi_app = wsgi_app
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        limit = self.app.config.get("MAX_CONTENT_LENGTH")
+        if limit is not None:
+            try:
+                length = int(environ.get("CONTENT_LENGTH") or -1)
+            except ValueError:
+                length = -1
+            if length > limit:
+                body = {"error": "Payload excede o tamanho máximo", "code": "too_large"}
+                response = Response(dumps(body), 413, mimetype="application/json")
+                return response(environ, start_response)
+            if length < 0 and environ.get("wsgi.input_terminated"):
+                environ["wsgi.input"] = BoundedInput(environ["wsgi.input"], limit)
+        return self.wsgi_app(environ, start_response)
+
+
+def register_request_body_limit(app, max_bytes: Optional[int] = None):
+    """
+    Define ``MAX_CONTENT_LENGTH`` (padrão: ``server.max_upload_size_mb``) e
+    instala ``RequestBodyLimit`` no app Flask.
+    """
+    if max_bytes is None:
+        max_upload_mb = float(CONFIG["server"].get("max_upload_size_mb", 20))
+        max_bytes = int(max_upload_mb * 1024 * 1024)
+    if app.config.get("MAX_CONTENT_LENGTH") is None:
+        app.config["MAX_CONTENT_LENGTH"] = max_bytes
+    app.wsgi_app = RequestBodyLimit(app.wsgi_app, app)
+    return app
+
+
 def validate_args_schema(schema_class):
     """
     Decorador para validar argumentos de URL e passar validated_args como argumento nomeado para a view.
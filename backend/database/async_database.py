@@ -0,0 +1,127 @@
+"""
+Camada assíncrona de acesso ao PostgreSQL (asyncpg) para componentes asyncio.
+
+Usada pelo serviço de notificações (FastAPI/WebSocket) para consultar o banco
+sem bloquear o event loop. Compartilha o registro de consultas nomeadas
+(``QUERIES``) e suas métricas com a camada síncrona; o asyncpg prepara e
+reaproveita os statements por conexão através do seu cache interno.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import asyncio
+import logging
+import time
+
+import asyncpg
+
+from config import settings
+from backend.database.queries import QUERIES, to_positional
+
+logger = logging.getLogger(__name__)
+
+# Statements preparados mantidos em cache por conexão do pool assíncrono
+STATEMENT_CACHE_SIZE = 256
+
+
+class AsyncPostgresDatabaseManager:
+    """
+    Gerenciador assíncrono com pool asyncpg criado sob demanda.
+
+    As consultas aceitam o mesmo SQL com ``%s`` da camada síncrona.
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        min_size: int = 1,
+        max_size: Optional[int] = None,
+    ):
+        self.dsn = dsn or settings.DATABASE_URL
+        self.min_size = min_size
+        self.max_size = max_size or settings.MAX_CONNECTIONS
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self):
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        self.dsn,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        statement_cache_size=STATEMENT_CACHE_SIZE,
+                        timeout=settings.CONNECTION_TIMEOUT,
+                    )
+                    logger.info(f"Pool asyncpg criado (max={self.max_size} conexões)")
+        return self._pool
+
+    async def close(self):
+        """Fecha o pool assíncrono."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    # ============= CONSULTAS =============
+
+    async def fetch(
+        self, query: str, params: Optional[Sequence] = None
+    ) -> List[Dict[str, Any]]:
+        """Executa uma consulta e retorna todas as linhas."""
+        pool = await self._get_pool()
+        rows = await pool.fetch(to_positional(query), *(params or ()))
+        return [dict(row) for row in rows]
+
+    async def fetch_one(
+        self, query: str, params: Optional[Sequence] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Executa uma consulta e retorna a primeira linha (ou None)."""
+        pool = await self._get_pool()
+        row = await pool.fetchrow(to_positional(query), *(params or ()))
+        return dict(row) if row else None
+
+    async def execute(self, query: str, params: Optional[Sequence] = None) -> str:
+        """Executa um comando e retorna o status do servidor (ex.: ``UPDATE 1``)."""
+        pool = await self._get_pool()
+        return await pool.execute(to_positional(query), *(params or ()))
+
+    # ============= CONSULTAS NOMEADAS =============
+
+    async def _run_named(self, name: str, params: Optional[Sequence], mode: str):
+        query = QUERIES.get(name)
+        pool = await self._get_pool()
+        start = time.perf_counter()
+        success = False
+        try:
+            if mode == "all":
+                rows = await pool.fetch(query.positional_sql, *(params or ()))
+                result = [dict(row) for row in rows]
+            elif mode == "one":
+                row = await pool.fetchrow(query.positional_sql, *(params or ()))
+                result = dict(row) if row else None
+            else:
+                result = await pool.execute(query.positional_sql, *(params or ()))
+            success = True
+            return result
+        finally:
+            QUERIES.record(name, (time.perf_counter() - start) * 1000, success)
+
+    async def fetch_named(
+        self, name: str, params: Optional[Sequence] = None
+    ) -> List[Dict[str, Any]]:
+        """Executa uma consulta nomeada e retorna todas as linhas."""
+        return await self._run_named(name, params, "all")
+
+    async def fetch_one_named(
+        self, name: str, params: Optional[Sequence] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Executa uma consulta nomeada e retorna a primeira linha (ou None)."""
+        return await self._run_named(name, params, "one")
+
+    async def execute_named(self, name: str, params: Optional[Sequence] = None) -> str:
+        """Executa um comando nomeado."""
+        return await self._run_named(name, params, "none")
+
+
+# Instância compartilhada pelos componentes assíncronos do processo
+async_db = AsyncPostgresDatabaseManager()
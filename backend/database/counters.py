@@ -0,0 +1,87 @@
+"""
+Contadores agregados para os dashboards.
+
+Os totais de ``users``, ``events`` e ``surebets`` são mantidos por triggers na
+tabela ``table_counters`` (ver ``schema_postgres.sql``) e lidos com uma única
+consulta por chave primária. Um cache em processo com TTL curto evita até essa
+consulta em dashboards acessados com frequência.
+"""
+
+from typing import Callable, Dict, Optional
+import logging
+import threading
+import time
+
+import psycopg2.errors
+
+from config.config_loader import CONFIG
+
+logger = logging.getLogger(__name__)
+
+COUNTED_TABLES = ("users", "events", "surebets")
+COUNTERS_TTL_SECONDS = float(CONFIG["postgres"].get("counters_ttl_seconds", 5))
+
+
+class CounterCache:
+    """Cache com TTL dos contadores agregados, compartilhado pelo processo."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = COUNTERS_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._counts: Optional[Dict[str, int]] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_counts(self, db) -> Dict[str, int]:
+        """Retorna os contadores, consultando o banco apenas quando o cache expira."""
+        now = self._clock()
+        counts = self._counts
+        if counts is not None and now < self._expires_at:
+            return counts
+        with self._lock:
+            if self._counts is not None and self._clock() < self._expires_at:
+                return self._counts
+            counts = self._load(db)
+            self._counts = counts
+            self._expires_at = self._clock() + self.ttl_seconds
+            return counts
+
+    def get(self, db, table: str) -> int:
+        """Retorna o contador de uma tabela."""
+        return self.get_counts(db).get(table, 0)
+
+    def invalidate(self):
+        """Descarta o cache (chamar após escritas feitas por este processo)."""
+        with self._lock:
+            self._counts = None
+            self._expires_at = 0.0
+
+    @staticmethod
+    def _load(db) -> Dict[str, int]:
+        try:
+            rows = db.fetch(
+                "SELECT table_name, row_count FROM table_counters "
+                "WHERE table_name = ANY(%s)",
+                (list(COUNTED_TABLES),),
+            )
+            counts = {row["table_name"]: int(row["row_count"]) for row in rows or []}
+            if all(table in counts for table in COUNTED_TABLES):
+                return counts
+        except psycopg2.errors.UndefinedTable:
+            logger.warning(
+                "Tabela table_counters ausente; aplique o schema atualizado."
+            )
+        # Fallback: schema antigo sem triggers de contagem
+        counts = {}
+        for table in COUNTED_TABLES:
+            row = db.fetch_one(f"SELECT COUNT(*) AS count FROM {table}")
+            counts[table] = int(row["count"]) if row else 0
+        return counts
+
+
+# Instância compartilhada pelos endpoints do processo
+counters = CounterCache()
@@ -0,0 +1,616 @@
+"""
+Camada de acesso ao banco de dados PostgreSQL do Surebets System.
+
+Centraliza o pool de conexões (psycopg2) e as operações usadas pela API
+administrativa, pelos testes e pelos scripts utilitários.
+
+Quando ``postgres.replicas`` está configurado, as leituras são distribuídas
+entre as réplicas (round-robin) e escritas, transações e leituras logo após
+uma escrita ficam no primário. Réplicas atrasadas além de
+``replica_max_lag_seconds`` ou inacessíveis são ignoradas temporariamente,
+com fallback para o primário.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+import itertools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extras
+import psycopg2.pool
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from config import settings
+from backend.database.queries import QUERIES, PreparedConnection
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FILE = Path(__file__).parent / "schema_postgres.sql"
+
+# Tamanho padrão do lote lido de cursores server-side em exportações
+STREAM_BATCH_SIZE = 1000
+
+# Pools compartilhados por processo, um por DSN (criados sob demanda)
+_pools: Dict[str, psycopg2.pool.ThreadedConnectionPool] = {}
+_pool_lock = threading.Lock()
+_cursor_counter = itertools.count(1)
+
+# Comandos que precisam do primário mesmo quando chegam por fetch/fetch_one
+_WRITE_SQL = re.compile(
+    r"^\s*(INSERT|UPDATE|DELETE|MERGE|CREATE|ALTER|DROP|TRUNCATE|LOCK|CALL|DO)\b"
+    r"|\bFOR\s+(UPDATE|SHARE|NO\s+KEY\s+UPDATE)\b",
+    re.IGNORECASE,
+)
+
+# Atraso de replicação em segundos (0 quando a réplica já aplicou todo o WAL recebido)
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag
+"""
+
+# Sessões com leitura-após-escrita acompanhadas antes de descartar as vencidas
+READ_AFTER_WRITE_MAX_SESSIONS = 10000
+
+
+def _get_pool(dsn: Optional[str] = None) -> psycopg2.pool.ThreadedConnectionPool:
+    """Retorna o pool de conexões do DSN, criando-o na primeira chamada."""
+    dsn = dsn or settings.DATABASE_URL
+    pool = _pools.get(dsn)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(dsn)
+            if pool is None:
+                pool = psycopg2.pool.ThreadedConnectionPool(
+                    1,
+                    settings.MAX_CONNECTIONS,
+                    dsn,
+                    connect_timeout=int(settings.CONNECTION_TIMEOUT),
+                    connection_factory=PreparedConnection,
+                )
+                _pools[dsn] = pool
+                logger.info(
+                    f"Pool PostgreSQL criado (max={settings.MAX_CONNECTIONS} conexões)"
+                )
+    return pool
+
+
+def is_write_query(query: str) -> bool:
+    """Indica se o SQL altera dados ou bloqueia linhas (deve ir ao primário)."""
+    return bool(_WRITE_SQL.search(query))
+
+
+class ReplicaRouter:
+    """
+    Escolhe a réplica de leitura, evitando réplicas atrasadas ou indisponíveis.
+
+    O atraso de cada réplica é medido no máximo uma vez a cada
+    ``lag_check_seconds``; réplicas que falham ficam em quarentena por
+    ``retry_seconds``.
+
+    Cada ``PostgresDatabaseManager`` lê do primário depois da própria escrita.
+    Com ``session_key`` definido (ex.: usuário da requisição), as leituras da
+    mesma sessão também vão ao primário por ``read_after_write_seconds``; as
+    das demais sessões continuam nas réplicas.
+    """
+
+    def __init__(
+        self,
+        dsns: Sequence[str],
+        max_lag_seconds: float = settings.REPLICA_MAX_LAG_SECONDS,
+        lag_check_seconds: float = settings.REPLICA_LAG_CHECK_SECONDS,
+        retry_seconds: float = settings.REPLICA_RETRY_SECONDS,
+        read_after_write_seconds: float = settings.READ_AFTER_WRITE_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.dsns = list(dsns)
+        self.max_lag_seconds = max_lag_seconds
+        self.lag_check_seconds = lag_check_seconds
+        self.retry_seconds = retry_seconds
+        self.read_after_write_seconds = read_after_write_seconds
+        self._clock = clock
+        self._lag: Dict[str, Optional[float]] = {dsn: None for dsn in self.dsns}
+        self._checked_at: Dict[str, float] = {}
+        self._down_until: Dict[str, float] = {}
+        # Função que identifica a sessão atual (None = sem fixação entre instâncias)
+        self.session_key: Optional[Callable[[], Optional[str]]] = None
+        self._primary_until: Dict[str, float] = {}
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.dsns)
+
+    def candidates(self, session: Optional[str] = None) -> List[str]:
+        """Réplicas elegíveis em ordem round-robin (vazio = usar o primário)."""
+        now = self._clock()
+        if not self.dsns or now < self._primary_until.get(session, 0.0):
+            return []
+        start = next(self._next) % len(self.dsns)
+        ordered = self.dsns[start:] + self.dsns[:start]
+        return [dsn for dsn in ordered if now >= self._down_until.get(dsn, 0.0)]
+
+    def needs_check(self, dsn: str) -> bool:
+        checked_at = self._checked_at.get(dsn)
+        return (
+            checked_at is None or self._clock() - checked_at >= self.lag_check_seconds
+        )
+
+    def record_lag(self, dsn: str, lag: float):
+        with self._lock:
+            self._lag[dsn] = lag
+            self._checked_at[dsn] = self._clock()
+        if lag > self.max_lag_seconds:
+            logger.warning(
+                f"Réplica {_safe_dsn(dsn)} atrasada ({lag:.1f}s); usando primário"
+            )
+
+    def is_usable(self, dsn: str) -> bool:
+        lag = self._lag.get(dsn)
+        return lag is not None and lag <= self.max_lag_seconds
+
+    def mark_down(self, dsn: str, error: Exception):
+        with self._lock:
+            self._down_until[dsn] = self._clock() + self.retry_seconds
+            self._checked_at.pop(dsn, None)
+        logger.warning(f"Réplica {_safe_dsn(dsn)} indisponível: {error}")
+
+    def current_session(self) -> Optional[str]:
+        return self.session_key() if self.session_key is not None else None
+
+    def note_write(self, session: Optional[str] = None):
+        """Fixa as leituras da sessão no primário (leitura-após-escrita)."""
+        if session is None:
+            return
+        now = self._clock()
+        with self._lock:
+            if len(self._primary_until) >= READ_AFTER_WRITE_MAX_SESSIONS:
+                self._primary_until = {
+                    key: until
+                    for key, until in self._primary_until.items()
+                    if until > now
+                }
+            self._primary_until[session] = now + self.read_after_write_seconds
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado das réplicas para monitoramento."""
+        now = self._clock()
+        return {
+            "max_lag_seconds": self.max_lag_seconds,
+            "replicas": [
+                {
+                    "dsn": _safe_dsn(dsn),
+                    "lag_seconds": self._lag.get(dsn),
+                    "available": now >= self._down_until.get(dsn, 0.0)
+                    and self.is_usable(dsn),
+                }
+                for dsn in self.dsns
+            ],
+        }
+
+
+def _safe_dsn(dsn: str) -> str:
+    """Remove credenciais do DSN para logs e métricas."""
+    return re.sub(r"//[^@/]*@", "//", dsn)
+
+
+# Roteador do processo, configurado em ``postgres.replicas``
+REPLICA_ROUTER = ReplicaRouter(settings.DATABASE_REPLICA_URLS)
+
+
+class PostgresDatabaseManager:
+    """
+    Gerenciador de banco de dados PostgreSQL.
+
+    Cada instância pega emprestada uma conexão do pool do processo e a
+    devolve em ``close()``. Linhas são retornadas como dicionários.
+
+    Leituras usam uma réplica quando disponível; depois da primeira escrita
+    (ou dentro de ``transaction()``) a instância passa a ler do primário.
+    ``primary=True`` força todas as consultas no primário.
+    """
+
+    def __init__(
+        self,
+        dsn: Optional[str] = None,
+        router: Optional[ReplicaRouter] = None,
+        primary: bool = False,
+    ):
+        self._pool = _get_pool(dsn)
+        self._conn = None
+        self._in_transaction = False
+        # DSN explícito sem roteador indica conexão direta (scripts, testes)
+        self._router = (
+            router if router is not None else (None if dsn else REPLICA_ROUTER)
+        )
+        self._use_primary = primary
+        self._replica_dsn = None
+        self._replica_pool = None
+        self._replica_conn = None
+
+    # ============= CONEXÃO =============
+
+    def _get_connection(self):
+        """Retorna a conexão associada a este gerenciador."""
+        if self._conn is None or self._conn.closed:
+            self._conn = self._pool.getconn()
+        return self._conn
+
+    def _get_read_connection(self):
+        """Retorna uma conexão de réplica para leitura, ou a do primário."""
+        if (
+            self._use_primary
+            or self._in_transaction
+            or self._router is None
+            or not self._router.enabled
+        ):
+            return self._get_connection()
+        if self._replica_conn is not None and not self._replica_conn.closed:
+            return self._replica_conn
+        for dsn in self._router.candidates(self._router.current_session()):
+            pool = conn = None
+            try:
+                pool = _get_pool(dsn)
+                conn = pool.getconn()
+                if self._router.needs_check(dsn):
+                    self._router.record_lag(dsn, _replica_lag(conn))
+                if not self._router.is_usable(dsn):
+                    pool.putconn(conn)
+                    continue
+                self._replica_dsn, self._replica_pool, self._replica_conn = (
+                    dsn,
+                    pool,
+                    conn,
+                )
+                return conn
+            except psycopg2.Error as e:
+                self._router.mark_down(dsn, e)
+                if conn is not None:
+                    pool.putconn(conn, close=True)
+        return self._get_connection()
+
+    def _release_replica(self, discard: bool = False):
+        if self._replica_conn is None:
+            return
+        try:
+            if not discard and not self._replica_conn.closed:
+                self._replica_conn.rollback()
+            self._replica_pool.putconn(
+                self._replica_conn, close=discard or bool(self._replica_conn.closed)
+            )
+        except Exception as e:
+            logger.warning(f"Erro ao devolver conexão de réplica ao pool: {e}")
+        finally:
+            self._replica_dsn = self._replica_pool = self._replica_conn = None
+
+    def _wrote(self):
+        """Fixa as leituras seguintes no primário (leitura-após-escrita)."""
+        self._use_primary = True
+        if self._router is not None:
+            self._router.note_write(self._router.current_session())
+        self._release_replica()
+
+    def close(self):
+        """Devolve as conexões ao pool."""
+        self._release_replica()
+        if self._conn is not None:
+            try:
+                if not self._conn.closed:
+                    self._conn.rollback()
+                self._pool.putconn(self._conn, close=bool(self._conn.closed))
+            except Exception as e:
+                logger.warning(f"Erro ao devolver conexão ao pool: {e}")
+            finally:
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _finish(self, conn, success: bool):
+        """Confirma ou desfaz a operação quando fora de uma transação explícita."""
+        if self._in_transaction:
+            return
+        if success:
+            conn.commit()
+        elif not conn.closed:
+            # Conexão perdida: o rollback levantaria InterfaceError no lugar do erro
+            conn.rollback()
+
+    @contextmanager
+    def transaction(self):
+        """Agrupa várias operações em uma única transação."""
+        conn = self._get_connection()
+        self._in_transaction = True
+        try:
+            yield self
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._in_transaction = False
+            self._wrote()
+
+    # ============= CONSULTAS =============
+
+    def _read(self, query: str, run):
+        """
+        Executa ``run(conn)`` numa conexão de leitura.
+
+        Se a réplica cair durante a consulta, ela entra em quarentena e a
+        leitura é repetida no primário.
+        """
+        if is_write_query(query):
+            result = run(self._get_connection())
+            self._wrote()
+            return result
+        conn = self._get_read_connection()
+        try:
+            return run(conn)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            if conn is not self._replica_conn:
+                raise
+            self._router.mark_down(self._replica_dsn, e)
+            self._release_replica(discard=True)
+            return run(self._get_connection())
+
+    def _fetch_rows(self, conn, query: str, params: Optional[Sequence], one: bool):
+        try:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                cursor.execute(query, params)
+                if one:
+                    row = cursor.fetchone()
+                    result = dict(row) if row else None
+                else:
+                    result = [dict(row) for row in cursor.fetchall()]
+            self._finish(conn, True)
+            return result
+        except Exception:
+            self._finish(conn, False)
+            raise
+
+    def fetch(
+        self, query: str, params: Optional[Sequence] = None
+    ) -> List[Dict[str, Any]]:
+        """Executa uma consulta e retorna todas as linhas."""
+        return self._read(
+            query, lambda conn: self._fetch_rows(conn, query, params, False)
+        )
+
+    def fetch_one(
+        self, query: str, params: Optional[Sequence] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Executa uma consulta e retorna a primeira linha (ou None)."""
+        return self._read(
+            query, lambda conn: self._fetch_rows(conn, query, params, True)
+        )
+
+    def stream(
+        self,
+        query: str,
+        params: Optional[Sequence] = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre o resultado usando um cursor server-side (nomeado).
+
+        Apenas ``batch_size`` linhas ficam em memória por vez, permitindo
+        exportar tabelas grandes sem carregar o resultado inteiro.
+        """
+        conn = self._get_read_connection()
+        name = f"surebets_stream_{os.getpid()}_{next(_cursor_counter)}"
+        success = False
+        try:
+            with conn.cursor(
+                name=name, cursor_factory=psycopg2.extras.RealDictCursor
+            ) as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(query, params)
+                for row in cursor:
+                    yield dict(row)
+            success = True
+        finally:
+            # Cursores nomeados vivem dentro de uma transação:
+            # encerrá-la libera o portal
+            self._finish(conn, success)
+
+    def execute(self, query: str, params: Optional[Sequence] = None) -> int:
+        """Executa um comando e retorna o número de linhas afetadas."""
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                rowcount = cursor.rowcount
+            self._finish(conn, True)
+            self._wrote()
+            return rowcount
+        except Exception:
+            self._finish(conn, False)
+            raise
+
+    def execute_many(self, query: str, params_list: Sequence[Sequence]) -> int:
+        """Executa o mesmo comando para vários conjuntos de parâmetros."""
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cursor:
+                psycopg2.extras.execute_batch(cursor, query, params_list)
+            self._finish(conn, True)
+            self._wrote()
+            return len(params_list)
+        except Exception:
+            self._finish(conn, False)
+            raise
+
+    def insert(self, table: str, data: Dict[str, Any]) -> Optional[int]:
+        """Insere uma linha e retorna o id gerado."""
+        columns = ", ".join(data.keys())
+        placeholders = ", ".join(["%s"] * len(data))
+        row = self.fetch_one(
+            f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) RETURNING id",
+            tuple(data.values()),
+        )
+        return row["id"] if row else None
+
+    def update(
+        self,
+        table: str,
+        data: Dict[str, Any],
+        where: str,
+        params: Optional[Sequence] = None,
+    ) -> int:
+        """Atualiza linhas que satisfazem ``where`` e retorna a quantidade."""
+        assignments = ", ".join(f"{column} = %s" for column in data.keys())
+        return self.execute(
+            f"UPDATE {table} SET {assignments} WHERE {where}",
+            tuple(data.values()) + tuple(params or ()),
+        )
+
+    def delete(self, table: str, where: str, params: Optional[Sequence] = None) -> int:
+        """Remove linhas que satisfazem ``where`` e retorna a quantidade."""
+        return self.execute(f"DELETE FROM {table} WHERE {where}", params)
+
+    # ============= CONSULTAS NOMEADAS =============
+
+    def _run_named(self, name: str, params: Optional[Sequence], mode: str):
+        """Executa uma consulta do registro ``QUERIES`` registrando métricas."""
+        query = QUERIES.get(name)
+        start = time.perf_counter()
+        success = False
+        try:
+            if mode == "none" or is_write_query(query.sql):
+                result = self._run_named_on(self._get_connection(), query, params, mode)
+                self._wrote()
+            else:
+                result = self._read(
+                    query.sql,
+                    lambda conn: self._run_named_on(conn, query, params, mode),
+                )
+            success = True
+            return result
+        finally:
+            QUERIES.record(name, (time.perf_counter() - start) * 1000, success)
+
+    def _run_named_on(self, conn, query, params: Optional[Sequence], mode: str):
+        try:
+            for attempt in (1, 2):
+                try:
+                    with conn.cursor(
+                        cursor_factory=psycopg2.extras.RealDictCursor
+                    ) as cursor:
+                        QUERIES.execute(cursor, query, params)
+                        if mode == "all":
+                            result = [dict(row) for row in cursor.fetchall()]
+                        elif mode == "one":
+                            row = cursor.fetchone()
+                            result = dict(row) if row else None
+                        else:
+                            result = cursor.rowcount
+                    break
+                except psycopg2.errors.InvalidSqlStatementName:
+                    # Sessão perdeu o PREPARE (ex.: DISCARD ALL);
+                    # prepara de novo uma vez
+                    QUERIES.forget(conn)
+                    if attempt == 2 or self._in_transaction:
+                        raise
+                    conn.rollback()
+            self._finish(conn, True)
+            return result
+        except Exception:
+            self._finish(conn, False)
+            raise
+
+    def fetch_named(
+        self, name: str, params: Optional[Sequence] = None
+    ) -> List[Dict[str, Any]]:
+        """Executa uma consulta nomeada e retorna todas as linhas."""
+        return self._run_named(name, params, "all")
+
+    def fetch_one_named(
+        self, name: str, params: Optional[Sequence] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Executa uma consulta nomeada e retorna a primeira linha (ou None)."""
+        return self._run_named(name, params, "one")
+
+    def execute_named(self, name: str, params: Optional[Sequence] = None) -> int:
+        """Executa um comando nomeado e retorna o número de linhas afetadas."""
+        return self._run_named(name, params, "none")
+
+    # ============= INICIALIZAÇÃO =============
+
+    def _initialize_database(self):
+        """Aplica as migrações pendentes (ver ``backend.database.migrations``)."""
+        from backend.database.migrations import MigrationRunner
+
+        MigrationRunner(self._get_connection()).migrate()
+
+
+def _replica_lag(conn) -> float:
+    """Mede o atraso de replicação (segundos) numa conexão de réplica."""
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            row = cursor.fetchone()
+        return float(row[0] or 0)
+    finally:
+        conn.rollback()
+
+
+def get_db() -> Optional[PostgresDatabaseManager]:
+    """Retorna um gerenciador conectado ou None se o banco estiver indisponível."""
+    try:
+        db = PostgresDatabaseManager()
+        db._get_connection()
+        return db
+    except Exception as e:
+        logger.warning(f"Banco de dados indisponível: {e}")
+        return None
+
+
+def ping_database(dsn: Optional[str] = None) -> Dict[str, Any]:
+    """Executa ``SELECT 1`` no primário (verificação de readiness)."""
+    started = time.perf_counter()
+    with PostgresDatabaseManager(dsn=dsn, primary=True) as db:
+        db.fetch_one("SELECT 1 AS ok")
+    return {"latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+
+def close_pools():
+    """
+    Fecha os pools de conexões do processo.
+
+    Chamado pelo processo mestre antes de criar workers (``preload``): as
+    conexões abertas durante o carregamento da aplicação não podem ser
+    compartilhadas entre processos, e cada worker cria seus pools sob demanda.
+    """
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        try:
+            pool.closeall()
+        except Exception as e:
+            logger.warning(f"Erro ao fechar pool PostgreSQL: {e}")
+
+
+# Alias para compatibilidade com código legado
+DatabaseManager = PostgresDatabaseManager
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    with PostgresDatabaseManager() as db:
+        db._initialize_database()
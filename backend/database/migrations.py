@@ -0,0 +1,217 @@
+"""
+Migrações versionadas do banco PostgreSQL.
+
+As migrações são arquivos SQL aplicados em ordem de versão e registrados na
+tabela ``schema_migrations``:
+
+- ``1 schema``: o ``schema_postgres.sql`` completo. É *repetível*: o arquivo
+  é idempotente (``IF NOT EXISTS``, ``CREATE OR REPLACE``, blocos ``DO``) e
+  volta a ser aplicado sempre que seu conteúdo muda;
+- ``2 dados_iniciais``: ``populate.sql``, aplicado uma única vez;
+- ``backend/database/versions/NNNN_descricao.sql``: migrações seguintes,
+  aplicadas uma única vez (versões a partir de 3).
+
+Cada migração é enviada inteira num único comando (uma ida ao servidor),
+junto com o registro em ``schema_migrations``. O PostgreSQL executa uma
+mensagem com vários comandos como uma transação implícita: ou tudo é
+aplicado, ou nada. Comandos que não rodam em transação (``CREATE INDEX
+CONCURRENTLY``, ``VACUUM``) não podem ser usados em migrações.
+
+Processos que iniciam ao mesmo tempo (workers, réplicas do container)
+serializam a aplicação com um advisory lock de sessão: o primeiro aplica as
+pendentes e os demais, ao obter o lock, encontram tudo aplicado.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import hashlib
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+DATABASE_DIR = Path(__file__).parent
+MIGRATIONS_DIR = DATABASE_DIR / "versions"
+SCHEMA_FILE = DATABASE_DIR / "schema_postgres.sql"
+POPULATE_FILE = DATABASE_DIR / "populate.sql"
+
+# Chave do advisory lock (pg_advisory_lock) das migrações
+MIGRATION_LOCK_KEY = 7_302_114_571
+
+_MIGRATION_FILE = re.compile(r"^(?P<version>\d+)_(?P<name>[\w-]+)\.sql$")
+
+MIGRATIONS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+RECORD_MIGRATION_SQL = """
+INSERT INTO schema_migrations (version, name, checksum, applied_at)
+VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+ON CONFLICT (version) DO UPDATE
+SET name = EXCLUDED.name, checksum = EXCLUDED.checksum, applied_at = EXCLUDED.applied_at
+"""
+
+
+class MigrationError(Exception):
+    """Falha ao aplicar uma migração (nada dela foi aplicado)."""
+
+
+class Migration:
+    """Um arquivo SQL versionado."""
+
+    def __init__(self, version: int, name: str, path: Path, repeatable: bool = False):
+        self.version = version
+        self.name = name
+        self.path = Path(path)
+        self.repeatable = repeatable
+        self._sql: Optional[str] = None
+
+    @property
+    def sql(self) -> str:
+        if self._sql is None:
+            self._sql = self.path.read_text(encoding="utf-8").strip()
+        return self._sql
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+    def __repr__(self):
+        return f"<Migration {self.version:04d} {self.name}>"
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Migrações base seguidas dos arquivos ``NNNN_nome.sql`` de ``directory``."""
+    migrations = [
+        Migration(1, "schema", SCHEMA_FILE, repeatable=True),
+        Migration(2, "dados_iniciais", POPULATE_FILE),
+    ]
+    seen = {migration.version for migration in migrations}
+    if directory.is_dir():
+        for path in sorted(directory.glob("*.sql")):
+            match = _MIGRATION_FILE.match(path.name)
+            if not match:
+                raise MigrationError(f"Nome de migração inválido: {path.name}")
+            version = int(match.group("version"))
+            if version in seen:
+                raise MigrationError(f"Versão de migração duplicada: {version}")
+            seen.add(version)
+            migrations.append(Migration(version, match.group("name"), path))
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+class MigrationRunner:
+    """
+    Aplica as migrações pendentes numa conexão psycopg2.
+
+    A conexão é usada em modo autocommit enquanto o runner trabalha (cada
+    migração já é atômica por ser um único comando) e restaurada no fim.
+    """
+
+    def __init__(
+        self,
+        connection,
+        migrations: Optional[Sequence[Migration]] = None,
+        lock_key: int = MIGRATION_LOCK_KEY,
+    ):
+        self.connection = connection
+        self.migrations = (
+            list(migrations) if migrations is not None else discover_migrations()
+        )
+        self.lock_key = lock_key
+
+    def _execute(self, sql: str, params: Optional[Sequence] = None):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall() if cursor.description else None
+
+    def applied(self) -> Dict[int, str]:
+        """``versão -> checksum`` das migrações registradas."""
+        rows = self._execute("SELECT version, checksum FROM schema_migrations")
+        return {version: checksum for version, checksum in rows}
+
+    def pending(self, applied: Dict[int, str]) -> List[Migration]:
+        pending = []
+        for migration in self.migrations:
+            checksum = applied.get(migration.version)
+            if checksum is None:
+                pending.append(migration)
+            elif checksum != migration.checksum:
+                if migration.repeatable:
+                    pending.append(migration)
+                else:
+                    logger.warning(
+                        f"Migração {migration.version:04d} ({migration.name}) "
+                        "foi alterada depois de aplicada; "
+                        "crie uma nova migração em vez de editá-la"
+                    )
+        return pending
+
+    def _apply(self, migration: Migration):
+        """Migração e registro num único comando (transação implícita)."""
+        with self.connection.cursor() as cursor:
+            record = cursor.mogrify(
+                RECORD_MIGRATION_SQL,
+                (migration.version, migration.name, migration.checksum),
+            )
+            if isinstance(record, bytes):
+                record = record.decode("utf-8")
+            # ";" em linha própria: o arquivo pode terminar com um comentário
+            batch = f"{migration.sql}\n;\n{record.strip()};"
+            started = time.perf_counter()
+            try:
+                cursor.execute(batch)
+            except Exception as e:
+                raise MigrationError(
+                    f"Falha na migração {migration.version:04d} ({migration.name}): {e}"
+                ) from e
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Migração {migration.version:04d} ({migration.name}) "
+            f"aplicada em {elapsed_ms:.0f}ms"
+        )
+
+    def migrate(self) -> List[Migration]:
+        """Aplica as pendentes sob o advisory lock; retorna as aplicadas."""
+        conn = self.connection
+        previous_autocommit = conn.autocommit
+        conn.rollback()
+        conn.autocommit = True
+        try:
+            self._execute("SELECT pg_advisory_lock(%s)", (self.lock_key,))
+            try:
+                self._execute(MIGRATIONS_TABLE_SQL)
+                pending = self.pending(self.applied())
+                for migration in pending:
+                    self._apply(migration)
+                if not pending:
+                    logger.info("Banco de dados atualizado; nenhuma migração pendente")
+                return pending
+            finally:
+                self._execute("SELECT pg_advisory_unlock(%s)", (self.lock_key,))
+        finally:
+            conn.autocommit = previous_autocommit
+
+    def status(self) -> Dict[str, Any]:
+        """Versões aplicadas e pendentes (sem aplicar nada)."""
+        self._execute(MIGRATIONS_TABLE_SQL)
+        applied = self.applied()
+        self.connection.commit()
+        return {
+            "applied": sorted(applied),
+            "pending": [migration.version for migration in self.pending(applied)],
+        }
+
+
+def migrate(dsn: Optional[str] = None) -> List[Migration]:
+    """Aplica as migrações pendentes no primário (seguro em processos concorrentes)."""
+    from backend.database.database import PostgresDatabaseManager
+
+    with PostgresDatabaseManager(dsn=dsn, primary=True) as db:
+        return MigrationRunner(db._get_connection()).migrate()
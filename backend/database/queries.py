@@ -0,0 +1,210 @@
+"""
+Registro de consultas nomeadas do Surebets System.
+
+As consultas quentes (login, perfil, listagens) são declaradas uma única vez
+aqui e preparadas no servidor (``PREPARE``) na primeira execução em cada
+conexão do pool, evitando parse/plan a cada requisição. O registro também
+mantém contagem de execuções e histograma de latência por consulta.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import bisect
+import logging
+import re
+import threading
+
+import psycopg2.extensions
+
+from config.config_loader import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Desative para poolers em modo transação (ex.: PgBouncer), que não preservam PREPARE
+PREPARED_STATEMENTS_ENABLED = bool(CONFIG["postgres"].get("prepared_statements", True))
+
+# Limites superiores (ms) dos buckets do histograma de latência
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_PLACEHOLDER = re.compile(r"%s")
+
+
+def to_positional(sql: str) -> str:
+    """Converte placeholders ``%s`` (psycopg2) em ``$1..$n`` (PostgreSQL/asyncpg)."""
+    counter = iter(range(1, sql.count("%s") + 1))
+    return _PLACEHOLDER.sub(lambda _: f"${next(counter)}", sql)
+
+
+class PreparedConnection(psycopg2.extensions.connection):
+    """Conexão que lembra quais consultas nomeadas já foram preparadas nela."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+
+
+class NamedQuery:
+    """Consulta SQL registrada com nome estável e forma preparada."""
+
+    def __init__(self, name: str, sql: str):
+        self.name = name
+        self.sql = sql.strip()
+        self.param_count = len(_PLACEHOLDER.findall(self.sql))
+        # Forma com $1..$n: usada no PREPARE e diretamente por drivers assíncronos
+        self.positional_sql = to_positional(self.sql)
+        self.prepare_sql = f"PREPARE {name} AS {self.positional_sql}"
+        if self.param_count:
+            self.execute_sql = (
+                f"EXECUTE {name} ({', '.join(['%s'] * self.param_count)})"
+            )
+        else:
+            self.execute_sql = f"EXECUTE {name}"
+
+
+class QueryStats:
+    """Contadores e histograma de latência de uma consulta."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float, success: bool):
+        self.count += 1
+        if not success:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        histogram = {
+            f"le_{limit}ms": n for limit, n in zip(LATENCY_BUCKETS_MS, self.buckets)
+        }
+        histogram["inf"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "histogram": histogram,
+        }
+
+
+class QueryRegistry:
+    """Catálogo de consultas nomeadas com preparação por conexão e métricas."""
+
+    def __init__(self, prepared_statements: bool = PREPARED_STATEMENTS_ENABLED):
+        self.prepared_statements = prepared_statements
+        self._queries: Dict[str, NamedQuery] = {}
+        self._stats: Dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, sql: str) -> NamedQuery:
+        """Registra (ou substitui) uma consulta nomeada."""
+        query = NamedQuery(name, sql)
+        self._stats.setdefault(name, QueryStats())
+        self._queries[name] = query
+        return query
+
+    def ensure(self, name: str, sql: str) -> NamedQuery:
+        """Registra a consulta apenas se o nome ainda não existir."""
+        query = self._queries.get(name)
+        if query is None:
+            with self._lock:
+                query = self._queries.get(name) or self.register(name, sql)
+        return query
+
+    def get(self, name: str) -> NamedQuery:
+        try:
+            return self._queries[name]
+        except KeyError:
+            raise KeyError(f"Consulta nomeada não registrada: {name}") from None
+
+    def names(self) -> List[str]:
+        return sorted(self._queries)
+
+    def execute(self, cursor, query: NamedQuery, params: Optional[Sequence] = None):
+        """Executa a consulta no cursor, preparando-a na conexão se necessário."""
+        prepared = getattr(cursor.connection, "prepared_statements", None)
+        if not self.prepared_statements or prepared is None:
+            cursor.execute(query.sql, params)
+            return
+        if query.name not in prepared:
+            cursor.execute(query.prepare_sql)
+            prepared.add(query.name)
+            logger.debug(f"Consulta '{query.name}' preparada na conexão")
+        cursor.execute(query.execute_sql, params)
+
+    def forget(self, connection, name: Optional[str] = None):
+        """Esquece preparações de uma conexão (ex.: após DISCARD ALL no servidor)."""
+        prepared = getattr(connection, "prepared_statements", None)
+        if prepared is None:
+            return
+        if name is None:
+            prepared.clear()
+        else:
+            prepared.discard(name)
+
+    def record(self, name: str, elapsed_ms: float, success: bool):
+        with self._lock:
+            self._stats.setdefault(name, QueryStats()).record(elapsed_ms, success)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas por consulta para monitoramento."""
+        with self._lock:
+            queries = {
+                name: stats.to_dict() for name, stats in sorted(self._stats.items())
+            }
+        return {
+            "prepared_statements": self.prepared_statements,
+            "latency_buckets_ms": list(LATENCY_BUCKETS_MS),
+            "queries": queries,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = QueryStats()
+
+
+QUERIES = QueryRegistry()
+
+# ============= CONSULTAS QUENTES =============
+
+QUERIES.register(
+    "user_login_lookup",
+    "SELECT id, username, password_hash, role FROM users WHERE username = %s",
+)
+QUERIES.register(
+    "user_update_last_login",
+    "UPDATE users SET last_login = %s WHERE username = %s",
+)
+QUERIES.register("user_id_by_username", "SELECT id FROM users WHERE username = %s")
+QUERIES.register("user_username_by_id", "SELECT username FROM users WHERE id = %s")
+QUERIES.register(
+    "user_profile",
+    "SELECT username, email, role, created_at, last_login "
+    "FROM users WHERE username = %s",
+)
+QUERIES.register(
+    "users_list",
+    """
+    SELECT id, username, email, role, created_at, last_login
+    FROM users
+    ORDER BY created_at DESC
+    """,
+)
+QUERIES.register(
+    "surebets_recent",
+    "SELECT * FROM surebets ORDER BY detected_at DESC LIMIT %s",
+)
+QUERIES.register(
+    "surebets_active_recent",
+    "SELECT * FROM surebets WHERE status = 'active' ORDER BY detected_at DESC LIMIT %s",
+)
+QUERIES.register(
+    "events_recent",
+    "SELECT * FROM events ORDER BY created_at DESC LIMIT %s",
+)
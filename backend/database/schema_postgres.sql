@@ -85,6 +85,21 @@ CREATE TABLE IF NOT EXISTS arbitrage_opportunities (
     detected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Índices
+-- Paginação keyset de /api/admin/surebets (ORDER BY detected_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_surebets_detected_at_id ON surebets (detected_at DESC, id DESC);
+-- Paginação keyset de /api/admin/bets (ORDER BY created_at DESC, id DESC); só
+-- existe em bancos cuja tabela bets tem created_at (schema da API administrativa)
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'bets' AND column_name = 'created_at'
+    ) THEN
+        CREATE INDEX IF NOT EXISTS idx_bets_created_at_id ON bets (created_at DESC, id DESC);
+    END IF;
+END$$;
+
 -- Views
 CREATE OR REPLACE VIEW v_user_stats AS
 SELECT u.id AS user_id, u.username, COUNT(b.id) AS total_bets
@@ -120,3 +135,54 @@ CREATE TRIGGER set_updated_at
 BEFORE UPDATE ON events
 FOR EACH ROW
 EXECUTE FUNCTION update_updated_at_column();
+
+-- Contadores agregados mantidos por trigger (evita COUNT(*) nos dashboards)
+CREATE TABLE IF NOT EXISTS table_counters (
+    table_name VARCHAR(64) PRIMARY KEY,
+    row_count BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION table_counters_after_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO table_counters (table_name, row_count)
+    SELECT TG_TABLE_NAME, COUNT(*) FROM new_rows
+    ON CONFLICT (table_name) DO UPDATE
+        SET row_count = table_counters.row_count + EXCLUDED.row_count;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION table_counters_after_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE table_counters
+    SET row_count = GREATEST(row_count - (SELECT COUNT(*) FROM old_rows), 0)
+    WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION table_counters_after_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE table_counters SET row_count = 0 WHERE table_name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    counted_table TEXT;
+BEGIN
+    FOREACH counted_table IN ARRAY ARRAY['users', 'events', 'surebets'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', counted_table || '_count_insert', counted_table);
+        EXECUTE format('CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION table_counters_after_insert()', counted_table || '_count_insert', counted_table);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', counted_table || '_count_delete', counted_table);
+        EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION table_counters_after_delete()', counted_table || '_count_delete', counted_table);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', counted_table || '_count_truncate', counted_table);
+        EXECUTE format('CREATE TRIGGER %I AFTER TRUNCATE ON %I FOR EACH STATEMENT EXECUTE FUNCTION table_counters_after_truncate()', counted_table || '_count_truncate', counted_table);
+        -- Sincroniza o contador com o estado atual da tabela
+        EXECUTE format('INSERT INTO table_counters (table_name, row_count) SELECT %L, COUNT(*) FROM %I ON CONFLICT (table_name) DO UPDATE SET row_count = EXCLUDED.row_count', counted_table, counted_table);
+    END LOOP;
+END$$;
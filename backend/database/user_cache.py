@@ -0,0 +1,199 @@
+"""
+Cache das linhas de usuário consultadas no login.
+
+Em rajadas de login o mesmo usuário tenta várias vezes (e clientes repetem
+requisições), então ``jwt_login`` consulta o banco no máximo uma vez por
+usuário a cada ``security.login_cache_ttl_seconds``. Usuários inexistentes
+não são lembrados: um usuário recém-criado pode entrar na hora.
+
+A linha inclui ``password_hash``, então uma troca de senha não pode deixar o
+hash antigo válido em outro worker. Escritas em ``users`` chamam
+``invalidate``, que descarta a linha no processo e publica o nome no canal
+``USER_CACHE_CHANNEL`` do Redis; cada worker assina o canal e descarta a
+mesma linha. O cache só responde enquanto a assinatura está ativa: com o
+Redis indisponível, toda consulta vai ao banco. Sem ``redis_url`` (testes,
+processo único) o cache é apenas local.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+import os
+import threading
+import time
+
+from config.config_loader import CONFIG
+
+logger = logging.getLogger(__name__)
+
+LOGIN_CACHE_MAX_ENTRIES = 10000
+
+# Canal de invalidação entre workers (mensagem: nome do usuário, ou "*" para todos)
+USER_CACHE_CHANNEL = "user_cache:invalidate"
+USER_CACHE_RESYNC_SECONDS = 5.0
+USER_CACHE_PING_SECONDS = 15.0
+_ALL_USERS = "*"
+
+
+class UserRowCache:
+    """Cache com TTL de ``username -> linha``, compartilhado pelo processo."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_entries: int = LOGIN_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+        redis_url: Optional[str] = None,
+        client=None,
+    ):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._rows: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        # Incrementada a cada descarte: linhas lidas antes dele não entram no cache
+        self._generation = 0
+        self._redis_url = redis_url
+        self.redis = client
+        self._shared = bool(redis_url or client is not None)
+        self._synced = False
+        self._listener: Optional[threading.Thread] = None
+        self._listener_pid: Optional[int] = None
+        self._stop = threading.Event()
+        if ttl_seconds is None:
+            CONFIG.subscribe(self._apply_config, "security")
+        else:
+            self.ttl_seconds = ttl_seconds
+
+    def _apply_config(self, config):
+        self.ttl_seconds = float(config["security"].get("login_cache_ttl_seconds", 30))
+
+    def get(self, username: str, loader: Callable[[str], Optional[Dict[str, Any]]]):
+        """Retorna a linha do usuário, chamando ``loader`` só quando o cache expira."""
+        usable = self._usable()
+        if usable:
+            entry = self._rows.get(username)
+            if entry is not None and self._clock() < entry[0]:
+                return entry[1]
+        generation = self._generation
+        row = loader(username)
+        if row is not None and usable:
+            with self._lock:
+                if generation != self._generation:
+                    return row
+                if len(self._rows) >= self.max_entries:
+                    self._evict()
+                self._rows[username] = (self._clock() + self.ttl_seconds, row)
+        return row
+
+    def _evict(self):
+        now = self._clock()
+        expired = [
+            name for name, (expires_at, _) in self._rows.items() if expires_at <= now
+        ]
+        for name in expired:
+            del self._rows[name]
+        if len(self._rows) >= self.max_entries:
+            self._rows.clear()
+
+    def invalidate(self, username: Optional[str] = None):
+        """Descarta um usuário (ou todos) em todos os workers após escritas em users."""
+        self._discard(username)
+        if not self._shared:
+            return
+        self._ensure_listener()
+        if self.redis is None:
+            return
+        try:
+            self.redis.publish(USER_CACHE_CHANNEL, username or _ALL_USERS)
+        except Exception as e:
+            logger.error(f"Erro ao publicar invalidação do cache de usuários: {e}")
+
+    def _discard(self, username: Optional[str] = None):
+        with self._lock:
+            self._generation += 1
+            if username is None or username == _ALL_USERS:
+                self._rows.clear()
+            else:
+                self._rows.pop(username, None)
+
+    # ============= SINCRONIZAÇÃO ENTRE WORKERS =============
+
+    def _usable(self) -> bool:
+        if not self._shared:
+            return True
+        self._ensure_listener()
+        return self._synced
+
+    def _ensure_listener(self):
+        """Conecta e inicia o assinante no primeiro uso de cada processo (pós-fork)."""
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            self._synced = False
+            self._rows.clear()
+            if self._redis_url:
+                # Importado só quando o cache é compartilhado de fato
+                import redis
+
+                try:
+                    self.redis = redis.from_url(self._redis_url)
+                    self.redis.ping()
+                except redis.exceptions.ConnectionError as e:
+                    logger.warning(
+                        f"Falha na conexão com Redis: {e}. Cache de login desativado."
+                    )
+                    self.redis = None
+            if self.redis is None:
+                return
+            self._stop.clear()
+            self._listener = threading.Thread(
+                target=self._listen, name="user-cache-sync", daemon=True
+            )
+            self._listener.start()
+
+    def stop_listener(self):
+        self._stop.set()
+        self._synced = False
+
+    def _listen(self):
+        while not self._stop.is_set():
+            pubsub = self.redis.pubsub()
+            try:
+                pubsub.subscribe(USER_CACHE_CHANNEL)
+                last_ping = time.monotonic()
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._handle_message(message)
+                    if time.monotonic() - last_ping >= USER_CACHE_PING_SECONDS:
+                        # Detecta conexões mortas que não geram erro na leitura
+                        pubsub.ping()
+                        last_ping = time.monotonic()
+            except Exception as e:
+                self._synced = False
+                logger.warning(f"Sincronização do cache de usuários interrompida: {e}")
+                self._stop.wait(USER_CACHE_RESYNC_SECONDS)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+        self._synced = False
+
+    def _handle_message(self, message):
+        if message["type"] == "subscribe":
+            # Invalidações publicadas enquanto desconectado foram perdidas
+            self._discard()
+            self._synced = True
+        elif message["type"] == "message":
+            data = message["data"]
+            self._discard(data.decode() if isinstance(data, bytes) else data)
+
+
+# Instância compartilhada pelos endpoints do processo
+login_users = UserRowCache(
+    redis_url=os.getenv("REDIS_URL") or CONFIG.get("redis", {}).get("url")
+)
@@ -2,6 +2,17 @@ from typing import List, Dict, Any
 import itertools
 from config.config_loader import CONFIG
 
+# Parâmetros recarregáveis a quente, atualizados por assinatura do CONFIG
+MIN_PROFIT_PERCENT = 0.0
+
+
+def _apply_arbitrage_config(config):
+    global MIN_PROFIT_PERCENT
+    MIN_PROFIT_PERCENT = float(config.services.arbitrage.min_profit_percent)
+
+
+CONFIG.subscribe(_apply_arbitrage_config, "services.arbitrage")
+
 
 class SurebetDetector:
     """
@@ -34,7 +45,7 @@ class SurebetDetector:
             ...
         ]
         """
-        MIN_PROFIT_PERCENT = CONFIG["services"]["arbitrage"]["min_profit_percent"]
+        min_profit_percent = MIN_PROFIT_PERCENT
         surebets = []
         for event in events:
             selections = event["selections"]
@@ -58,7 +69,7 @@ class SurebetDetector:
                 arb_index = SurebetDetector.calculate_arbitrage(odds)
                 if arb_index < 1:
                     profit_percent = (1 - arb_index) * 100
-                    if profit_percent >= MIN_PROFIT_PERCENT:
+                    if profit_percent >= min_profit_percent:
                         surebets.append(
                             {
                                 "event_id": event["event_id"],
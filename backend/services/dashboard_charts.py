@@ -0,0 +1,215 @@
+"""
+Agregados e figuras dos gráficos do dashboard.
+
+Os gráficos de análise (distribuição de lucros e oportunidades por casa)
+são derivados do snapshot compartilhado e dos filtros da sessão. As linhas
+já trazem o lucro numérico (``profit_value``) ao lado do texto exibido, então
+nada é reinterpretado a partir de ``"x.xx%"``. Para cada combinação de
+filtros mantemos as contagens por faixa de lucro e por casa, atualizadas
+apenas pelas linhas que entraram, saíram ou mudaram desde a versão anterior,
+e as figuras prontas ficam em cache por ``(versão, filtros)``: callbacks
+repetidos sem mudança de dados não constroem nenhuma figura.
+"""
+
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+import math
+import threading
+
+import plotly.graph_objs as go
+
+from backend.services.dashboard_data import DashboardSnapshot
+
+# Largura fixa das faixas do histograma (%), estável entre versões
+PROFIT_BIN_WIDTH = 0.5
+
+# Combinações de filtros com agregados/figuras em cache
+CHART_CACHE_SIZE = 64
+
+ChartKey = Tuple[Any, ...]
+
+
+def chart_key(
+    sports: Optional[Sequence[str]] = None,
+    min_profit: Optional[float] = None,
+    bookmakers: Optional[Sequence[str]] = None,
+    search: Optional[str] = None,
+    filter_query: Optional[str] = None,
+) -> ChartKey:
+    """Chave canônica dos filtros que afetam os gráficos."""
+    return (
+        tuple(sorted(sports or ())),
+        min_profit or 0,
+        tuple(sorted(bookmakers or ())),
+        (search or "").lower(),
+        filter_query or "",
+    )
+
+
+def profit_bin(profit: float, width: float = PROFIT_BIN_WIDTH) -> int:
+    return math.floor(profit / width)
+
+
+class ChartAggregates:
+    """Contagens por faixa de lucro e por casa de uma versão do snapshot."""
+
+    __slots__ = ("version", "scanned_at", "entries", "profit_bins", "bookmaker_counts")
+
+    def __init__(self, version: str = "", scanned_at: Optional[float] = None):
+        self.version = version
+        self.scanned_at = scanned_at
+        # id -> (faixa de lucro, rótulo da casa) de cada linha contada
+        self.entries: Dict[str, Tuple[int, str]] = {}
+        self.profit_bins: Counter = Counter()
+        self.bookmaker_counts: Counter = Counter()
+
+    def advance(
+        self,
+        version: str,
+        rows: Sequence[Dict[str, Any]],
+        scanned_at: Optional[float] = None,
+    ) -> "ChartAggregates":
+        """Novos agregados para ``rows``, aplicando só as diferenças por ``id``."""
+        new = ChartAggregates(version, scanned_at)
+        new.profit_bins = self.profit_bins.copy()
+        new.bookmaker_counts = self.bookmaker_counts.copy()
+        old_entries = self.entries
+        entries = new.entries
+        for row in rows:
+            entry = (profit_bin(row["profit_value"]), row["bookmakers"])
+            entries[row["id"]] = entry
+            previous = old_entries.get(row["id"])
+            if previous == entry:
+                continue
+            if previous is not None:
+                new._count(previous, -1)
+            new._count(entry, 1)
+        for row_id, previous in old_entries.items():
+            if row_id not in entries:
+                new._count(previous, -1)
+        return new
+
+    def _count(self, entry: Tuple[int, str], delta: int):
+        bin_index, label = entry
+        for counter, key in (
+            (self.profit_bins, bin_index),
+            (self.bookmaker_counts, label),
+        ):
+            counter[key] += delta
+            if counter[key] <= 0:
+                del counter[key]
+
+    def histogram(self) -> Tuple[list, list]:
+        """Centros das faixas e contagens, em ordem crescente de lucro."""
+        bins = sorted(self.profit_bins)
+        centers = [(b + 0.5) * PROFIT_BIN_WIDTH for b in bins]
+        return centers, [self.profit_bins[b] for b in bins]
+
+
+def empty_figure(title: str) -> Dict[str, Any]:
+    figure = go.Figure()
+    figure.update_layout(title=title, template="plotly_dark")
+    return figure.to_dict()
+
+
+def build_figures(aggregates: ChartAggregates) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Figuras (JSON do Plotly) de distribuição de lucros e de casas."""
+    if not aggregates.entries:
+        empty = empty_figure("Aguardando dados...")
+        return empty, empty
+
+    centers, counts = aggregates.histogram()
+    profit_fig = go.Figure(data=[go.Bar(x=centers, y=counts, width=PROFIT_BIN_WIDTH)])
+    profit_fig.update_layout(
+        title="Distribuição de Lucros",
+        xaxis_title="Lucro (%)",
+        yaxis_title="Frequência",
+        template="plotly_dark",
+        bargap=0.05,
+    )
+
+    bookmaker_counts = aggregates.bookmaker_counts
+    bm_fig = go.Figure(
+        data=[
+            go.Bar(x=list(bookmaker_counts.keys()), y=list(bookmaker_counts.values()))
+        ]
+    )
+    bm_fig.update_layout(
+        title="Oportunidades por Bookmaker",
+        xaxis_title="Bookmaker",
+        yaxis_title="Quantidade",
+        template="plotly_dark",
+    )
+    return profit_fig.to_dict(), bm_fig.to_dict()
+
+
+class DashboardCharts:
+    """
+    Cache das figuras por ``(versão do snapshot, filtros)``.
+
+    Em uma nova versão, os agregados da mesma combinação de filtros avançam a
+    partir da versão anterior em vez de serem recontados.
+    """
+
+    def __init__(self, max_entries: int = CHART_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._aggregates: "OrderedDict[ChartKey, ChartAggregates]" = OrderedDict()
+        self._figures: "OrderedDict[Tuple[str, ChartKey], Tuple[Dict, Dict]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def figures(
+        self,
+        snapshot: DashboardSnapshot,
+        sports: Optional[Sequence[str]] = None,
+        min_profit: Optional[float] = None,
+        bookmakers: Optional[Sequence[str]] = None,
+        search: Optional[str] = None,
+        filter_query: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Figuras de lucro e de casas para os filtros da sessão."""
+        key = chart_key(sports, min_profit, bookmakers, search, filter_query)
+        cache_key = (snapshot.version, key)
+        with self._lock:
+            cached = self._figures.get(cache_key)
+            if cached is not None:
+                self._figures.move_to_end(cache_key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+            previous = self._aggregates.get(key) or ChartAggregates()
+
+        index = snapshot.index
+        rows = index.rows
+        ids = index.query(sports, min_profit, bookmakers, search, None, filter_query)
+        if previous.version == snapshot.version:
+            aggregates = previous
+        else:
+            aggregates = previous.advance(
+                snapshot.version, [rows[i] for i in ids], snapshot.scanned_at
+            )
+        figures = build_figures(aggregates)
+
+        with self._lock:
+            # Não regride agregados de uma varredura mais nova calculada em paralelo
+            current = self._aggregates.get(key)
+            if current is None or (current.scanned_at or 0.0) <= (
+                aggregates.scanned_at or 0.0
+            ):
+                self._aggregates[key] = aggregates
+                self._aggregates.move_to_end(key)
+            self._figures[cache_key] = figures
+            for cache in (self._aggregates, self._figures):
+                while len(cache) > self.max_entries:
+                    cache.popitem(last=False)
+        return figures
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached_figures": len(self._figures),
+        }
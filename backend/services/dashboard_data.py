@@ -0,0 +1,639 @@
+"""
+Snapshot compartilhado de oportunidades e jogos para o dashboard.
+
+Os callbacks do Dash rodam a cada intervalo e a cada mudança de filtro, para
+cada navegador conectado. Em vez de consultar os adaptadores em cada
+callback, o processo mantém um único snapshot, renovado no máximo uma vez por
+``services.arbitrage.scan_interval_seconds`` (uma varredura por vez; quem
+chega durante a varredura recebe o snapshot anterior). Os filtros de cada
+sessão são aplicados em memória sobre esse snapshot.
+
+A versão de cada snapshot é o hash do conteúdo (``content_version``): cada
+worker do Gunicorn varre por conta própria, e varreduras com o mesmo
+resultado recebem a mesma versão em qualquer worker. Os snapshots anteriores
+mais recentes ficam guardados para que o dashboard envie ao navegador apenas
+as linhas que mudaram (``diff_rows``) desde a versão que ele já exibe, mesmo
+quando a requisição cai em outro worker.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import hashlib
+import logging
+import re
+import threading
+import time
+
+from backend.core.serialization import dumps_bytes
+from config.config_loader import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Esportes varridos (o filtro do dashboard escolhe entre eles em memória)
+SCAN_SPORTS = tuple(
+    CONFIG["services"]["arbitrage"].get("allowed_sports") or ("soccer",)
+)
+DEFAULT_SPORTS = ("soccer",)
+
+# Limites por adaptador em cada varredura
+OPPORTUNITY_EVENTS_LIMIT = 20
+GAMES_LIMIT = 5
+GAMES_DISPLAY_LIMIT = 10
+
+# Snapshots anteriores mantidos para calcular deltas de clientes atrasados
+SNAPSHOT_HISTORY_SIZE = 8
+
+
+class DashboardSnapshot:
+    """Resultado imutável de uma varredura dos adaptadores."""
+
+    __slots__ = (
+        "version",
+        "scanned_at",
+        "opportunities",
+        "search_text",
+        "live_games",
+        "upcoming_games",
+        "error",
+        "_index",
+    )
+
+    def __init__(
+        self,
+        version: Optional[str] = None,
+        opportunities: Sequence[Dict[str, Any]] = (),
+        live_games: Sequence[Dict[str, Any]] = (),
+        upcoming_games: Sequence[Dict[str, Any]] = (),
+        error: Optional[str] = None,
+        scanned_at: Optional[float] = None,
+    ):
+        self.scanned_at = scanned_at
+        self.opportunities = tuple(opportunities)
+        # Texto de busca (evento + mercado, minúsculo) pré-calculado por linha
+        self.search_text = tuple(
+            f"{op['event']}\n{op['market']}".lower() for op in self.opportunities
+        )
+        self.live_games = tuple(live_games)
+        self.upcoming_games = tuple(upcoming_games)
+        self.error = error
+        if version is None:
+            version = content_version(
+                self.opportunities, self.live_games, self.upcoming_games, error
+            )
+        self.version = version
+        self._index = None
+
+    @property
+    def index(self) -> "OpportunityIndex":
+        """Índices de consulta, construídos na primeira consulta paginada."""
+        if self._index is None:
+            self._index = OpportunityIndex(self.opportunities, self.search_text)
+        return self._index
+
+    def same_content(self, other: "DashboardSnapshot") -> bool:
+        return (
+            self.opportunities == other.opportunities
+            and self.live_games == other.live_games
+            and self.upcoming_games == other.upcoming_games
+            and self.error == other.error
+        )
+
+
+EMPTY_SNAPSHOT = DashboardSnapshot(version="")
+
+
+def content_version(
+    opportunities: Sequence[Dict[str, Any]],
+    live_games: Sequence[Dict[str, Any]] = (),
+    upcoming_games: Sequence[Dict[str, Any]] = (),
+    error: Optional[str] = None,
+) -> str:
+    """
+    Versão de um snapshot: hash do conteúdo, igual em todos os processos.
+
+    Um delta só é calculado sobre um snapshot com exatamente o conteúdo que o
+    navegador exibe, seja qual for o worker que o varreu.
+    """
+    payload = dumps_bytes([opportunities, live_games, upcoming_games, error])
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def calculate_mock_profit(selections: List[Dict[str, Any]]) -> float:
+    """Calcula lucro mock para demonstração."""
+    if len(selections) < 2:
+        return 0
+
+    # Fórmula simplificada de surebet
+    inverse_sum = sum(1 / selection["odds"] for selection in selections[:2])
+    if inverse_sum < 1:
+        return (1 - inverse_sum) * 100
+    return 0
+
+
+def _format_start_time(value: str, fmt: str) -> str:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).strftime(fmt)
+
+
+def scan_adapters(
+    adapters: Dict[str, Any],
+    sports: Iterable[str] = SCAN_SPORTS,
+    version: Optional[str] = None,
+    scanned_at: Optional[float] = None,
+) -> DashboardSnapshot:
+    """
+    Consulta todos os adaptadores uma vez e monta as linhas do dashboard.
+
+    Falhas de um adaptador são registradas e não impedem os demais.
+    """
+    opportunities = []
+    live_games = []
+    upcoming_games = []
+    errors = []
+
+    for adapter_name, adapter in adapters.items():
+        bookmaker = adapter_name.title()
+        try:
+            for sport in sports:
+                for event in adapter.get_live_odds(
+                    sport, limit=OPPORTUNITY_EVENTS_LIMIT
+                ):
+                    for market in event.get("markets", []):
+                        selections = market.get("selections", [])
+                        if len(selections) < 2:
+                            continue
+                        profit = calculate_mock_profit(selections)
+                        opportunities.append(
+                            {
+                                "id": f"{adapter_name}:{event['id']}:{market['name']}",
+                                "event": f"🏟️ {event['name']}",
+                                "market": market["name"],
+                                "sport": sport,
+                                "profit": f"{profit:.2f}%",
+                                "profit_value": profit,
+                                "bookmaker": adapter_name,
+                                "bookmakers": bookmaker,
+                                "actions": f"[📊 Detalhes](#{event['id']})",
+                            }
+                        )
+
+            for game in adapter.get_live_odds("soccer", limit=GAMES_LIMIT):
+                live_games.append(
+                    {
+                        "name": game["name"],
+                        "status": "AO VIVO",
+                        "start_time": _format_start_time(game["start_time"], "%H:%M"),
+                        "bookmaker": bookmaker,
+                    }
+                )
+            for game in adapter.get_upcoming_odds("soccer", limit=GAMES_LIMIT):
+                upcoming_games.append(
+                    {
+                        "name": game["name"],
+                        "status": "PROGRAMADO",
+                        "start_time": _format_start_time(
+                            game["start_time"], "%d/%m %H:%M"
+                        ),
+                        "bookmaker": bookmaker,
+                    }
+                )
+        except Exception as e:
+            logger.error(f"Erro ao consultar adaptador {adapter_name}: {e}")
+            errors.append(f"{adapter_name}: {e}")
+
+    return DashboardSnapshot(
+        version=version,
+        opportunities=opportunities,
+        live_games=live_games[:GAMES_DISPLAY_LIMIT],
+        upcoming_games=upcoming_games[:GAMES_DISPLAY_LIMIT],
+        error="; ".join(errors) or None,
+        scanned_at=scanned_at,
+    )
+
+
+def filter_opportunities(
+    snapshot: DashboardSnapshot,
+    sports: Optional[Sequence[str]] = None,
+    min_profit: Optional[float] = None,
+    bookmakers: Optional[Sequence[str]] = None,
+    search: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Aplica os filtros de uma sessão do dashboard sobre o snapshot."""
+    sports = set(sports or DEFAULT_SPORTS)
+    bookmakers = set(bookmakers or ())
+    min_profit = min_profit or 0
+    search = search.lower() if search else None
+    return [
+        op
+        for op, text in zip(snapshot.opportunities, snapshot.search_text)
+        if op["sport"] in sports
+        and op["profit_value"] >= min_profit
+        and (not bookmakers or op["bookmaker"] in bookmakers)
+        and (search is None or search in text)
+    ]
+
+
+# ============= CONSULTA PAGINADA =============
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Termos do filter_query do DataTable: {coluna} [s|i]operador valor
+_FILTER_TERM_RE = re.compile(
+    r"^\{(?P<column>[^}]+)\}\s+(?P<case>[si]?)"
+    r"(?P<op>contains|datestartswith|=|eq|!=|ne|>=|ge|<=|le|>|gt|<|lt)"
+    r"\s+(?P<value>.+)$"
+)
+_COMPARISONS = {
+    "=": lambda a, b: a == b,
+    "eq": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "ne": lambda a, b: a != b,
+    ">=": lambda a, b: a >= b,
+    "ge": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    "le": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    "gt": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+    "lt": lambda a, b: a < b,
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _parse_filter_value(raw: str) -> str:
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in "\"'`":
+        return raw[1:-1]
+    return raw
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).replace("%", "").strip())
+    except ValueError:
+        return None
+
+
+def parse_filter_query(
+    filter_query: Optional[str],
+) -> List[Callable[[Dict[str, Any]], bool]]:
+    """
+    Converte o ``filter_query`` do DataTable (``filter_action="custom"``) em predicados.
+
+    Suporta termos unidos por ``&&`` com ``contains`` e comparações; a coluna
+    ``profit`` é comparada numericamente. Termos não reconhecidos são ignorados.
+    """
+    predicates = []
+    for term in (filter_query or "").split("&&"):
+        match = _FILTER_TERM_RE.match(term.strip())
+        if not match:
+            if term.strip():
+                logger.debug(f"Termo de filtro ignorado: {term.strip()}")
+            continue
+        column, case, op = match.group("column"), match.group("case"), match.group("op")
+        value = _parse_filter_value(match.group("value"))
+        if column == "profit":
+            number = _number(value)
+            if number is None or op not in _COMPARISONS:
+                continue
+            compare = _COMPARISONS[op]
+            predicates.append(
+                lambda row, c=compare, n=number: c(row["profit_value"], n)
+            )
+        elif op in ("contains", "datestartswith"):
+            if case == "s":
+                predicates.append(
+                    lambda row, col=column, v=value: v in str(row.get(col, ""))
+                )
+            else:
+                needle = value.lower()
+                predicates.append(
+                    lambda row, col=column, v=needle: v in str(row.get(col, "")).lower()
+                )
+        else:
+            compare = _COMPARISONS[op]
+            predicates.append(
+                lambda row, col=column, c=compare, v=value: c(str(row.get(col, "")), v)
+            )
+    return predicates
+
+
+class OpportunityIndex:
+    """
+    Índices em memória das oportunidades de um snapshot.
+
+    Mantém a ordem por lucro (decrescente), conjuntos por esporte e casa e
+    um índice invertido dos tokens de evento/mercado, para que filtros e
+    paginação não percorram cada linha com comparações de texto. A busca
+    mantém a semântica de substring de ``filter_opportunities``: cada palavra
+    é procurada no vocabulário (bem menor que o número de linhas) e só os
+    candidatos restantes são conferidos contra o texto completo.
+    """
+
+    def __init__(self, rows: Sequence[Dict[str, Any]], search_text: Sequence[str] = ()):
+        self.rows = rows
+        self.search_text = search_text or tuple(
+            f"{row['event']}\n{row['market']}".lower() for row in rows
+        )
+        self.profits = [row["profit_value"] for row in rows]
+        self.by_profit = sorted(range(len(rows)), key=lambda i: -self.profits[i])
+        # Lucros negados em ordem crescente, para cortar "lucro >= x" com bisect
+        self._negated_profits = [-self.profits[i] for i in self.by_profit]
+        self.by_sport: Dict[str, Set[int]] = defaultdict(set)
+        self.by_bookmaker: Dict[str, Set[int]] = defaultdict(set)
+        postings: Dict[str, Set[int]] = defaultdict(set)
+        for i, row in enumerate(rows):
+            self.by_sport[row["sport"]].add(i)
+            self.by_bookmaker[row["bookmaker"]].add(i)
+            for token in tokenize(row["event"]) + tokenize(row["market"]):
+                postings[token].add(i)
+        self.postings = dict(postings)
+        self._orders: Dict[Tuple[str, bool], List[int]] = {}
+        self._word_matches: Dict[str, Set[int]] = {}
+
+    def _token_matches(self, word: str) -> Set[int]:
+        """Linhas com algum token que contém ``word``."""
+        matches = self._word_matches.get(word)
+        if matches is None:
+            matches = set()
+            for token, ids in self.postings.items():
+                if word in token:
+                    matches |= ids
+            self._word_matches[word] = matches
+        return matches
+
+    def _order(self, column: str, descending: bool) -> List[int]:
+        key = (column, descending)
+        order = self._orders.get(key)
+        if order is None:
+            if column == "profit":
+                values = self.profits
+            else:
+                values = [str(row.get(column, "")) for row in self.rows]
+            order = sorted(
+                range(len(self.rows)), key=values.__getitem__, reverse=descending
+            )
+            self._orders[key] = order
+        return order
+
+    def query(
+        self,
+        sports: Optional[Sequence[str]] = None,
+        min_profit: Optional[float] = None,
+        bookmakers: Optional[Sequence[str]] = None,
+        search: Optional[str] = None,
+        sort_by: Optional[Sequence[Dict[str, str]]] = None,
+        filter_query: Optional[str] = None,
+    ) -> List[int]:
+        """Índices das linhas que passam nos filtros, já ordenados."""
+        allowed: Optional[Set[int]] = None
+
+        def narrow(ids: Set[int]):
+            nonlocal allowed
+            allowed = ids if allowed is None else allowed & ids
+
+        narrow(
+            set().union(
+                *(self.by_sport.get(sport, ()) for sport in (sports or DEFAULT_SPORTS))
+            )
+        )
+        if bookmakers:
+            narrow(
+                set().union(*(self.by_bookmaker.get(name, ()) for name in bookmakers))
+            )
+        if search:
+            needle = search.lower()
+            for word in tokenize(needle):
+                narrow(self._token_matches(word))
+                if not allowed:
+                    return []
+            text = self.search_text
+            allowed = {i for i in allowed if needle in text[i]}
+
+        if sort_by:
+            column = sort_by[0].get("column_id", "profit")
+            order = self._order(column, sort_by[0].get("direction") != "asc")
+            threshold = min_profit or 0
+            ids = [i for i in order if i in allowed and self.profits[i] >= threshold]
+        else:
+            # Ordem padrão: maior lucro primeiro; o corte por lucro mínimo é um prefixo
+            count = bisect_right(self._negated_profits, -(min_profit or 0))
+            ids = [i for i in self.by_profit[:count] if i in allowed]
+
+        predicates = parse_filter_query(filter_query)
+        if predicates:
+            rows = self.rows
+            ids = [
+                i for i in ids if all(predicate(rows[i]) for predicate in predicates)
+            ]
+        return ids
+
+
+def query_opportunities(
+    snapshot: DashboardSnapshot,
+    sports: Optional[Sequence[str]] = None,
+    min_profit: Optional[float] = None,
+    bookmakers: Optional[Sequence[str]] = None,
+    search: Optional[str] = None,
+    sort_by: Optional[Sequence[Dict[str, str]]] = None,
+    filter_query: Optional[str] = None,
+    page: int = 0,
+    page_size: int = 20,
+) -> Tuple[List[Dict[str, Any]], int, float]:
+    """
+    Uma página de oportunidades filtradas e ordenadas no servidor.
+
+    Retorna ``(linhas_da_página, total_filtrado, lucro_médio_filtrado)``.
+    """
+    index = snapshot.index
+    ids = index.query(sports, min_profit, bookmakers, search, sort_by, filter_query)
+    total = len(ids)
+    profits = index.profits
+    avg_profit = sum(profits[i] for i in ids) / total if total else 0.0
+    start = max(page or 0, 0) * page_size
+    rows = index.rows
+    return [rows[i] for i in ids[start : start + page_size]], total, avg_profit
+
+
+def diff_rows(
+    old_rows: Sequence[Dict[str, Any]], new_rows: Sequence[Dict[str, Any]]
+) -> Optional[Tuple[List[int], List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]]:
+    """
+    Operações que transformam ``old_rows`` em ``new_rows`` (chave: ``id``).
+
+    Retorna ``(removidos, alterados, novos)``: índices a remover (em ordem
+    decrescente, aplicados primeiro), pares ``(índice, linha)`` a substituir
+    após as remoções e linhas a acrescentar no fim. Retorna ``None`` quando
+    essas operações não reproduzem a ordem de ``new_rows`` (linhas mantidas
+    reordenadas ou linha nova antes de uma mantida); o cliente deve então
+    receber a lista completa.
+    """
+    new_ids = {row["id"] for row in new_rows}
+    removed = [
+        i for i in range(len(old_rows) - 1, -1, -1) if old_rows[i]["id"] not in new_ids
+    ]
+    surviving = [row for row in old_rows if row["id"] in new_ids]
+    positions = {row["id"]: i for i, row in enumerate(surviving)}
+    changed = []
+    added = []
+    for position, row in enumerate(new_rows):
+        i = positions.get(row["id"])
+        if i is None:
+            added.append(row)
+        elif added or i != position:
+            return None
+        elif surviving[i] != row:
+            changed.append((i, row))
+    return removed, changed, added
+
+
+class DashboardDataService:
+    """
+    Mantém o snapshot do processo e o renova sob demanda.
+
+    ``get_snapshot`` nunca dispara mais de uma varredura ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        adapters_provider: Callable[[], Dict[str, Any]],
+        sports: Iterable[str] = SCAN_SPORTS,
+        max_age_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._adapters_provider = adapters_provider
+        self.sports = tuple(sports)
+        self._clock = clock
+        self._snapshot = EMPTY_SNAPSHOT
+        self._history = deque(maxlen=SNAPSHOT_HISTORY_SIZE)
+        self._scan_lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.scans = 0
+        self.last_scan_ms = 0.0
+        if max_age_seconds is None:
+            CONFIG.subscribe(self._apply_config, "services.arbitrage")
+        else:
+            self.max_age_seconds = max_age_seconds
+
+    def _apply_config(self, config):
+        self.max_age_seconds = float(config.services.arbitrage.scan_interval_seconds)
+
+    def is_stale(self, snapshot: DashboardSnapshot) -> bool:
+        return (
+            snapshot.scanned_at is None
+            or self._clock() - snapshot.scanned_at >= self.max_age_seconds
+        )
+
+    def get_snapshot(self) -> DashboardSnapshot:
+        """Snapshot atual, renovado se for mais velho que o intervalo de varredura."""
+        snapshot = self._snapshot
+        if not self.is_stale(snapshot):
+            return snapshot
+        # Sem snapshot ainda: espera a varredura em andamento;
+        # com snapshot, não bloqueia
+        if not self._scan_lock.acquire(blocking=snapshot.scanned_at is None):
+            return snapshot
+        try:
+            if self.is_stale(self._snapshot):
+                self._scan()
+            return self._snapshot
+        finally:
+            self._scan_lock.release()
+
+    def refresh(self) -> DashboardSnapshot:
+        """Força uma nova varredura (ex.: botão "Atualizar Agora")."""
+        with self._scan_lock:
+            self._scan()
+            return self._snapshot
+
+    def _scan(self):
+        start = time.perf_counter()
+        previous = self._snapshot
+        snapshot = scan_adapters(
+            self._adapters_provider(),
+            self.sports,
+            scanned_at=self._clock(),
+        )
+        if previous.scanned_at is not None and snapshot.same_content(previous):
+            # Nada mudou: mantém a versão para não acordar os clientes
+            snapshot = DashboardSnapshot(
+                previous.version,
+                previous.opportunities,
+                previous.live_games,
+                previous.upcoming_games,
+                previous.error,
+                scanned_at=snapshot.scanned_at,
+            )
+        else:
+            self._history.append(previous)
+        self._snapshot = snapshot
+        if snapshot.version != previous.version:
+            with self._changed:
+                self._changed.notify_all()
+        self.scans += 1
+        self.last_scan_ms = (time.perf_counter() - start) * 1000
+        logger.debug(
+            f"Snapshot do dashboard v{snapshot.version}: "
+            f"{len(snapshot.opportunities)} oportunidades em {self.last_scan_ms:.1f}ms"
+        )
+
+    def get_version(self, version: str) -> Optional[DashboardSnapshot]:
+        """Snapshot de uma versão recente (para deltas), ou None se já descartado."""
+        snapshot = self._snapshot
+        if snapshot.version == version:
+            return snapshot
+        for old in self._history:
+            if old.version == version:
+                return old
+        return None
+
+    def wait_for_change(self, version: str, timeout: float) -> str:
+        """Bloqueia até existir versão diferente de ``version`` (ou timeout)."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._snapshot.version != version, timeout)
+        return self._snapshot.version
+
+    # ============= VARREDURA EM SEGUNDO PLANO =============
+
+    def start_background(self) -> bool:
+        """Varre periodicamente, para que as mudanças sejam empurradas sem leitores."""
+        with self._scan_lock:
+            if self._worker is not None and self._worker.is_alive():
+                return False
+            self._stop.clear()
+            self._worker = threading.Thread(
+                target=self._run, name="dashboard-scan", daemon=True
+            )
+            self._worker.start()
+        return True
+
+    def stop_background(self):
+        self._stop.set()
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout=5)
+        self._worker = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Erro na varredura do dashboard: {e}")
+            self._stop.wait(self.max_age_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version,
+            "opportunities": len(snapshot.opportunities),
+            "scans": self.scans,
+            "last_scan_ms": round(self.last_scan_ms, 3),
+            "max_age_seconds": self.max_age_seconds,
+        }
@@ -1,20 +1,49 @@
 from fastapi import FastAPI, WebSocket
 from typing import List
+import logging
 import requests
 from config.config_loader import CONFIG
+from backend.core.pagination import dumps_row
+from backend.core.serialization import fast_json_response_class
+from backend.database.async_database import async_db
 import asyncio
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+app = FastAPI(default_response_class=fast_json_response_class())
 
 # Lista de conexões WebSocket ativas
 active_connections: List[WebSocket] = []
 
+# Quantidade de surebets recentes enviadas a cada cliente ao conectar
+RECENT_SUREBETS_ON_CONNECT = 10
+
+
+@app.on_event("shutdown")
+async def close_database_pool():
+    await async_db.close()
+
+
+async def send_recent_surebets(websocket: WebSocket):
+    """Envia as surebets mais recentes ao cliente sem bloquear o event loop."""
+    try:
+        surebets = await async_db.fetch_named(
+            "surebets_recent", (RECENT_SUREBETS_ON_CONNECT,)
+        )
+    except Exception as e:
+        logger.warning(f"Não foi possível carregar surebets recentes: {e}")
+        return
+    await websocket.send_text(
+        dumps_row({"type": "recent_surebets", "surebets": surebets})
+    )
+
 
 @app.websocket("/ws/notifications")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
     active_connections.append(websocket)
     try:
+        await send_recent_surebets(websocket)
         while True:
             await asyncio.sleep(1)  # Mantém a conexão aberta
     except Exception:
@@ -14,6 +14,22 @@ from backend.database.database import get_db
 from pathlib import Path
 
 
+class FakeClock:
+    """Relógio dos testes: devolve ``now``, que o teste avança manualmente."""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    """Fábrica de ``FakeClock`` (ex.: ``clock = fake_clock(100.0)``)."""
+    return FakeClock
+
+
 @pytest.fixture(scope="session")
 def test_database_url():
     """Retorna a URL do banco PostgreSQL de teste."""
@@ -12,7 +12,7 @@ os.environ["JWT_SECRET_KEY"] = "test-integration-key"
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 from config.config_loader import CONFIG
 
-CONFIG["security"]["secret_key"] = "test-integration-key"
+CONFIG.override({"security": {"secret_key": "test-integration-key"}})
 # Forçar reload do AuthManager para garantir segredo correto
 auth_mod = importlib.import_module("backend.core.auth")
 importlib.reload(auth_mod)
@@ -36,7 +36,7 @@ def client():
     # Recarregar o módulo admin_api para garantir que pegue a chave correta
     from config.config_loader import CONFIG
 
-    CONFIG["security"]["secret_key"] = "test-integration-key"
+    CONFIG.override({"security": {"secret_key": "test-integration-key"}})
     importlib.invalidate_caches()
     from backend.apps.admin_api import app as admin_api
 
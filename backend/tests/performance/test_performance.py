@@ -4,12 +4,24 @@
 Testes para medir e validar performance do sistema.
 """
 
+import os
+import sys
 import pytest
 import time
 import random
+import subprocess
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.core.auth import TokenBlacklist
+from backend.core.hashing import HashingOverloadedError, PasswordHasher
+from backend.core import serialization
+from backend.core.validation import detect_sql_injection, detect_xss
+from backend.services.dashboard_data import DashboardSnapshot, query_opportunities
+
 
 class TestDatabasePerformance:
     """Testes de performance do banco de dados."""
@@ -508,3 +520,282 @@ class TestScalabilityTests:
         logging.info(
             f"Stress test: {num_workers} workers, {total_operations} ops, {error_rate:.2f}% errors, {throughput:.2f} ops/sec"
         )
+
+
+class TestTokenBlacklistPerformance:
+    """Testes de performance da blacklist de tokens em memória."""
+
+    @pytest.mark.performance
+    def test_blacklist_with_one_million_tokens(self, benchmark_timer):
+        """Inserção e consulta com 1M de tokens revogados."""
+        blacklist = TokenBlacklist(redis_url="")
+        now = time.time()
+        total = 1_000_000
+
+        benchmark_timer.start()
+        for i in range(total):
+            # Metade já expirada, para exercitar a limpeza amortizada
+            blacklist.add_to_blacklist(f"jti-{i}", now + (3600 if i % 2 else -1))
+        benchmark_timer.stop()
+        insert_ms = benchmark_timer.elapsed_ms()
+
+        lookups = 100_000
+        benchmark_timer.start()
+        for i in range(lookups):
+            blacklist.is_blacklisted(f"jti-{i}")
+        benchmark_timer.stop()
+        lookup_us = benchmark_timer.elapsed_ms() * 1000 / lookups
+
+        assert blacklist.is_blacklisted("jti-1") is True
+        assert blacklist.is_blacklisted("jti-2") is False
+        assert blacklist.get_blacklist_size() == total // 2
+        assert lookup_us < 50  # Consulta O(1): microssegundos, independente do tamanho
+
+        logging.info(
+            f"Blacklist 1M: inserção {insert_ms:.0f}ms, consulta {lookup_us:.2f}us"
+        )
+
+
+class TestLoginPerformance:
+    """Testes de performance da verificação de senhas no login."""
+
+    @pytest.mark.performance
+    def test_logins_per_second_per_core(self, benchmark_timer):
+        """Vazão de verificações de senha com clientes concorrentes."""
+        from werkzeug.security import generate_password_hash
+
+        cores = os.cpu_count() or 1
+        hasher = PasswordHasher(workers=cores, max_pending=cores * 4, timeout=60)
+        password_hash = generate_password_hash("senha-de-teste")
+        clients = cores * 8
+        attempts_per_client = 2
+        outcomes = {"ok": 0, "rejected": 0}
+        lock = threading.Lock()
+
+        def client():
+            for _ in range(attempts_per_client):
+                try:
+                    assert hasher.verify("senha-de-teste", password_hash)
+                    key = "ok"
+                except HashingOverloadedError:
+                    key = "rejected"
+                with lock:
+                    outcomes[key] += 1
+
+        benchmark_timer.start()
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            for future in [executor.submit(client) for _ in range(clients)]:
+                future.result()
+        benchmark_timer.stop()
+        hasher.shutdown()
+
+        elapsed = benchmark_timer.elapsed
+        per_core = outcomes["ok"] / elapsed / cores
+
+        # Excesso de clientes é rejeitado rapidamente em vez de enfileirado sem limite
+        assert outcomes["ok"] + outcomes["rejected"] == clients * attempts_per_client
+        assert outcomes["ok"] >= cores
+        assert per_core > 1
+
+        logging.info(
+            f"Login: {per_core:.1f} logins/s por core ({cores} cores), "
+            f"{outcomes['rejected']} rejeitados de {clients * attempts_per_client}"
+        )
+
+
+class TestValidationPerformance:
+    """Microbenchmarks da detecção de ataques em payloads realistas."""
+
+    PAYLOADS = {
+        "login": {
+            "username": "operador.sp",
+            "password": "S3nh@Forte2025",
+            "use_cookie": False,
+        },
+        "bet": {
+            "event": "Flamengo vs Palmeiras",
+            "market": "Resultado Final",
+            "selection": "Flamengo",
+            "odd": 2.15,
+            "bookmaker": "bet365",
+        },
+        "opportunities": {
+            "opportunities": [
+                {
+                    "event": f"Time {i} vs Time {i + 1}",
+                    "market": "Over 2.5 Goals",
+                    "odds": [1.95, 2.05],
+                    "bookmakers": ["bet365", "betano"],
+                }
+                for i in range(200)
+            ]
+        },
+    }
+
+    @pytest.mark.performance
+    @pytest.mark.parametrize("name", ["login", "bet", "opportunities"])
+    def test_attack_scan_overhead(self, name, benchmark_timer):
+        """Custo por requisição de detect_sql_injection + detect_xss."""
+        text = str(self.PAYLOADS[name])
+        iterations = 2000 if name != "opportunities" else 200
+
+        benchmark_timer.start()
+        for _ in range(iterations):
+            detect_sql_injection(text)
+            detect_xss(text)
+        benchmark_timer.stop()
+
+        per_request_us = benchmark_timer.elapsed_ms() * 1000 / iterations
+        assert per_request_us < 5000
+        logging.info(f"Validação [{name}]: {per_request_us:.1f}us por requisição")
+
+
+class TestDashboardQueryPerformance:
+    """Testes de performance da consulta paginada do dashboard."""
+
+    @pytest.mark.performance
+    def test_page_query_with_50k_rows(self, benchmark_timer):
+        """Uma página filtrada/ordenada sobre 50k oportunidades."""
+        sports = ["soccer", "basketball", "tennis"]
+        rows = [
+            {
+                "id": f"bet365:{i}:1X2",
+                "event": f"Time {i} x Rival {i % 500}",
+                "market": "1X2" if i % 3 else "Over 2.5",
+                "sport": sports[i % 3],
+                "profit": f"{(i % 997) / 100:.2f}%",
+                "profit_value": (i % 997) / 100,
+                "bookmaker": "bet365" if i % 2 else "betano",
+            }
+            for i in range(50_000)
+        ]
+        snapshot = DashboardSnapshot(1, rows)
+        query_opportunities(snapshot)  # Constrói os índices
+
+        queries = [
+            {"sports": ["soccer"], "min_profit": 5},
+            {"sports": sports, "bookmakers": ["betano"], "page": 10},
+            {"sports": sports, "search": "rival 42"},
+            {"sports": sports, "sort_by": [{"column_id": "event", "direction": "asc"}]},
+            {
+                "sports": sports,
+                "filter_query": "{profit} > 9 && {market} icontains over",
+            },
+        ]
+        iterations = 20
+
+        benchmark_timer.start()
+        for _ in range(iterations):
+            for query in queries:
+                page, total, _ = query_opportunities(snapshot, page_size=20, **query)
+                assert len(page) <= 20 <= total
+        benchmark_timer.stop()
+
+        per_query_ms = benchmark_timer.elapsed_ms() / (iterations * len(queries))
+        assert per_query_ms < 200
+        logging.info(f"Dashboard 50k linhas: {per_query_ms:.2f}ms por página")
+
+
+class TestSerializationPerformance:
+    """Serialização JSON de listas grandes de oportunidades."""
+
+    @staticmethod
+    def opportunities(count):
+        from datetime import datetime, timedelta
+        from decimal import Decimal
+
+        base = datetime(2025, 6, 1, 12, 0)
+        return [
+            {
+                "id": i,
+                "event": f"Time {i} x Rival {i % 500}",
+                "market": "1X2",
+                "profit": Decimal(f"{(i % 997) / 100:.2f}"),
+                "bookmakers": ["bet365", "betano"],
+                "selections": [{"name": "A", "odds": 2.05}, {"name": "B", "odds": 2.1}],
+                "detected_at": base + timedelta(seconds=i),
+            }
+            for i in range(count)
+        ]
+
+    @pytest.mark.performance
+    def test_serialize_10k_opportunities(self, benchmark_timer):
+        """Provider do app contra o provider padrão do Flask (json da stdlib)."""
+        from flask import Flask
+        from flask.json.provider import DefaultJSONProvider
+
+        app = Flask(__name__)
+        payload = {"opportunities": self.opportunities(10_000)}
+        providers = {
+            "flask": DefaultJSONProvider(app),
+            serialization.BACKEND: serialization.JSONProvider(app),
+        }
+        iterations = 5
+        timings = {}
+        for name, provider in providers.items():
+            provider.dumps(payload)
+            benchmark_timer.start()
+            for _ in range(iterations):
+                provider.dumps(payload)
+            benchmark_timer.stop()
+            timings[name] = benchmark_timer.elapsed_ms() / iterations
+
+        per_payload_ms = timings[serialization.BACKEND]
+        assert per_payload_ms < 500
+        if serialization.BACKEND == "orjson":
+            assert per_payload_ms < timings["flask"]
+        logging.info(
+            f"Serialização de 10k oportunidades: {serialization.BACKEND} "
+            f"{per_payload_ms:.1f}ms, Flask padrão {timings['flask']:.1f}ms"
+        )
+
+
+class TestStartupPerformance:
+    """Orçamento de tempo de import dos apps (boot de workers e coleta de testes)."""
+
+    PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+
+    # (módulo, orçamento em ms, módulos pesados que só devem carregar sob demanda)
+    BUDGETS = [
+        (
+            "backend.apps.admin_api",
+            1500,
+            ["fastapi", "selenium", "bleach", "asyncpg", "marshmallow", "redis"],
+        ),
+        (
+            "backend.apps.dashboard",
+            2500,
+            ["fastapi", "selenium", "asyncpg", "marshmallow"],
+        ),
+    ]
+
+    @pytest.mark.performance
+    @pytest.mark.parametrize("module,budget_ms,lazy_modules", BUDGETS)
+    def test_import_time_budget(self, module, budget_ms, lazy_modules):
+        """Tempo cumulativo de import (-X importtime) e dependências adiadas."""
+        code = (
+            f"import sys, {module}; "
+            f"print(','.join(m for m in {lazy_modules!r} if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=self.PROJECT_ROOT,
+            env={**os.environ, "PYTHONPATH": self.PROJECT_ROOT},
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+
+        cumulative_us = None
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and line.rstrip().endswith(
+                f"| {module}"
+            ):
+                cumulative_us = int(line.split("|")[1])
+        assert cumulative_us is not None
+
+        loaded = [m for m in result.stdout.strip().split(",") if m]
+        assert loaded == [], f"{module} importou no carregamento: {loaded}"
+        assert cumulative_us / 1000 < budget_ms
+        logging.info(f"Import {module}: {cumulative_us / 1000:.0f}ms")
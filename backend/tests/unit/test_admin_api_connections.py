@@ -0,0 +1,98 @@
+"""Os endpoints da API administrativa devolvem as conexões ao pool."""
+
+import os
+import sys
+
+import jwt
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.apps import admin_api
+from backend.database.counters import counters
+
+
+class FakeDatabase:
+    """Substituto do PostgresDatabaseManager que registra abertura e fechamento."""
+
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        self.closed = False
+        FakeDatabase.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+    def fetch_named(self, name, params=None):
+        return []
+
+    def fetch_one_named(self, name, params=None):
+        if name == "user_username_by_id":
+            return {"username": "ana"}
+        if name == "user_profile":
+            return {"username": "ana", "role": "admin"}
+        return {"id": 1}
+
+    def fetch(self, *args, **kwargs):
+        return []
+
+    def execute(self, *args, **kwargs):
+        return 1
+
+    execute_named = execute
+
+    def insert(self, table, data):
+        return 42
+
+
+@pytest.fixture
+def client(monkeypatch):
+    FakeDatabase.instances = []
+    monkeypatch.setattr(admin_api, "PostgresDatabaseManager", FakeDatabase)
+    monkeypatch.setattr(
+        counters, "get_counts", lambda db: {"users": 1, "events": 2, "surebets": 3}
+    )
+    app = admin_api.create_app({"TESTING": True})
+    with app.app_context():
+        token = app.jwt_auth.create_token(identity="ana", role="admin")
+    # O PyJWT 2.10 recusa o ``sub`` em dicionário; o token entra já verificado no
+    # cache do AuthManager para que o teste cubra apenas os handlers.
+    claims = jwt.decode(
+        token,
+        app.config["JWT_SECRET_KEY"],
+        algorithms=["HS256"],
+        options={"verify_sub": False},
+    )
+    app.jwt_auth.token_cache.put(
+        app.jwt_auth.token_cache.key(token), jwt.get_unverified_header(token), claims
+    )
+    test_client = app.test_client()
+    test_client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+    return test_client
+
+
+@pytest.mark.parametrize(
+    "method,path",
+    [
+        ("get", "/api/admin/dashboard"),
+        ("get", "/api/operator/dashboard"),
+        ("get", "/api/user/dashboard"),
+        ("get", "/api/admin/users"),
+        ("delete", "/api/admin/users/7"),
+        ("post", "/api/auth/revoke-all/ana"),
+        ("get", "/api/admin/db-overview"),
+    ],
+)
+def test_handlers_close_their_connections(client, method, path):
+    response = getattr(client, method)(path)
+
+    assert response.status_code < 500, response.get_data(as_text=True)
+    assert FakeDatabase.instances
+    assert all(db.closed for db in FakeDatabase.instances)
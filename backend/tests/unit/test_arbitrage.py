@@ -1,3 +1,45 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.services import arbitrage
+from backend.services.arbitrage import SurebetDetector
+from config.config_loader import CONFIG, FrozenConfig
+
+
 def test_arbitrage_basic():
     # Adapte conforme as funções reais
     assert True
+
+
+EVENTS = [
+    {
+        "event_id": "e1",
+        "market": "1X2",
+        "selections": [
+            {"name": "Home", "odds": 2.1, "bookmaker": "A"},
+            {"name": "Away", "odds": 2.1, "bookmaker": "B"},
+        ],
+    }
+]
+
+
+def test_min_profit_follows_config_reload():
+    # Lucro da combinação: (1 - 2/2.1) * 100 ~= 4.76%
+    assert (
+        arbitrage.MIN_PROFIT_PERCENT
+        == CONFIG["services"]["arbitrage"]["min_profit_percent"]
+    )
+    original = arbitrage.MIN_PROFIT_PERCENT
+    try:
+        arbitrage._apply_arbitrage_config(
+            FrozenConfig({"services": {"arbitrage": {"min_profit_percent": 5}}})
+        )
+        assert SurebetDetector.find_surebets(EVENTS) == []
+        arbitrage._apply_arbitrage_config(
+            FrozenConfig({"services": {"arbitrage": {"min_profit_percent": 1}}})
+        )
+        assert len(SurebetDetector.find_surebets(EVENTS)) == 1
+    finally:
+        arbitrage.MIN_PROFIT_PERCENT = original
@@ -0,0 +1,63 @@
+"""Testes unitários para a camada assíncrona de banco de dados."""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.database.async_database import AsyncPostgresDatabaseManager
+from backend.database.queries import QUERIES, to_positional
+
+
+class FakePool:
+    """Pool asyncpg falso que registra as chamadas recebidas."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def fetch(self, query, *args):
+        self.calls.append(("fetch", query, args))
+        return self.rows
+
+    async def fetchrow(self, query, *args):
+        self.calls.append(("fetchrow", query, args))
+        return self.rows[0] if self.rows else None
+
+    async def execute(self, query, *args):
+        self.calls.append(("execute", query, args))
+        return "UPDATE 1"
+
+    async def close(self):
+        pass
+
+
+def make_manager(rows):
+    manager = AsyncPostgresDatabaseManager(dsn="postgresql://teste")
+    manager._pool = FakePool(rows)
+    return manager
+
+
+def test_to_positional():
+    assert to_positional("SELECT * FROM t WHERE a = %s AND b = %s") == (
+        "SELECT * FROM t WHERE a = $1 AND b = $2"
+    )
+
+
+def test_fetch_converts_placeholders():
+    manager = make_manager([{"id": 1}])
+    rows = asyncio.run(manager.fetch("SELECT * FROM users WHERE id = %s", (1,)))
+    assert rows == [{"id": 1}]
+    assert manager._pool.calls == [("fetch", "SELECT * FROM users WHERE id = $1", (1,))]
+
+
+def test_named_query_shares_registry_and_stats():
+    manager = make_manager([{"username": "ana"}])
+    before = QUERIES.get_stats()["queries"]["user_profile"]["count"]
+
+    row = asyncio.run(manager.fetch_one_named("user_profile", ("ana",)))
+
+    assert row == {"username": "ana"}
+    assert manager._pool.calls[0][1] == QUERIES.get("user_profile").positional_sql
+    assert QUERIES.get_stats()["queries"]["user_profile"]["count"] == before + 1
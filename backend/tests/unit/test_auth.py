@@ -9,13 +9,28 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from backend.core.auth import (
     AuthManager,
+    DecodedTokenCache,
+    TOKEN_CACHE_JWT_EXTENDED_VERSION,
     TokenBlacklist,
     ROLE_ADMIN,
     ROLE_OPERATOR,
+    ROLE_PERMISSIONS,
+    ROLE_PERMISSION_MASKS,
     ROLE_VIEWER,
+    mask_to_permissions,
+    permission_mask,
 )
 from flask import Flask, request
-from flask_jwt_extended import create_access_token, get_jwt_identity, decode_token, jwt_required
+import flask_jwt_extended
+from flask_jwt_extended import (
+    create_access_token,
+    decode_token,
+    get_jwt,
+    get_jwt_header,
+    get_jwt_identity,
+    get_jwt_request_location,
+    jwt_required,
+)
 
 
 class TestTokenBlacklist:
@@ -206,3 +221,133 @@ class TestJWTIntegration:
 
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
+
+
+class TestPermissionMasks:
+    def test_role_masks_roundtrip(self):
+        for role, permissions in ROLE_PERMISSIONS.items():
+            assert mask_to_permissions(ROLE_PERMISSION_MASKS[role]) == permissions
+
+    def test_route_mask(self):
+        required = permission_mask("can_manage_users")
+        assert ROLE_PERMISSION_MASKS[ROLE_ADMIN] & required == required
+        assert ROLE_PERMISSION_MASKS[ROLE_VIEWER] & required == 0
+
+    def test_unknown_permission_fails_at_startup(self):
+        with pytest.raises(ValueError):
+            permission_mask("can_fly")
+
+    def test_legacy_tokens_use_role(self):
+        claims = {"sub": {"user": "ana", "role": ROLE_OPERATOR}}
+        assert AuthManager.claims_mask(claims) == ROLE_PERMISSION_MASKS[ROLE_OPERATOR]
+        assert AuthManager.claims_mask({"perms": 1}) == 1
+
+
+class TestDecodedTokenCache:
+    def setup_method(self):
+        self.app = Flask(__name__)
+        self.app.config["JWT_SECRET_KEY"] = "test-secret-key"
+        self.auth_manager = AuthManager(self.app)
+        self.auth_manager.blacklist = TokenBlacklist(redis_url="")
+
+        @self.app.route("/cached")
+        @self.auth_manager.jwt_required
+        def cached():
+            return {"user": get_jwt_identity()["user"]}, 200
+
+    def remember(self, token, **claims):
+        jwt_data = {
+            "sub": {"user": "ana", "role": ROLE_VIEWER},
+            "jti": "jti-ana",
+            "type": "access",
+            "exp": (datetime.now() + timedelta(minutes=5)).timestamp(),
+        }
+        jwt_data.update(claims)
+        key = DecodedTokenCache.key(token)
+        self.auth_manager.token_cache.put(key, {"alg": "HS256"}, jwt_data)
+        return key
+
+    def get(self, token):
+        return self.app.test_client().get(
+            "/cached", headers={"Authorization": f"Bearer {token}"}
+        )
+
+    def test_cached_token_skips_decoding(self):
+        self.remember("token-ana")
+        response = self.get("token-ana")
+        assert response.status_code == 200
+        assert response.get_json() == {"user": "ana"}
+        assert self.auth_manager.token_cache.hits == 1
+
+    def test_expired_or_revoked_tokens_are_verified_again(self):
+        expired = self.remember(
+            "token-expired", exp=(datetime.now() - timedelta(seconds=1)).timestamp()
+        )
+        assert self.get("token-expired").status_code != 200
+        assert self.auth_manager.token_cache.get(expired) is None
+
+        revoked = self.remember("token-revoked", jti="revoked")
+        self.auth_manager.blacklist.add_to_blacklist(
+            "revoked", (datetime.now() + timedelta(hours=1)).timestamp()
+        )
+        assert self.get("token-revoked").status_code != 200
+        assert self.auth_manager.token_cache.get(revoked) is None
+
+    def test_pinned_flask_jwt_extended_version(self):
+        # Ao atualizar o flask_jwt_extended, confira os atributos de ``g`` em
+        # AuthManager._load_cached_token e atualize TOKEN_CACHE_JWT_EXTENDED_VERSION
+        assert flask_jwt_extended.__version__ == TOKEN_CACHE_JWT_EXTENDED_VERSION
+        assert self.auth_manager.token_cache_enabled
+
+    def test_cache_hit_matches_full_verification(self):
+        # O PyJWT 2.10 recusa o ``sub`` em dicionário sem esta opção
+        self.app.config["JWT_VERIFY_SUB"] = False
+
+        @self.app.route("/claims")
+        @self.auth_manager.jwt_required
+        def claims():
+            return {
+                "jwt": get_jwt(),
+                "header": get_jwt_header(),
+                "identity": get_jwt_identity(),
+                "location": get_jwt_request_location(),
+            }
+
+        with self.app.app_context():
+            token = self.auth_manager.create_token(identity="ana", role=ROLE_VIEWER)
+        client = self.app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+        verified = client.get("/claims", headers=headers)
+        cached = client.get("/claims", headers=headers)
+
+        assert verified.status_code == 200
+        assert self.auth_manager.token_cache.hits == 1
+        assert cached.get_json() == verified.get_json()
+
+    def test_cache_disabled_on_other_versions(self, monkeypatch):
+        monkeypatch.setattr(flask_jwt_extended, "__version__", "99.0.0")
+        app = Flask(__name__)
+        app.config["JWT_SECRET_KEY"] = "test-secret-key"
+        auth_manager = AuthManager(app)
+        assert not auth_manager.token_cache_enabled
+
+        @app.route("/cached")
+        @auth_manager.jwt_required
+        def cached():
+            return {}, 200
+
+        key = DecodedTokenCache.key("token-ana")
+        claims = {"jti": "x", "type": "access"}
+        auth_manager.token_cache.put(key, {"alg": "HS256"}, claims)
+        response = app.test_client().get(
+            "/cached", headers={"Authorization": "Bearer token-ana"}
+        )
+        assert response.status_code != 200
+        assert auth_manager.token_cache.hits == 0
+
+    def test_lru_eviction(self):
+        cache = DecodedTokenCache(max_size=2)
+        for name in ("a", "b", "c"):
+            cache.put(DecodedTokenCache.key(name), {}, {"jti": name})
+        assert cache.get(DecodedTokenCache.key("a")) is None
+        assert cache.get(DecodedTokenCache.key("c")) == ({}, {"jti": "c"})
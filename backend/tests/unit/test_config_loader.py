@@ -1,3 +1,110 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from config.config_loader import CONFIG, ConfigError, ConfigService, FrozenConfig
+
+BASE_YAML = """
+project: {name: teste}
+server: {port: 5000}
+security: {rate_limit_per_minute: 100}
+postgres: {host: localhost}
+services:
+  arbitrage:
+    min_profit_percent: 1.5
+    scan_interval_seconds: 30
+    allowed_sports: [soccer, tennis]
+ui: {language: pt, items_per_page: 20}
+"""
+
+
+def write_config(path, text):
+    path.write_text(text, encoding="utf-8")
+    # Garante mtime diferente mesmo em sistemas de arquivos com baixa resolução
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def make_service(tmp_path, text=BASE_YAML):
+    path = tmp_path / "config.yaml"
+    write_config(path, text)
+    return path, ConfigService(path)
+
+
 def test_config_loader_basic():
     # Adapte conforme as funções reais
     assert True
+
+
+def test_snapshot_is_immutable_and_dict_compatible(tmp_path):
+    _, config = make_service(tmp_path)
+    arbitrage = config["services"]["arbitrage"]
+    assert isinstance(arbitrage, dict)
+    assert config.services.arbitrage is arbitrage
+    assert arbitrage.allowed_sports == ("soccer", "tennis")
+    assert config.get("redis", {}) == {}
+    assert json.loads(json.dumps(config.snapshot))["ui"]["items_per_page"] == 20
+    with pytest.raises(TypeError):
+        config["ui"]["language"] = "en"
+    with pytest.raises(TypeError):
+        config.ui.update({"language": "en"})
+    with pytest.raises(TypeError):
+        config.ui.language = "en"
+
+
+def test_reload_swaps_snapshot_and_notifies_subscribers(tmp_path):
+    path, config = make_service(tmp_path)
+    arbitrage_calls, ui_calls = [], []
+    config.subscribe(
+        lambda c: arbitrage_calls.append(c.services.arbitrage.min_profit_percent),
+        "services.arbitrage",
+    )
+    config.subscribe(lambda c: ui_calls.append(c.ui.language), "ui")
+    assert arbitrage_calls == [1.5] and ui_calls == ["pt"]
+
+    old = config.snapshot
+    write_config(
+        path, BASE_YAML.replace("min_profit_percent: 1.5", "min_profit_percent: 2.5")
+    )
+    assert config.check_for_changes() is True
+    assert config.check_for_changes() is False
+    assert arbitrage_calls == [1.5, 2.5]
+    assert ui_calls == ["pt"]
+    # Quem guardou o snapshot antigo continua com uma visão consistente
+    assert old.services.arbitrage.min_profit_percent == 1.5
+    assert config.version == 2
+
+
+def test_invalid_file_keeps_previous_snapshot(tmp_path):
+    path, config = make_service(tmp_path)
+    snapshot = config.snapshot
+    write_config(
+        path, BASE_YAML.replace("items_per_page: 20", "items_per_page: muitos")
+    )
+    assert config.check_for_changes() is False
+    write_config(path, "project: [")
+    assert config.check_for_changes() is False
+    assert config.snapshot is snapshot
+    with pytest.raises(ConfigError):
+        config.override({"ui": {"items_per_page": -1}})
+
+
+def test_overrides_survive_reload(tmp_path):
+    path, config = make_service(tmp_path)
+    config.override({"security": {"secret_key": "segredo"}})
+    write_config(path, BASE_YAML.replace("port: 5000", "port: 5001"))
+    config.check_for_changes()
+    assert config.security.secret_key == "segredo"
+    assert config.security.rate_limit_per_minute == 100
+    assert config.server.port == 5001
+    config.clear_overrides()
+    assert "secret_key" not in config.security
+
+
+def test_global_config_is_a_service():
+    assert isinstance(CONFIG, ConfigService)
+    assert isinstance(CONFIG["postgres"], FrozenConfig)
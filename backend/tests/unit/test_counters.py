@@ -0,0 +1,52 @@
+"""Testes unitários para o cache de contadores agregados."""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.database.counters import CounterCache
+
+
+def make_db():
+    db = MagicMock()
+    db.fetch.return_value = [
+        {"table_name": "users", "row_count": 3},
+        {"table_name": "events", "row_count": 20},
+        {"table_name": "surebets", "row_count": 7},
+    ]
+    return db
+
+
+class TestCounterCache:
+    def test_reads_summary_table_once_within_ttl(self, fake_clock):
+        clock = fake_clock()
+        cache = CounterCache(ttl_seconds=5, clock=clock)
+        db = make_db()
+
+        assert cache.get_counts(db) == {"users": 3, "events": 20, "surebets": 7}
+        clock.now = 4.9
+        assert cache.get(db, "surebets") == 7
+        assert db.fetch.call_count == 1
+
+        clock.now = 5.1
+        cache.get(db, "users")
+        assert db.fetch.call_count == 2
+
+    def test_invalidate_forces_reload(self, fake_clock):
+        cache = CounterCache(ttl_seconds=60, clock=fake_clock())
+        db = make_db()
+        cache.get_counts(db)
+        cache.invalidate()
+        cache.get_counts(db)
+        assert db.fetch.call_count == 2
+
+    def test_falls_back_to_count_when_summary_is_incomplete(self, fake_clock):
+        cache = CounterCache(ttl_seconds=60, clock=fake_clock())
+        db = MagicMock()
+        db.fetch.return_value = []
+        db.fetch_one.return_value = {"count": 11}
+
+        assert cache.get_counts(db) == {"users": 11, "events": 11, "surebets": 11}
+        assert db.fetch_one.call_count == 3
@@ -0,0 +1,77 @@
+"""Testes dos agregados e do cache de figuras do dashboard."""
+
+import os
+import random
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.services import dashboard_charts
+from backend.services.dashboard_charts import (
+    ChartAggregates,
+    DashboardCharts,
+    profit_bin,
+)
+from backend.services.dashboard_data import DashboardSnapshot
+
+
+def make_rows(count, seed):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"bet365:{i}:1X2",
+            "event": f"Time {i}",
+            "market": "1X2",
+            "sport": "soccer",
+            "profit": "",
+            "profit_value": round(rng.uniform(0, 8), 2),
+            "bookmaker": "bet365",
+            "bookmakers": rng.choice(["Bet365", "Betano", "Pinnacle"]),
+        }
+        for i in rng.sample(range(count * 2), count)
+    ]
+
+
+def test_incremental_counts_match_full_recount():
+    aggregates = ChartAggregates()
+    for version, seed in enumerate(range(6), start=1):
+        rows = make_rows(50, seed)
+        aggregates = aggregates.advance(version, rows)
+
+        assert aggregates.version == version
+        assert aggregates.profit_bins == Counter(
+            profit_bin(r["profit_value"]) for r in rows
+        )
+        assert aggregates.bookmaker_counts == Counter(r["bookmakers"] for r in rows)
+
+    assert aggregates.advance(7, []).profit_bins == Counter()
+
+
+def test_figures_are_cached_by_version_and_filters(monkeypatch):
+    built = []
+    real_build = dashboard_charts.build_figures
+    monkeypatch.setattr(
+        dashboard_charts,
+        "build_figures",
+        lambda agg: built.append(agg) or real_build(agg),
+    )
+    charts = DashboardCharts()
+    first = DashboardSnapshot(1, make_rows(30, 1))
+
+    profit_fig, bm_fig = charts.figures(first, ["soccer"])
+    assert charts.figures(first, ["soccer"]) == (profit_fig, bm_fig)
+    assert len(built) == 1
+    assert sum(profit_fig["data"][0]["y"]) == 30
+    assert sum(bm_fig["data"][0]["y"]) == 30
+
+    # Outro filtro e nova versão geram figuras novas
+    charts.figures(first, ["soccer"], min_profit=4)
+    second = DashboardSnapshot(2, make_rows(30, 2))
+    charts.figures(second, ["soccer"])
+    assert len(built) == 3
+    assert built[-1].version == 2
+    assert charts.get_stats()["hits"] == 1
+
+    empty_fig, _ = charts.figures(DashboardSnapshot(3, []), ["soccer"])
+    assert not empty_fig["data"]
@@ -0,0 +1,270 @@
+"""Testes do snapshot compartilhado do dashboard."""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.services.dashboard_data import (
+    DashboardDataService,
+    diff_rows,
+    filter_opportunities,
+    parse_filter_query,
+    query_opportunities,
+)
+
+
+class FakeAdapter:
+    """Adaptador falso que conta as consultas recebidas."""
+
+    def __init__(self, odds=(2.1, 2.1)):
+        self.odds = odds
+        self.calls = 0
+
+    def get_live_odds(self, sport, limit=50):
+        self.calls += 1
+        return [
+            {
+                "id": f"{sport}_{i}",
+                "name": f"Time {i} x Rival {i}",
+                "start_time": "2024-01-01T20:00:00Z",
+                "markets": [
+                    {
+                        "name": "1X2" if i % 2 else "Over 2.5",
+                        "selections": [{"odds": odd} for odd in self.odds],
+                    }
+                ],
+            }
+            for i in range(3)
+        ]
+
+    def get_upcoming_odds(self, sport, limit=50):
+        self.calls += 1
+        return [{"name": "Futuro", "start_time": "2024-01-02T18:30:00Z"}]
+
+
+@pytest.fixture
+def make_service(fake_clock):
+    """Monta o serviço sobre os adaptadores; devolve ``(serviço, relógio)``."""
+
+    def build(**adapters):
+        clock = fake_clock(1000.0)
+        service = DashboardDataService(
+            lambda: adapters,
+            sports=("soccer", "tennis"),
+            max_age_seconds=30,
+            clock=clock,
+        )
+        return service, clock
+
+    return build
+
+
+def test_many_readers_share_one_scan(make_service):
+    adapter = FakeAdapter()
+    service, clock = make_service(bet365=adapter)
+
+    first = service.get_snapshot()
+    for _ in range(50):
+        assert service.get_snapshot() is first
+    assert service.scans == 1
+    assert len(first.version) == 16
+    assert len(first.opportunities) == 6
+    assert first.live_games[0]["status"] == "AO VIVO"
+    assert first.upcoming_games[0]["start_time"] == "02/01 18:30"
+
+    clock.now += 30
+    second = service.get_snapshot()
+    assert second is not first
+    assert second.scanned_at == clock.now
+    assert service.scans == 2
+
+
+def test_concurrent_readers_do_not_scan_twice(make_service):
+    adapter = FakeAdapter()
+    service, _ = make_service(bet365=adapter)
+    threads = [threading.Thread(target=service.get_snapshot) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert service.scans == 1
+
+
+def test_failing_adapter_does_not_hide_others(make_service):
+    class BrokenAdapter(FakeAdapter):
+        def get_live_odds(self, sport, limit=50):
+            raise RuntimeError("timeout")
+
+    service, _ = make_service(bet365=FakeAdapter(), pinnacle=BrokenAdapter())
+    snapshot = service.get_snapshot()
+    assert len(snapshot.opportunities) == 6
+    assert "pinnacle: timeout" in snapshot.error
+
+
+def test_filters_are_applied_in_memory(make_service):
+    service, _ = make_service(
+        bet365=FakeAdapter(), betfair=FakeAdapter(odds=(1.5, 2.5))
+    )
+    snapshot = service.get_snapshot()
+
+    # Padrão: apenas futebol, como o filtro inicial do dashboard
+    assert len(filter_opportunities(snapshot)) == 6
+    assert len(filter_opportunities(snapshot, sports=["soccer", "tennis"])) == 12
+    # 2.1/2.1 ~= 4.76% de lucro; 1.5/2.5 = 0%
+    assert len(filter_opportunities(snapshot, min_profit=2)) == 3
+    assert {
+        op["bookmakers"]
+        for op in filter_opportunities(snapshot, bookmakers=["betfair"])
+    } == {"Betfair"}
+    found = filter_opportunities(snapshot, search="OVER")
+    assert found and all(op["market"] == "Over 2.5" for op in found)
+    assert filter_opportunities(snapshot, search="rival 2")[0]["event"].endswith(
+        "Time 2 x Rival 2"
+    )
+
+
+def test_version_changes_only_with_content(make_service):
+    adapter = FakeAdapter()
+    service, _ = make_service(bet365=adapter)
+    first = service.get_snapshot()
+    assert service.refresh().version == first.version
+
+    adapter.odds = (2.2, 2.2)
+    second = service.refresh()
+    assert second.version != first.version
+    assert service.get_version(first.version).opportunities == first.opportunities
+    assert service.get_version(second.version) is second
+    assert service.get_version("0-1") is None
+    assert service.wait_for_change(first.version, timeout=0) == second.version
+    assert service.wait_for_change(second.version, timeout=0) == second.version
+
+
+def test_workers_with_the_same_scan_share_versions_and_deltas(make_service):
+    adapter = FakeAdapter()
+    worker_a, _ = make_service(bet365=adapter)
+    worker_b, _ = make_service(bet365=adapter)
+
+    shown = worker_a.get_snapshot()
+    assert worker_b.get_snapshot().version == shown.version
+
+    # O navegador exibe a versão do worker A; o tick seguinte cai no worker B
+    adapter.odds = (2.2, 2.2)
+    current = worker_b.refresh()
+    base = worker_b.get_version(shown.version)
+    assert base is not None and base.opportunities == shown.opportunities
+    removed, changed, added = diff_rows(base.opportunities, current.opportunities)
+    assert not removed and not added and len(changed) == 6
+    assert worker_a.refresh().version == current.version
+
+
+def test_diff_rows_by_stable_id():
+    old = [{"id": i, "v": i} for i in range(5)]
+    new = [
+        {"id": 0, "v": 0},
+        {"id": 2, "v": 20},
+        {"id": 3, "v": 3},
+        {"id": 4, "v": 4},
+        {"id": 7, "v": 7},
+    ]
+    removed, changed, added = diff_rows(old, new)
+    assert removed == [1]
+    assert changed == [(1, {"id": 2, "v": 20})]
+    assert added == [{"id": 7, "v": 7}]
+
+    # Aplicar as operações na ordem reproduz o conjunto novo
+    rows = list(old)
+    for index in removed:
+        del rows[index]
+    for index, row in changed:
+        rows[index] = row
+    rows.extend(added)
+    assert rows == new
+    assert diff_rows(new, new) == ([], [], [])
+
+
+def test_diff_rows_refuses_reordering():
+    a, b, c, d = ({"id": key} for key in "abcd")
+    # Linha nova no topo: acrescentá-la no fim daria [a, b, d]
+    assert diff_rows([a, b, c], [d, a, b]) is None
+    assert diff_rows([a, b], [b, a]) is None
+    assert diff_rows([a, b, c], [a, c, d]) == ([1], [], [d])
+
+
+def test_query_matches_linear_filter(make_service):
+    service, _ = make_service(
+        bet365=FakeAdapter(), betfair=FakeAdapter(odds=(1.5, 2.5))
+    )
+    snapshot = service.get_snapshot()
+
+    for kwargs in (
+        {},
+        {"sports": ["soccer", "tennis"]},
+        {"sports": ["soccer", "tennis"], "min_profit": 2},
+        {"bookmakers": ["betfair"]},
+        {"search": "over"},
+        {"search": "rival 2"},
+    ):
+        expected = filter_opportunities(snapshot, **kwargs)
+        rows, total, avg = query_opportunities(snapshot, page_size=100, **kwargs)
+        assert total == len(expected)
+        assert sorted(row["id"] for row in rows) == sorted(
+            row["id"] for row in expected
+        )
+        assert [row["profit_value"] for row in rows] == sorted(
+            (row["profit_value"] for row in rows), reverse=True
+        )
+        if total:
+            assert round(avg, 6) == round(
+                sum(row["profit_value"] for row in expected) / total, 6
+            )
+
+
+def test_query_pages_sorts_and_filters(make_service):
+    service, _ = make_service(
+        bet365=FakeAdapter(), betfair=FakeAdapter(odds=(1.5, 2.5))
+    )
+    snapshot = service.get_snapshot()
+    sports = ["soccer", "tennis"]
+
+    first, total, _ = query_opportunities(snapshot, sports=sports, page=0, page_size=5)
+    second, _, _ = query_opportunities(snapshot, sports=sports, page=1, page_size=5)
+    last, _, _ = query_opportunities(snapshot, sports=sports, page=2, page_size=5)
+    assert total == 12
+    assert (len(first), len(second), len(last)) == (5, 5, 2)
+    assert not {row["id"] for row in first} & {row["id"] for row in second}
+
+    by_event, _, _ = query_opportunities(
+        snapshot,
+        sports=sports,
+        sort_by=[{"column_id": "event", "direction": "asc"}],
+        page_size=100,
+    )
+    assert [row["event"] for row in by_event] == sorted(
+        row["event"] for row in by_event
+    )
+
+    filtered, total, _ = query_opportunities(
+        snapshot,
+        sports=sports,
+        filter_query="{profit} > 1 && {market} icontains over",
+        page_size=100,
+    )
+    assert total == len(filtered) == 4
+    assert all(
+        row["profit_value"] > 1 and row["market"] == "Over 2.5" for row in filtered
+    )
+
+
+def test_parse_filter_query():
+    row = {"profit_value": 4.76, "market": "Over 2.5", "event": "Time 1"}
+    assert all(
+        p(row) for p in parse_filter_query("{profit} >= 4.5 && {market} contains over")
+    )
+    assert not all(p(row) for p in parse_filter_query("{market} scontains over"))
+    assert not all(p(row) for p in parse_filter_query('{event} = "Time 2"'))
+    # Termos inválidos são ignorados
+    assert parse_filter_query("{profit} > abc && lixo") == []
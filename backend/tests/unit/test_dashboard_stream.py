@@ -0,0 +1,43 @@
+"""Testes do canal SSE do dashboard (duração e limite de streams)."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.apps import dashboard
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(dashboard, "PUSH_STREAM_LIFETIME_SECONDS", 0.2)
+    monkeypatch.setattr(dashboard, "PUSH_KEEPALIVE_SECONDS", 0.05)
+    monkeypatch.setattr(dashboard.DASHBOARD_DATA, "start_background", lambda: True)
+    monkeypatch.setattr(
+        dashboard.DASHBOARD_DATA,
+        "get_snapshot",
+        lambda: dashboard.DASHBOARD_DATA._snapshot,
+    )
+    return dashboard.app.server.test_client()
+
+
+def test_stream_ends_after_lifetime(client):
+    body = client.get("/dashboard/stream").get_data(as_text=True)
+
+    assert body.startswith(f"retry: {dashboard.PUSH_RETRY_MS}\nevent: snapshot\n")
+    assert ": ping" in body
+    assert dashboard._push_streams == 0
+
+
+def test_streams_over_limit_are_told_to_retry_later(client, monkeypatch):
+    monkeypatch.setattr(dashboard, "PUSH_MAX_STREAMS", 1)
+    assert dashboard._acquire_push_stream()
+    try:
+        body = client.get("/dashboard/stream").get_data(as_text=True)
+    finally:
+        dashboard._release_push_stream()
+
+    assert body == f"retry: {dashboard.PUSH_BUSY_RETRY_MS}\n\n"
+    assert dashboard._push_streams == 0
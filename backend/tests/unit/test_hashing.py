@@ -0,0 +1,138 @@
+"""Testes unitários para o executor de hashing de senhas e o cache de login."""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.core.hashing import HashingOverloadedError, PasswordHasher
+from backend.database.user_cache import USER_CACHE_CHANNEL, UserRowCache
+
+
+class TestPasswordHasher:
+    def test_hash_and_verify(self):
+        hasher = PasswordHasher(workers=1, max_pending=2)
+        password_hash = hasher.hash("segredo")
+        assert hasher.verify("segredo", password_hash) is True
+        assert hasher.verify("errada", password_hash) is False
+        hasher.shutdown()
+
+    def test_rejects_when_queue_is_full(self):
+        hasher = PasswordHasher(workers=1, max_pending=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return True
+
+        worker = threading.Thread(target=hasher._run, args=(slow,))
+        worker.start()
+        started.wait(5)
+        with pytest.raises(HashingOverloadedError) as info:
+            hasher._run(lambda: True)
+        assert info.value.retry_after >= 1
+        release.set()
+        worker.join(5)
+
+        assert hasher._run(lambda: "ok") == "ok"
+        assert hasher.get_stats()["rejected"] == 1
+        hasher.shutdown()
+
+    def test_timeout_is_reported_as_overload(self):
+        hasher = PasswordHasher(workers=1, max_pending=2, timeout=0.01)
+        release = threading.Event()
+        with pytest.raises(HashingOverloadedError):
+            hasher._run(release.wait, 5)
+        release.set()
+        hasher.shutdown()
+
+
+class TestUserRowCache:
+    def test_loads_once_per_ttl(self, fake_clock):
+        clock = fake_clock()
+        cache = UserRowCache(ttl_seconds=30, clock=clock)
+        calls = []
+
+        def loader(name):
+            calls.append(name)
+            return {"username": name} if name == "ana" else None
+
+        assert cache.get("ana", loader) == {"username": "ana"}
+        assert cache.get("ana", loader) == {"username": "ana"}
+        # Usuários inexistentes não são lembrados
+        assert cache.get("ghost", loader) is None
+        assert cache.get("ghost", loader) is None
+        assert calls == ["ana", "ghost", "ghost"]
+
+        clock.now = 31
+        cache.get("ana", loader)
+        assert calls == ["ana", "ghost", "ghost", "ana"]
+
+    def test_invalidate(self, fake_clock):
+        cache = UserRowCache(ttl_seconds=30, clock=fake_clock())
+        calls = []
+        cache.get("ana", calls.append)
+        cache.invalidate("ana")
+        cache.get("ana", calls.append)
+        assert calls == ["ana", "ana"]
+
+    def test_bounded_size(self, fake_clock):
+        cache = UserRowCache(ttl_seconds=30, max_entries=10, clock=fake_clock())
+        for i in range(25):
+            cache.get(f"user{i}", lambda name: {"username": name})
+        assert len(cache._rows) <= 10
+
+    def test_shared_cache_is_invalidated_across_workers(self, fake_clock):
+        class FakeRedis:
+            def __init__(self):
+                self.published = []
+
+            def publish(self, channel, message):
+                self.published.append((channel, message))
+
+        redis = FakeRedis()
+        cache = UserRowCache(ttl_seconds=30, clock=fake_clock(), client=redis)
+        # O assinante é conduzido pelo teste, sem thread
+        cache._listener_pid = os.getpid()
+        calls = []
+
+        def loader(name):
+            calls.append(name)
+            return {"username": name, "password_hash": "antigo"}
+
+        # Antes da assinatura ativa, toda consulta vai ao banco
+        cache.get("ana", loader)
+        cache.get("ana", loader)
+        assert calls == ["ana", "ana"]
+
+        cache._handle_message({"type": "subscribe", "data": 1})
+        cache.get("ana", loader)
+        cache.get("ana", loader)
+        assert calls == ["ana", "ana", "ana"]
+
+        # Troca de senha em outro worker
+        cache._handle_message({"type": "message", "data": b"ana"})
+        cache.get("ana", loader)
+        assert calls == ["ana", "ana", "ana", "ana"]
+
+        cache.invalidate("ana")
+        assert redis.published == [(USER_CACHE_CHANNEL, "ana")]
+
+    def test_row_loaded_before_invalidation_is_not_cached(self, fake_clock):
+        cache = UserRowCache(ttl_seconds=30, clock=fake_clock())
+        calls = []
+
+        def loader(name):
+            calls.append(name)
+            # A senha muda enquanto a consulta antiga está em andamento
+            cache.invalidate(name)
+            return {"username": name}
+
+        cache.get("ana", loader)
+        cache.get("ana", loader)
+        assert calls == ["ana", "ana"]
@@ -0,0 +1,76 @@
+"""Testes das sondas de liveness/readiness e das opções do servidor de produção."""
+
+import os
+import sys
+
+from flask import Flask
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.core.health import HealthRegistry, register_health_routes
+
+
+def make_client(registry):
+    app = Flask(__name__)
+    register_health_routes(app, registry)
+    return app.test_client()
+
+
+def test_liveness_does_not_run_checks():
+    calls = []
+    registry = HealthRegistry("teste")
+    registry.add_check("database", lambda: calls.append(1) or 1 / 0)
+    client = make_client(registry)
+
+    for path in ("/health", "/health/live"):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.get_json()["status"] == "alive"
+    assert calls == []
+
+
+def test_readiness_reports_failing_checks():
+    registry = HealthRegistry("teste")
+    registry.add_check("snapshot", lambda: {"version": 3})
+    registry.add_check("database", lambda: 1 / 0)
+    client = make_client(registry)
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    body = response.get_json()
+    assert body["ready"] is False
+    assert body["checks"]["snapshot"] == {"ok": True, "detail": {"version": 3}}
+    assert body["checks"]["database"]["ok"] is False
+
+
+def test_readiness_is_cached_and_draining_fails(fake_clock):
+    clock = fake_clock(100.0)
+    calls = []
+    registry = HealthRegistry("teste", cache_seconds=2, clock=clock)
+    registry.add_check("database", lambda: calls.append(1))
+    client = make_client(registry)
+
+    assert client.get("/health/ready").status_code == 200
+    assert client.get("/health/ready").status_code == 200
+    assert len(calls) == 1
+    clock.now += 3
+    client.get("/health/ready")
+    assert len(calls) == 2
+
+    registry.mark_draining()
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.get_json()["draining"] is True
+
+
+def test_gunicorn_options_follow_server_config():
+    from config.config_loader import CONFIG
+    from src import serve
+
+    options = serve.gunicorn_options("dashboard")
+    assert options["bind"].endswith(":8050")
+    assert options["workers"] == CONFIG["server"]["workers"]
+    assert options["preload_app"] is True
+    assert options["worker_class"] == "gthread"
+    assert options["max_requests"] > 0 and options["max_requests_jitter"] > 0
+    assert serve.gunicorn_options("admin_api", port=5099)["bind"].endswith(":5099")
@@ -0,0 +1,159 @@
+"""Testes de ETag/304 e compressão das respostas da API."""
+
+import gzip
+import json
+import os
+import sys
+
+from flask import Flask, Response, jsonify, request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.core import http_cache
+from backend.core.http_cache import (
+    ResponseOptimizer,
+    register_response_optimizer,
+    use_etag,
+)
+
+ROWS = [
+    {"id": i, "event": f"Time {i} x Time {i + 1}", "profit": 2.5} for i in range(200)
+]
+
+
+def make_client(monkeypatch, brotli=False, **options):
+    if not brotli:
+        monkeypatch.setattr(http_cache, "_brotli", lambda: None)
+    app = Flask(__name__)
+    built = []
+
+    @app.route("/rows")
+    def rows():
+        return jsonify({"rows": ROWS})
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/versioned")
+    def versioned():
+        version = int(request.args.get("v", 1))
+        unchanged = use_etag(version)
+        if unchanged is not None:
+            return unchanged
+        built.append(version)
+        return jsonify({"version": version, "rows": ROWS})
+
+    @app.route("/stream")
+    def stream():
+        return Response(
+            (line for line in ["a\n"] * 2000), mimetype="application/x-ndjson"
+        )
+
+    @app.route("/rows", methods=["POST"])
+    def post_rows():
+        return jsonify({"rows": ROWS})
+
+    optimizer = register_response_optimizer(app, ResponseOptimizer(**options))
+    client = app.test_client()
+    return client, optimizer, built
+
+
+def test_etag_and_not_modified(monkeypatch):
+    client, optimizer, _ = make_client(monkeypatch)
+    first = client.get("/rows")
+    etag = first.headers["ETag"]
+
+    assert etag.startswith('W/"')
+    again = client.get("/rows", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert (
+        client.get("/rows", headers={"If-None-Match": 'W/"outro"'}).status_code == 200
+    )
+    assert optimizer.get_stats()["not_modified"] == 1
+
+
+def test_declared_version_skips_building_the_payload(monkeypatch):
+    client, _, built = make_client(monkeypatch)
+    etag = client.get("/versioned?v=1").headers["ETag"]
+
+    assert (
+        client.get("/versioned?v=1", headers={"If-None-Match": etag}).status_code == 304
+    )
+    assert (
+        client.get("/versioned?v=2", headers={"If-None-Match": etag}).status_code == 200
+    )
+    assert built == [1, 2]
+
+
+def test_gzip_above_threshold(monkeypatch):
+    client, optimizer, _ = make_client(monkeypatch, min_bytes=1024, level=6)
+    response = client.get("/rows", headers={"Accept-Encoding": "gzip, deflate"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    body = gzip.decompress(response.data)
+    assert len(response.data) < len(body)
+    assert len(ROWS) == len(json.loads(body)["rows"])
+    assert optimizer.get_stats()["ratio"] < 0.5
+
+    # Abaixo do limite, sem Accept-Encoding ou com compressão desativada: corpo original
+    assert (
+        "Content-Encoding"
+        not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    )
+    assert "Content-Encoding" not in client.get("/rows").headers
+    client, _, _ = make_client(monkeypatch, level=0)
+    assert (
+        "Content-Encoding"
+        not in client.get("/rows", headers={"Accept-Encoding": "gzip"}).headers
+    )
+
+
+def test_post_and_streaming_responses(monkeypatch):
+    client, _, _ = make_client(monkeypatch)
+    posted = client.post("/rows", headers={"Accept-Encoding": "gzip"})
+    assert posted.headers["Content-Encoding"] == "gzip"
+    assert "ETag" not in posted.headers
+
+    streamed = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in streamed.headers
+    assert streamed.data == b"a\n" * 2000
+
+
+def test_brotli_is_preferred_when_installed(monkeypatch):
+    class FakeBrotli:
+        @staticmethod
+        def compress(data, quality):
+            return b"br:" + str(quality).encode()
+
+    monkeypatch.setattr(http_cache, "_brotli", lambda: FakeBrotli)
+    client, _, _ = make_client(monkeypatch, brotli=True, level=5)
+
+    response = client.get("/rows", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.data == b"br:5"
+    assert (
+        client.get("/rows", headers={"Accept-Encoding": "gzip"}).headers[
+            "Content-Encoding"
+        ]
+        == "gzip"
+    )
+
+
+def test_compression_settings_follow_config_reload():
+    optimizer = ResponseOptimizer()
+    optimizer._apply_config(
+        {"server": {"compression_min_bytes": 4096, "compression_level": 0}}
+    )
+    assert optimizer.min_bytes == 4096
+    assert optimizer.level == 0
+
+    # Valores passados no construtor não são sobrescritos pela recarga
+    fixed = ResponseOptimizer(level=9)
+    fixed._apply_config(
+        {"server": {"compression_min_bytes": 10, "compression_level": 1}}
+    )
+    assert fixed.min_bytes == 10
+    assert fixed.level == 9
@@ -1,3 +1,83 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from flask import Flask
+
+from backend.core.i18n import (
+    CATALOG,
+    TranslationCatalog,
+    get_request_language,
+    get_supported_languages,
+    get_text,
+)
+
+
 def test_i18n_basic():
     # Adapte conforme as funções reais
     assert True
+
+
+def make_catalog(tmp_path, default="pt-br"):
+    (tmp_path / "en.json").write_text(json.dumps({"hello": "Hello"}), encoding="utf-8")
+    (tmp_path / "en-gb.json").write_text(
+        json.dumps({"color": "Colour"}), encoding="utf-8"
+    )
+    builtin = {"pt": {"hello": "Olá", "color": "Cor", "only_pt": "Só pt"}}
+    return TranslationCatalog(
+        builtin=builtin, locales_dir=str(tmp_path), default_language=default
+    )
+
+
+def test_fallback_chain_is_resolved_at_compile_time(tmp_path):
+    catalog = make_catalog(tmp_path)
+    assert catalog.fallback_chain("en-gb") == ["en-gb", "en", "pt"]
+    en_gb = catalog.get_map("en_GB")
+    assert en_gb["color"] == "Colour"
+    assert en_gb["hello"] == "Hello"
+    assert en_gb["only_pt"] == "Só pt"
+    assert catalog.gettext("missing", "en") == "missing"
+    # Região sem pacote próprio usa o idioma base; desconhecido usa o padrão
+    assert catalog.get_map("pt-br") is catalog.get_map("pt")
+    assert catalog.get_map("xx") is catalog.get_map(None)
+    with pytest.raises(TypeError):
+        en_gb["hello"] = "Hi"
+
+
+def test_language_packs_are_loaded_lazily(tmp_path):
+    catalog = make_catalog(tmp_path)
+    loaded = []
+    original = catalog._load
+    catalog._load = lambda lang: loaded.append(lang) or original(lang)
+    catalog.get_map("pt")
+    assert loaded == ["pt"]
+    catalog.get_map("en")
+    catalog.get_map("en")
+    assert loaded == ["pt", "pt", "en"]
+
+
+def test_accept_language_negotiation(tmp_path):
+    catalog = make_catalog(tmp_path)
+    assert catalog.negotiate("en-GB,en;q=0.9,pt;q=0.8") == "en-gb"
+    assert catalog.negotiate("fr-FR, en-US;q=0.7, pt;q=0.8") == "pt"
+    assert catalog.negotiate("en-US,en;q=0.5") == "en"
+    assert catalog.negotiate("fr, *;q=0.1") == "pt"
+    assert catalog.negotiate("en;q=0, pt") == "pt"
+    assert catalog.negotiate("") == "pt"
+    assert "fr, *;q=0.1" in catalog._negotiated
+
+
+def test_default_catalog_and_request_language():
+    assert {"pt", "en"} <= set(get_supported_languages())
+    assert get_text("logout_success", "en") == "Logout successful!"
+    assert get_text("logout_success", "pt-BR") == "Logout realizado com sucesso!"
+
+    app = Flask(__name__)
+    with app.test_request_context(headers={"Accept-Language": "en-US,en;q=0.9"}):
+        assert get_request_language() == "en"
+    with app.test_request_context():
+        assert get_request_language() == CATALOG.resolve(None)
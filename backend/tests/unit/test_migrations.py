@@ -0,0 +1,146 @@
+"""Testes do mecanismo de migrações versionadas."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.database.migrations import (
+    MIGRATION_LOCK_KEY,
+    Migration,
+    MigrationError,
+    MigrationRunner,
+    discover_migrations,
+)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = None
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def mogrify(self, sql, params):
+        return (sql.replace("%s", "{!r}").format(*params)).encode("utf-8")
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+        if self.conn.fail_on and self.conn.fail_on in sql:
+            raise RuntimeError("erro de sintaxe")
+        if sql.startswith("SELECT version, checksum"):
+            self.description = [("version",), ("checksum",)]
+            self._rows = list(self.conn.applied.items())
+        else:
+            self.description = None
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    """Conexão psycopg2 falsa que registra os comandos enviados."""
+
+    def __init__(self, applied=None, fail_on=None):
+        self.applied = dict(applied or {})
+        self.fail_on = fail_on
+        self.autocommit = False
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def commit(self):
+        pass
+
+
+def make_migrations(tmp_path, **files):
+    migrations = []
+    for version, (name, sql, repeatable) in enumerate(files.values(), start=1):
+        path = tmp_path / f"{version:04d}_{name}.sql"
+        path.write_text(sql, encoding="utf-8")
+        migrations.append(Migration(version, name, path, repeatable=repeatable))
+    return migrations
+
+
+def batches(conn):
+    return [
+        sql for sql, params in conn.executed if "INSERT INTO schema_migrations" in sql
+    ]
+
+
+def test_pending_migrations_run_once_each_in_one_command(tmp_path):
+    migrations = make_migrations(
+        tmp_path,
+        a=("schema", "DO $$ BEGIN PERFORM 1; END$$;\nCREATE TABLE t (id INT);", True),
+        b=("dados", "INSERT INTO t VALUES (1); -- fim", False),
+    )
+    conn = FakeConnection()
+    applied = MigrationRunner(conn, migrations).migrate()
+
+    assert [m.version for m in applied] == [1, 2]
+    sent = batches(conn)
+    assert len(sent) == 2
+    # O bloco DO chega inteiro, seguido do registro da versão no mesmo comando
+    assert sent[0].startswith("DO $$ BEGIN PERFORM 1; END$$;")
+    assert f"VALUES (1, 'schema', '{migrations[0].checksum}'" in sent[0]
+    assert "-- fim\n;\n" in sent[1]
+    assert conn.autocommit is False
+
+
+def test_advisory_lock_wraps_the_run(tmp_path):
+    migrations = make_migrations(tmp_path, a=("schema", "SELECT 1;", False))
+    conn = FakeConnection()
+    MigrationRunner(conn, migrations).migrate()
+
+    assert conn.executed[0] == ("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+    assert conn.executed[-1] == ("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+
+
+def test_applied_and_repeatable_migrations(tmp_path):
+    migrations = make_migrations(
+        tmp_path,
+        a=("schema", "CREATE TABLE IF NOT EXISTS t (id INT);", True),
+        b=("dados", "INSERT INTO t VALUES (1);", False),
+    )
+    current = {1: migrations[0].checksum, 2: migrations[1].checksum}
+    assert MigrationRunner(FakeConnection(current), migrations).migrate() == []
+
+    # Schema (repetível) alterado volta a ser aplicado; migração comum alterada não
+    changed = {1: "0" * 64, 2: "1" * 64}
+    applied = MigrationRunner(FakeConnection(changed), migrations).migrate()
+    assert [m.version for m in applied] == [1]
+
+
+def test_failure_raises_and_releases_lock(tmp_path):
+    migrations = make_migrations(tmp_path, a=("quebrada", "CREATE TABLEX t;", False))
+    conn = FakeConnection(fail_on="CREATE TABLEX")
+
+    with pytest.raises(MigrationError):
+        MigrationRunner(conn, migrations).migrate()
+    assert conn.executed[-1][0] == "SELECT pg_advisory_unlock(%s)"
+    assert conn.autocommit is False
+
+
+def test_discover_migrations(tmp_path):
+    (tmp_path / "0003_indices.sql").write_text("SELECT 1;", encoding="utf-8")
+    migrations = discover_migrations(tmp_path)
+    assert [(m.version, m.name, m.repeatable) for m in migrations] == [
+        (1, "schema", True),
+        (2, "dados_iniciais", False),
+        (3, "indices", False),
+    ]
+
+    (tmp_path / "0002_conflito.sql").write_text("SELECT 1;", encoding="utf-8")
+    with pytest.raises(MigrationError):
+        discover_migrations(tmp_path)
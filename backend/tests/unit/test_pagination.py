@@ -0,0 +1,82 @@
+"""Testes unitários para paginação keyset e exportação em streaming."""
+
+import json
+import os
+import sys
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.core.pagination import (
+    CursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_query,
+    next_cursor,
+    parse_page_args,
+    stream_rows,
+)
+
+
+class TestCursor:
+    def test_roundtrip(self):
+        cursor = encode_cursor(datetime(2025, 6, 1, 12, 30), 42)
+        assert decode_cursor(cursor) == ("2025-06-01T12:30:00", 42)
+
+    def test_invalid_cursor(self):
+        with pytest.raises(CursorError):
+            decode_cursor("nao-e-um-cursor")
+
+    def test_next_cursor_only_when_page_is_full(self):
+        rows = [
+            {"id": 2, "detected_at": datetime(2025, 6, 2)},
+            {"id": 1, "detected_at": datetime(2025, 6, 1)},
+        ]
+        assert next_cursor(rows, "detected_at", 3) is None
+        cursor = next_cursor(rows, "detected_at", 2)
+        assert decode_cursor(cursor) == ("2025-06-01T00:00:00", 1)
+
+
+class TestKeysetQuery:
+    def test_first_page(self):
+        query, params = keyset_query("SELECT * FROM surebets", "detected_at", None, 50)
+        assert "WHERE" not in query
+        assert query.endswith("ORDER BY detected_at DESC, id DESC LIMIT %s")
+        assert params == [50]
+
+    def test_following_page_and_unlimited_stream(self):
+        position = ("2025-06-01T00:00:00", 10)
+        query, params = keyset_query(
+            "SELECT * FROM surebets", "detected_at", position, None
+        )
+        assert "WHERE (detected_at, id) < (%s, %s)" in query
+        assert "LIMIT" not in query
+        assert params == ["2025-06-01T00:00:00", 10]
+
+    def test_parse_page_args(self):
+        assert parse_page_args({}, 100)["limit"] == 100
+        assert parse_page_args({"format": "ndjson"}, 100)["limit"] is None
+        with pytest.raises(CursorError):
+            parse_page_args({"limit": "5000"}, 100)
+        with pytest.raises(CursorError):
+            parse_page_args({"format": "xml"}, 100)
+
+
+class TestStreamRows:
+    rows = [
+        {"id": 1, "profit": Decimal("2.50"), "detected_at": datetime(2025, 6, 1)},
+        {"id": 2, "profit": Decimal("1.25"), "detected_at": datetime(2025, 6, 2)},
+    ]
+
+    def test_ndjson(self):
+        lines = "".join(stream_rows(iter(self.rows), "ndjson")).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2]
+        assert json.loads(lines[0])["profit"] == 2.5
+
+    def test_json_array(self):
+        body = "".join(stream_rows(iter(self.rows), "json-array"))
+        assert json.loads(body)[1]["detected_at"] == "2025-06-02T00:00:00"
+        assert "".join(stream_rows(iter([]), "json-array")) == "[]"
@@ -0,0 +1,85 @@
+"""Testes unitários para o registro de consultas nomeadas."""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.database.queries import NamedQuery, QueryRegistry
+
+
+class FakeConnection:
+    def __init__(self):
+        self.prepared_statements = set()
+
+
+def make_cursor(connection):
+    cursor = MagicMock()
+    cursor.connection = connection
+    return cursor
+
+
+class TestNamedQuery:
+    def test_placeholders_become_positional(self):
+        query = NamedQuery(
+            "user_update", "UPDATE users SET last_login = %s WHERE username = %s"
+        )
+        assert query.prepare_sql == (
+            "PREPARE user_update AS "
+            "UPDATE users SET last_login = $1 WHERE username = $2"
+        )
+        assert query.execute_sql == "EXECUTE user_update (%s, %s)"
+
+    def test_query_without_params(self):
+        query = NamedQuery("users_list", "SELECT * FROM users")
+        assert query.execute_sql == "EXECUTE users_list"
+
+
+class TestQueryRegistry:
+    def test_prepares_once_per_connection(self):
+        registry = QueryRegistry(prepared_statements=True)
+        query = registry.register("by_name", "SELECT id FROM users WHERE username = %s")
+        connection = FakeConnection()
+
+        cursor = make_cursor(connection)
+        registry.execute(cursor, query, ("ana",))
+        registry.execute(cursor, query, ("bia",))
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        assert statements.count(query.prepare_sql) == 1
+        assert statements.count(query.execute_sql) == 2
+
+        other = make_cursor(FakeConnection())
+        registry.execute(other, query, ("caio",))
+        assert other.execute.call_args_list[0].args[0] == query.prepare_sql
+
+    def test_plain_sql_when_disabled_or_unknown_connection(self):
+        registry = QueryRegistry(prepared_statements=False)
+        query = registry.register("by_id", "SELECT * FROM users WHERE id = %s")
+        cursor = make_cursor(FakeConnection())
+        registry.execute(cursor, query, (1,))
+        cursor.execute.assert_called_once_with(query.sql, (1,))
+
+        enabled = QueryRegistry(prepared_statements=True)
+        cursor = make_cursor(object())
+        enabled.execute(cursor, query, (1,))
+        cursor.execute.assert_called_once_with(query.sql, (1,))
+
+    def test_stats_histogram(self):
+        registry = QueryRegistry()
+        registry.register("hot", "SELECT 1")
+        registry.record("hot", 0.5, True)
+        registry.record("hot", 30, True)
+        registry.record("hot", 5000, False)
+
+        stats = registry.get_stats()["queries"]["hot"]
+        assert stats["count"] == 3
+        assert stats["errors"] == 1
+        assert stats["histogram"]["le_1ms"] == 1
+        assert stats["histogram"]["le_50ms"] == 1
+        assert stats["histogram"]["inf"] == 1
+
+    def test_ensure_keeps_first_registration(self):
+        registry = QueryRegistry()
+        first = registry.ensure("page", "SELECT 1")
+        assert registry.ensure("page", "SELECT 2") is first
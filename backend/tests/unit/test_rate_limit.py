@@ -0,0 +1,290 @@
+"""Testes do limite de requisições por janela deslizante."""
+
+import os
+import sys
+
+import jwt
+import pytest
+from flask import Flask, jsonify, request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.core.rate_limit import (
+    RateLimitExceeded,
+    RequestRateLimiter,
+    RouteClass,
+    SlidingWindowLimiter,
+    parse_rate,
+    rate_limit_class,
+    register_rate_limiting,
+    retry_after,
+)
+
+
+class FakeRedis:
+    """Executa a lógica do script Lua sobre um dicionário."""
+
+    def __init__(self, fail=False):
+        self.store = {}
+        self.calls = []
+        self.fail = fail
+
+    def register_script(self, script):
+        def run(keys, args):
+            self.calls.append((list(keys), list(args)))
+            if self.fail:
+                raise ConnectionError("redis fora do ar")
+            buckets = len(keys) // 2
+            for i in range(buckets):
+                limit, weight, cost = (
+                    int(args[4 * i]),
+                    float(args[4 * i + 1]),
+                    int(args[4 * i + 2]),
+                )
+                current = self.store.get(keys[2 * i], 0)
+                previous = self.store.get(keys[2 * i + 1], 0)
+                if previous * weight + current + cost > limit:
+                    return [i + 1, current, previous]
+            for i in range(buckets):
+                self.store[keys[2 * i]] = self.store.get(keys[2 * i], 0) + int(
+                    args[4 * i + 2]
+                )
+            return [0]
+
+        return run
+
+
+def test_parse_rate():
+    assert parse_rate("100 per hour") == (100, 3600)
+    assert parse_rate("5/minute") == (5, 60)
+    assert parse_rate("10 per seconds") == (10, 1)
+    assert parse_rate("muitos") is None
+    assert parse_rate(None) is None
+
+
+def test_memory_window_slides(fake_clock):
+    clock = fake_clock(6000.0)
+    limiter = SlidingWindowLimiter(clock=clock)
+    bucket = [("ip:1.2.3.4", 10, 60, 1)]
+
+    assert all(limiter.hit(bucket) is None for _ in range(10))
+    key, wait = limiter.hit(bucket)
+    assert key == "ip:1.2.3.4"
+    assert wait == 60 + 6  # próxima janela, até a anterior perder 1/10 do peso
+
+    # Metade da janela seguinte: a anterior ainda pesa 5
+    clock.now += 90
+    assert sum(limiter.hit(bucket) is None for _ in range(10)) == 5
+    assert limiter.get_stats()["rejected"] == 6
+
+
+def test_costs_are_charged_all_or_nothing(fake_clock):
+    limiter = SlidingWindowLimiter(clock=fake_clock(6000.0))
+    client = ("ip:1", 100, 60, 10)
+    scrape = ("scrape:ip:1", 2, 60, 1)
+
+    assert limiter.hit([client, scrape]) is None
+    assert limiter.hit([client, scrape]) is None
+    assert limiter.hit([client, scrape])[0] == "scrape:ip:1"
+    # O bucket do cliente não foi cobrado pela tentativa recusada
+    assert sum(limiter.hit([("ip:1", 100, 60, 10)]) is None for _ in range(10)) == 8
+
+
+def test_retry_after():
+    # Janela anterior cheia e atual vazia: espera a anterior perder peso
+    assert retry_after(10, 60, 0, current=0, previous=10, cost=1) == 6
+    assert retry_after(10, 60, 30, current=10, previous=0, cost=1) == 36
+    assert retry_after(5, 60, 0, current=0, previous=0, cost=10) == 60
+
+
+def test_redis_script_and_fallback(fake_clock):
+    fake = FakeRedis()
+    clock = fake_clock(6000.0)
+    limiter = SlidingWindowLimiter(client=fake, clock=clock)
+
+    assert limiter.hit([("user:ana", 3, 60, 2)]) is None
+    assert limiter.hit([("user:ana", 3, 60, 2)])[0] == "user:ana"
+    keys, args = fake.calls[0]
+    assert keys == ["ratelimit:user:ana:60:100", "ratelimit:user:ana:60:99"]
+    assert args[0] == 3 and args[2] == 2 and args[3] == 120000
+    assert limiter.get_stats()["backend"] == "redis"
+
+    # Redis caiu: o limite continua valendo em memória
+    broken = SlidingWindowLimiter(client=FakeRedis(fail=True), clock=clock)
+    assert broken.hit([("user:ana", 1, 60, 1)]) is None
+    assert broken.hit([("user:ana", 1, 60, 1)]) is not None
+    assert broken.get_stats()["redis_errors"] == 2
+
+
+class FakeAuth:
+    """``AuthManager`` falso: usuário a partir do header ``X-User``."""
+
+    def current_user(self):
+        return request.headers.get("X-User")
+
+
+@pytest.fixture
+def make_client(fake_clock):
+    """Monta o app de teste; devolve ``(app, client)``."""
+    return lambda **options: build_client(fake_clock(6000.0), **options)
+
+
+def build_client(clock, ip_rate=(3, 60), classes=None, user_rate=(100, 60)):
+    app = Flask(__name__)
+    app.config["RATELIMIT_ENABLED"] = True
+
+    @app.errorhandler(RateLimitExceeded)
+    def limited(e):
+        response = jsonify({"error": str(e)})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 429
+
+    @app.route("/leitura")
+    def leitura():
+        return "ok"
+
+    @app.route("/scrape")
+    @rate_limit_class("scrape")
+    def scrape():
+        return "ok"
+
+    @app.route("/health")
+    def health():
+        return "ok"
+
+    limiter = SlidingWindowLimiter(clock=clock)
+    register_rate_limiting(
+        app,
+        RequestRateLimiter(
+            limiter,
+            ip_rate=ip_rate,
+            user_rate=user_rate,
+            classes=classes
+            if classes is not None
+            else {"scrape": RouteClass(cost=2, rate=(5, 60))},
+        ),
+    )
+    client = app.test_client()
+    return app, client
+
+
+def test_flask_hook_limits_by_ip_and_route_cost(make_client):
+    _, client = make_client()
+
+    assert client.get("/scrape").status_code == 200  # custa 2 de 3
+    assert client.get("/leitura").status_code == 200
+    response = client.get("/leitura")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    assert all(client.get("/health").status_code == 200 for _ in range(5))
+    other = client.get("/leitura", environ_base={"REMOTE_ADDR": "10.0.0.9"})
+    assert other.status_code == 200
+
+
+def test_authenticated_clients_are_keyed_by_user(make_client):
+    app, client = make_client(ip_rate=(100, 60), user_rate=(2, 60))
+    app.jwt_auth = FakeAuth()
+
+    # O mesmo usuário, vindo de IPs diferentes, divide um único bucket
+    for ip in ("10.0.0.1", "10.0.0.2"):
+        response = client.get(
+            "/leitura", headers={"X-User": "ana"}, environ_base={"REMOTE_ADDR": ip}
+        )
+        assert response.status_code == 200
+    assert client.get("/leitura", headers={"X-User": "ana"}).status_code == 429
+    assert client.get("/leitura", headers={"X-User": "bia"}).status_code == 200
+    assert client.get("/leitura").status_code == 200
+
+
+def test_limits_follow_config_reload():
+    limiter = RequestRateLimiter(SlidingWindowLimiter())
+    limiter._apply_config(
+        {
+            "security": {
+                "rate_limit_per_minute": 7,
+                "rate_limit": {
+                    "enabled": False,
+                    "per_user_per_minute": 70,
+                    "classes": {"scrape": {"cost": 3, "per_minute": 2}},
+                },
+            }
+        }
+    )
+    assert limiter.ip_rate == (7, 60)
+    assert limiter.user_rate == (70, 60)
+    assert limiter.classes["scrape"].cost == 3
+    assert limiter.enabled is False
+
+    # Valores passados no construtor não são sobrescritos pela recarga
+    fixed = RequestRateLimiter(SlidingWindowLimiter(), ip_rate=(1, 60))
+    fixed._apply_config({"security": {"rate_limit_per_minute": 7}})
+    assert fixed.ip_rate == (1, 60)
+
+
+def test_disabled_in_testing_unless_enabled(make_client):
+    app, client = make_client(ip_rate=(1, 60))
+    app.config.pop("RATELIMIT_ENABLED")
+    app.testing = True
+    assert all(client.get("/leitura").status_code == 200 for _ in range(3))
+
+
+def test_admin_api_wiring():
+    from backend.apps.admin_api import create_app
+
+    app = create_app({"TESTING": True, "RATELIMIT_ENABLED": True})
+    assert app.view_functions["get_live_games"].rate_limit_class == "scrape"
+    assert app.view_functions["get_opportunities"].rate_limit_class == "scrape"
+    assert app.view_functions["jwt_login"].rate_limit_class == "auth"
+
+    # Contadores em memória: o teste não depende de um Redis local
+    app.rate_limiter.limiter = SlidingWindowLimiter()
+    app.rate_limiter.ip_rate = (1, 60)
+    client = app.test_client()
+    assert client.get("/api/status").status_code == 200
+    response = client.get("/api/status")
+    assert response.status_code == 429
+    assert response.get_json()["code"] == "rate_limited"
+    assert "Retry-After" in response.headers
+
+
+def test_admin_api_keys_by_user_and_forwarded_ip():
+    from backend.apps.admin_api import create_app
+
+    app = create_app({"TESTING": True, "RATELIMIT_ENABLED": True})
+    app.rate_limiter.limiter = SlidingWindowLimiter()
+    app.rate_limiter.ip_rate = (1, 60)
+    app.rate_limiter.user_rate = (2, 60)
+    with app.app_context():
+        token = app.jwt_auth.create_token(identity="ana", role="viewer")
+    # O PyJWT 2.10 recusa o ``sub`` em dicionário; o token entra já verificado
+    # no cache do AuthManager, o mesmo consultado pelo limite
+    claims = jwt.decode(
+        token,
+        app.config["JWT_SECRET_KEY"],
+        algorithms=["HS256"],
+        options={"verify_sub": False},
+    )
+    app.jwt_auth.token_cache.put(
+        app.jwt_auth.token_cache.key(token), jwt.get_unverified_header(token), claims
+    )
+    client = app.test_client()
+    auth = {"Authorization": f"Bearer {token}"}
+
+    # Usuário autenticado: limite por usuário, independente do IP
+    assert client.get("/api/status", headers=auth).status_code == 200
+    assert client.get("/api/status", headers=auth).status_code == 200
+    assert client.get("/api/status", headers=auth).status_code == 429
+
+    # Sem login: cada IP repassado pelo nginx tem o próprio bucket
+    for ip in ("203.0.113.1", "203.0.113.2"):
+        assert (
+            client.get("/api/status", headers={"X-Forwarded-For": ip}).status_code
+            == 200
+        )
+    assert (
+        client.get(
+            "/api/status", headers={"X-Forwarded-For": "203.0.113.1"}
+        ).status_code
+        == 429
+    )
@@ -0,0 +1,202 @@
+"""Testes unitários para o roteamento de leituras entre primário e réplicas."""
+
+import os
+import sys
+
+import psycopg2
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.database import database
+from backend.database.database import (
+    PostgresDatabaseManager,
+    ReplicaRouter,
+    is_write_query,
+)
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.connection = conn
+        self.rowcount = 1
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        if self.conn.fail:
+            # Como no psycopg2: a conexão perdida fica marcada como fechada
+            self.conn.closed = 2
+            raise psycopg2.OperationalError("conexão perdida")
+        self.conn.executed.append(query)
+        if "pg_last_xact_replay_timestamp" in query:
+            self._rows = [(self.conn.lag,)]
+        else:
+            self._rows = [{"id": 1, "source": self.conn.name}]
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    def __init__(self, name, lag=0.0):
+        self.name = name
+        self.lag = lag
+        self.fail = False
+        self.closed = 0
+        self.executed = []
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        if self.closed:
+            raise psycopg2.InterfaceError("connection already closed")
+
+
+class FakePool:
+    def __init__(self, name, lag=0.0, down=False):
+        self.conn = FakeConnection(name, lag)
+        self.down = down
+
+    def getconn(self):
+        if self.down:
+            raise psycopg2.OperationalError("réplica fora do ar")
+        return self.conn
+
+    def putconn(self, conn, close=False):
+        pass
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    fake = {"primary": FakePool("primary"), "r1": FakePool("r1"), "r2": FakePool("r2")}
+    monkeypatch.setattr(database, "_pools", fake)
+    return fake
+
+
+@pytest.fixture
+def make_manager(fake_clock):
+    """Gerenciador com roteador próprio; devolve ``(gerenciador, roteador)``."""
+    return lambda clock=None, **options: build_manager(
+        clock or fake_clock(100.0), **options
+    )
+
+
+def build_manager(clock, dsns=("r1",), **router_kwargs):
+    router = ReplicaRouter(
+        list(dsns),
+        max_lag_seconds=5,
+        lag_check_seconds=10,
+        retry_seconds=30,
+        read_after_write_seconds=2,
+        clock=clock,
+        **router_kwargs,
+    )
+    return PostgresDatabaseManager(dsn="primary", router=router), router
+
+
+def test_write_detection():
+    assert is_write_query("INSERT INTO bets (a) VALUES (%s) RETURNING id")
+    assert is_write_query("  update users set x = 1")
+    assert is_write_query("SELECT * FROM users WHERE id = %s FOR UPDATE")
+    assert not is_write_query("SELECT * FROM surebets ORDER BY detected_at DESC")
+
+
+def test_reads_go_to_replica_and_writes_to_primary(pools, make_manager):
+    db, _ = make_manager()
+    assert db.fetch_one("SELECT * FROM bets")["source"] == "r1"
+    assert db.insert("bets", {"a": 1}) == 1
+    assert pools["primary"].conn.executed[-1].startswith("INSERT INTO bets")
+
+
+def test_read_after_write_stays_on_primary(pools, fake_clock, make_manager):
+    clock = fake_clock(100.0)
+    db, router = make_manager(clock=clock)
+    db.execute("UPDATE users SET role = %s", ("admin",))
+    assert db.fetch_one("SELECT * FROM users")["source"] == "primary"
+
+    # Sem sessão, a escrita não afeta as outras instâncias do processo
+    other = PostgresDatabaseManager(dsn="primary", router=router)
+    assert other.fetch_one("SELECT * FROM users")["source"] == "r1"
+
+
+def test_read_after_write_is_scoped_to_the_session(pools, fake_clock, make_manager):
+    clock = fake_clock(100.0)
+    db, router = make_manager(clock=clock)
+    session = {"user": "ana"}
+    router.session_key = lambda: session["user"]
+    db.execute("UPDATE users SET role = %s", ("admin",))
+
+    def source():
+        reader = PostgresDatabaseManager(dsn="primary", router=router)
+        return reader.fetch_one("SELECT * FROM users")["source"]
+
+    assert source() == "primary"
+    session["user"] = "bia"
+    assert source() == "r1"
+    session["user"] = None
+    assert source() == "r1"
+    session["user"] = "ana"
+    clock.now += 3
+    assert source() == "r1"
+
+
+def test_lagging_replica_falls_back(pools, fake_clock, make_manager):
+    pools["r1"].conn.lag = 60.0
+    clock = fake_clock(100.0)
+    db, router = make_manager(dsns=("r1", "r2"), clock=clock)
+    for _ in range(3):
+        reader = PostgresDatabaseManager(dsn="primary", router=router)
+        assert reader.fetch_one("SELECT 1")["source"] == "r2"
+
+    # O atraso só é medido de novo após o intervalo configurado
+    lag_checks = [q for q in pools["r1"].conn.executed if "pg_is_in_recovery" in q]
+    assert len(lag_checks) == 1
+    assert not router.get_status()["replicas"][0]["available"]
+
+
+def test_unavailable_replica_is_quarantined(pools, fake_clock, make_manager):
+    pools["r1"].down = True
+    clock = fake_clock(100.0)
+    db, router = make_manager(clock=clock)
+    assert db.fetch_one("SELECT 1")["source"] == "primary"
+    assert router.candidates() == []
+
+    clock.now += 31
+    pools["r1"].down = False
+    reader = PostgresDatabaseManager(dsn="primary", router=router)
+    assert reader.fetch_one("SELECT 1")["source"] == "r1"
+
+
+def test_replica_failure_mid_query_retries_on_primary(pools, make_manager):
+    db, router = make_manager()
+    db.fetch("SELECT 1")
+    pools["r1"].conn.fail = True
+    assert db.fetch("SELECT 1")[0]["source"] == "primary"
+    assert router.candidates() == []
+
+
+def test_transaction_uses_primary(pools, make_manager):
+    db, _ = make_manager()
+    with db.transaction():
+        assert db.fetch_one("SELECT 1")["source"] == "primary"
+
+
+def test_named_queries_are_routed(pools, make_manager):
+    db, _ = make_manager()
+    assert db.fetch_one_named("user_profile", ("ana",))["source"] == "r1"
+    db.execute_named("user_update_last_login", (None, "ana"))
+    assert db.fetch_one_named("user_profile", ("ana",))["source"] == "primary"
@@ -0,0 +1,85 @@
+"""Testes da serialização JSON compartilhada (orjson e fallback da stdlib)."""
+
+import importlib
+import json
+import os
+import sys
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from flask import Flask, jsonify
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.core import serialization
+
+ROW = {
+    "id": 7,
+    "event": "São Paulo x Grêmio",
+    "profit": Decimal("2.35"),
+    "detected_at": datetime(2025, 6, 1, 12, 30, 5, 120000),
+    "start": datetime(2025, 6, 1, 15, 0, tzinfo=timezone.utc),
+    "day": date(2025, 6, 1),
+    "ref": UUID("12345678-1234-5678-1234-567812345678"),
+    "bookmakers": ("bet365", "betano"),
+    "odds": {1: 1.95, 2: 2.05},
+}
+
+EXPECTED = {
+    "id": 7,
+    "event": "São Paulo x Grêmio",
+    "profit": 2.35,
+    "detected_at": "2025-06-01T12:30:05.120000",
+    "start": "2025-06-01T15:00:00+00:00",
+    "day": "2025-06-01",
+    "ref": "12345678-1234-5678-1234-567812345678",
+    "bookmakers": ["bet365", "betano"],
+    "odds": {"1": 1.95, "2": 2.05},
+}
+
+
+@pytest.fixture
+def stdlib_serialization(monkeypatch):
+    """Módulo recarregado sem o orjson (fallback para o json padrão)."""
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    module = importlib.reload(serialization)
+    yield module
+    monkeypatch.undo()
+    importlib.reload(serialization)
+
+
+def test_dumps_handles_postgres_types():
+    text = serialization.dumps(ROW)
+    assert json.loads(text) == EXPECTED
+    assert "São Paulo" in text and ", " not in text
+    assert serialization.dumps_bytes(ROW) == text.encode("utf-8")
+    assert serialization.loads(text) == EXPECTED
+
+    with pytest.raises(TypeError):
+        serialization.dumps({"obj": object()})
+
+
+def test_stdlib_fallback_matches(stdlib_serialization):
+    assert stdlib_serialization.BACKEND == "json"
+    assert json.loads(stdlib_serialization.dumps(ROW)) == EXPECTED
+
+
+def test_flask_provider():
+    app = Flask(__name__)
+    serialization.register_json_provider(app)
+
+    with app.app_context():
+        response = jsonify(ROW)
+        assert response.mimetype == "application/json"
+        assert json.loads(response.get_data()) == EXPECTED
+        assert jsonify(1, 2).get_json() == [1, 2]
+        assert app.json.loads('{"a": 1}') == {"a": 1}
+
+
+def test_fastapi_response_class():
+    response_class = serialization.fast_json_response_class()
+    response = response_class({"profit": Decimal("1.5"), "at": date(2025, 1, 2)})
+    assert json.loads(response.body) == {"profit": 1.5, "at": "2025-01-02"}
+    assert response.media_type == "application/json"
@@ -0,0 +1,302 @@
+"""Testes unitários para a blacklist de tokens com Redis e cache local."""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
+
+from backend.core.auth import BLACKLIST_CHANNEL, ExpiringStore, TokenBlacklist
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        return [
+            getattr(self.redis, name)(*args, **kwargs)
+            for name, args, kwargs in self.calls
+        ]
+
+
+class FakeRedis:
+    """Subconjunto do cliente Redis usado pela blacklist."""
+
+    def __init__(self):
+        self.data = {}
+        self.zsets = {}
+        self.published = []
+        self.exists_keys = []
+        self.scans = 0
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, time.time() + ex if ex else None)
+        return True
+
+    def exists(self, key):
+        self.exists_keys.append(key)
+        return int(key in self.data or key in self.zsets)
+
+    def ttl(self, key):
+        if key not in self.data:
+            return -2
+        expires_at = self.data[key][1]
+        return -1 if expires_at is None else int(expires_at - time.time())
+
+    def expire(self, key, seconds):
+        return True
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+    def scan_iter(self, match=None, count=None):
+        self.scans += 1
+        prefix = match.rstrip("*")
+        return iter([key for key in list(self.data) if key.startswith(prefix)])
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def _score_range(self, key, low, high):
+        low = float("-inf") if low == "-inf" else float(low)
+        high = float("inf") if high == "+inf" else float(high)
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        return [(member, score) for member, score in items if low <= score <= high]
+
+    def zrangebyscore(self, key, low, high, withscores=False):
+        items = self._score_range(key, low, high)
+        return items if withscores else [member for member, _ in items]
+
+    def zremrangebyscore(self, key, low, high):
+        items = self._score_range(key, low, high)
+        for member, _ in items:
+            del self.zsets[key][member]
+        return len(items)
+
+    def zrange(self, key, start, end):
+        return [member for member, _ in self._score_range(key, "-inf", "+inf")]
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def future(seconds=3600):
+    return time.time() + seconds
+
+
+def test_unsynced_cache_falls_back_to_redis():
+    fake = FakeRedis()
+    blacklist = TokenBlacklist(client=fake)
+    fake.set("token_blacklist:abc", "1", ex=60)
+
+    assert blacklist.is_blacklisted("abc") is True
+    assert fake.exists_keys == ["token_blacklist:abc"]
+
+
+def test_synced_cache_answers_locally():
+    fake = FakeRedis()
+    TokenBlacklist(client=fake).add_to_blacklist("old", future())
+    blacklist = TokenBlacklist(client=fake)
+
+    blacklist._handle_message({"type": "subscribe", "data": 1})
+    assert blacklist.is_blacklisted("old") is True
+    assert blacklist.is_blacklisted("valid") is False
+    assert not [key for key in fake.exists_keys if key.startswith("token_blacklist:")]
+    assert blacklist.get_cache_status()["local_hits"] == 2
+
+
+def test_revocation_is_published_and_applied():
+    fake = FakeRedis()
+    writer = TokenBlacklist(client=fake)
+    reader = TokenBlacklist(client=fake)
+    reader._handle_message({"type": "subscribe", "data": 1})
+
+    writer.add_to_blacklist("new", future())
+    channel, message = fake.published[-1]
+    assert channel == BLACKLIST_CHANNEL
+    assert reader.is_blacklisted("new") is False
+
+    reader._handle_message({"type": "message", "data": message.encode()})
+    assert reader.is_blacklisted("new") is True
+
+
+def test_expired_entries_are_not_reported():
+    blacklist = TokenBlacklist(client=FakeRedis())
+    blacklist._handle_message({"type": "subscribe", "data": 1})
+    blacklist._apply_event(f"gone {time.time() - 1}")
+    assert blacklist.is_blacklisted("gone") is False
+
+
+def test_lookup_errors_fail_closed():
+    class BrokenRedis(FakeRedis):
+        def exists(self, key):
+            raise ConnectionError("redis fora do ar")
+
+    blacklist = TokenBlacklist(client=BrokenRedis())
+    assert blacklist.is_blacklisted("abc") is True
+
+
+def test_sync_keeps_revocations_made_during_the_read():
+    fake = FakeRedis()
+    TokenBlacklist(client=fake).add_to_blacklist("stored", future())
+    blacklist = TokenBlacklist(client=fake)
+    blacklist._local.add("local-only", future())
+
+    blacklist.sync_from_redis()
+    assert "stored" in blacklist._local and "local-only" in blacklist._local
+
+
+def test_legacy_keys_are_indexed_once():
+    fake = FakeRedis()
+    fake.set("token_blacklist:legacy", "1", ex=60)
+    blacklist = TokenBlacklist(client=fake)
+
+    blacklist.sync_from_redis()
+    blacklist.sync_from_redis()
+    assert fake.scans == 1
+    assert blacklist._local.contains("legacy")
+    assert blacklist.get_blacklist_size() == 1
+
+
+class TestUserTokenIndex:
+    def test_redis_per_user_index(self):
+        fake = FakeRedis()
+        blacklist = TokenBlacklist(client=fake)
+        blacklist.register_token("ana", "a1", future())
+        blacklist.register_token("ana", "a2", future())
+        blacklist.register_token("bia", "b1", future())
+        blacklist.add_to_blacklist("a1", future(), "ana")
+
+        assert blacklist.get_user_tokens("ana") == (["a2"], ["a1"])
+        assert blacklist.revoke_user("ana") == 1
+        active, revoked = blacklist.get_user_tokens("ana")
+        assert active == [] and sorted(revoked) == ["a1", "a2"]
+        assert blacklist.is_blacklisted("a2") is True
+        assert blacklist.get_user_tokens("bia") == (["b1"], [])
+        assert blacklist.get_blacklist_size() == 2
+        assert fake.scans == 0
+
+    def test_expired_tokens_leave_the_index(self):
+        fake = FakeRedis()
+        blacklist = TokenBlacklist(client=fake)
+        blacklist.register_token("ana", "old", time.time() - 1)
+        blacklist.register_token("ana", "new", future())
+        assert blacklist.get_user_tokens("ana") == (["new"], [])
+
+    def test_memory_fallback(self):
+        blacklist = TokenBlacklist(redis_url="")
+        blacklist.register_token("ana", "a1", future())
+        blacklist.register_token("ana", "a2", future())
+        blacklist.add_to_blacklist("a1", future())
+
+        assert blacklist.get_user_tokens("ana") == (["a2"], ["a1"])
+        assert blacklist.revoke_user("ana") == 1
+        assert blacklist.is_blacklisted("a2") is True
+
+
+class TestExpiringStore:
+    def test_lookup_respects_expiry(self, fake_clock):
+        clock = fake_clock(1000.0)
+        store = ExpiringStore(clock=clock)
+        store.add("a", 1010)
+        assert "a" in store
+        clock.now = 1010
+        assert "a" not in store
+
+    def test_purge_removes_only_expired(self, fake_clock):
+        clock = fake_clock(1000.0)
+        store = ExpiringStore(clock=clock)
+        for i in range(10):
+            store.add(f"old{i}", 1001 + i)
+        store.add("live", 5000)
+        clock.now = 2000
+        assert store.purge() == 10
+        assert len(store) == 1
+        assert store.items() == [("live", 5000.0)]
+
+    def test_readding_extends_expiry(self, fake_clock):
+        clock = fake_clock(1000.0)
+        store = ExpiringStore(clock=clock)
+        store.add("a", 1001)
+        store.add("a", 3000)
+        clock.now = 2000
+        assert store.purge() == 0
+        assert "a" in store
+
+    def test_inserts_amortize_cleanup(self, fake_clock):
+        clock = fake_clock(1000.0)
+        store = ExpiringStore(clock=clock)
+        for i in range(100):
+            store.add(f"t{i}", 1001)
+        clock.now = 2000
+        for i in range(100):
+            store.add(f"n{i}", 9000)
+        assert len(store) == 100
+        assert len(store._heap) <= 2 * len(store) + 64
+
+    def test_concurrent_writers_and_readers(self):
+        store = ExpiringStore()
+        errors = []
+
+        def writer(prefix):
+            try:
+                for i in range(2000):
+                    # Metade já vencida, para que as inserções também removam chaves
+                    store.add(f"{prefix}{i}", time.time() + (-1 if i % 2 else 60))
+                    store.items()
+            except Exception as e:  # pragma: no cover - só em caso de corrida
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(p,)) for p in "abcd"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert all(f"{p}0" in store for p in "abcd")
+        assert len(store.items()) == 4 * 1000
+
+
+def test_forked_worker_restarts_listener_and_sees_new_revocations(monkeypatch):
+    fake = FakeRedis()
+    writer = TokenBlacklist(client=fake)
+    blacklist = TokenBlacklist(client=fake)
+    started = []
+    monkeypatch.setattr(blacklist, "start_listener", lambda: started.append(True))
+    # Estado do mestre no momento do fork: assinante ativo e cópia sincronizada
+    blacklist._local_cache = True
+    blacklist._listener_pid = os.getpid()
+    blacklist._handle_message({"type": "subscribe", "data": 1})
+    inherited = blacklist._local
+
+    monkeypatch.setattr("backend.core.auth.os.getpid", lambda: -1)
+    writer.add_to_blacklist("after-fork", future())
+
+    # Sem assinante no worker: a consulta vai ao Redis até a nova sincronização
+    assert blacklist.is_blacklisted("after-fork") is True
+    assert started == [True]
+    assert blacklist._local is not inherited
+    assert blacklist.get_cache_status()["synced"] is False
+
+    blacklist._handle_message({"type": "subscribe", "data": 1})
+    writer.add_to_blacklist("later", future())
+    blacklist._handle_message({"type": "message", "data": fake.published[-1][1]})
+    assert blacklist.is_blacklisted("later") is True
+    assert blacklist.is_blacklisted("after-fork") is True
+    assert started == [True]
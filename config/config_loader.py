@@ -1,8 +1,43 @@
-import yaml
+"""
+Carregamento e recarga a quente do config.yaml.
+
+``CONFIG`` é um serviço que expõe o snapshot atual da configuração como um
+mapeamento imutável (``CONFIG["postgres"]["host"]`` e também
+``CONFIG.postgres.host``). Um observador por mtime relê o arquivo quando ele
+muda, valida e troca o snapshot atomicamente; em caso de erro o snapshot
+anterior é mantido. Componentes com caminhos quentes assinam mudanças
+(``CONFIG.subscribe``) e guardam os valores que usam, em vez de consultar
+``CONFIG[...]`` a cada chamada.
+"""
+
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import os
+import threading
+
+import yaml
+
+logger = logging.getLogger(__name__)
 
 CONFIG_PATH = Path(__file__).parent.parent / "config" / "config.yaml"
 
+# Intervalo padrão de verificação do arquivo (project.config_watch_seconds; 0 desativa)
+DEFAULT_WATCH_SECONDS = 5.0
+
+# Seções obrigatórias e tipos das chaves usadas em caminhos quentes
+REQUIRED_SECTIONS = ("project", "server", "security", "postgres", "services", "ui")
+TYPED_KEYS = {
+    "services.arbitrage.min_profit_percent": (int, float),
+    "services.arbitrage.scan_interval_seconds": (int, float),
+    "security.rate_limit_per_minute": (int,),
+    "ui.items_per_page": (int,),
+}
+
+
+class ConfigError(Exception):
+    """Configuração inválida (o snapshot anterior continua em uso)."""
+
 
 def load_config(path: str = None):
     """
@@ -14,7 +49,297 @@ def load_config(path: str = None):
     return config
 
 
-# Exemplo de uso:
-CONFIG = load_config()
+# ============= SNAPSHOT IMUTÁVEL =============
+
+
+class FrozenConfig(dict):
+    """
+    Dicionário imutável com acesso por atributo.
+
+    Continua sendo um ``dict`` (serializável em JSON, ``isinstance`` e
+    ``.get`` funcionam), mas qualquer escrita levanta ``TypeError``. As
+    chaves que são identificadores também ficam no ``__dict__`` da
+    instância, então ``config.ui.language`` é uma busca direta de atributo.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        frozen = {key: freeze(value) for key, value in data.items()}
+        super().__init__(frozen)
+        vars(self).update(
+            (key, value)
+            for key, value in frozen.items()
+            if isinstance(key, str) and key.isidentifier() and not hasattr(dict, key)
+        )
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Configuração é imutável; use CONFIG.override() ou edite o config.yaml")
+
+    __setitem__ = __delitem__ = __setattr__ = __delattr__ = _readonly
+    clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenConfig, (thaw(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """Converte dicts/listas do YAML em ``FrozenConfig``/tuplas."""
+    if isinstance(value, FrozenConfig):
+        return value
+    if isinstance(value, dict):
+        return FrozenConfig(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Cópia mutável (dicts/listas comuns) de um valor congelado."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _merge(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def get_path(config: Any, path: Optional[str], default: Any = None) -> Any:
+    """Valor em um caminho pontilhado (``"services.arbitrage"``) ou ``default``."""
+    if not path:
+        return config
+    node = config
+    for part in path.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return default
+        node = node[part]
+    return node
+
+
+def validate_config(data: Any):
+    """Valida a estrutura mínima da configuração; levanta ``ConfigError``."""
+    if not isinstance(data, dict):
+        raise ConfigError("config.yaml deve conter um mapeamento na raiz")
+    missing = [section for section in REQUIRED_SECTIONS if not isinstance(data.get(section), dict)]
+    if missing:
+        raise ConfigError(f"Seções ausentes ou inválidas no config.yaml: {', '.join(missing)}")
+    for path, types in TYPED_KEYS.items():
+        value = get_path(data, path)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, types) or value < 0:
+            raise ConfigError(f"Valor inválido para {path}: {value!r}")
+
+
+# ============= SERVIÇO =============
+
+
+class ConfigService:
+    """
+    Fachada de ``CONFIG``: snapshot imutável atual, recarga e assinantes.
+
+    Implementa a interface de mapeamento delegando ao snapshot atual, então
+    módulos que guardaram ``CONFIG`` no import enxergam as recargas.
+    """
+
+    def __init__(self, path=CONFIG_PATH):
+        self.path = Path(path)
+        self.version = 0
+        self._lock = threading.RLock()
+        self._raw: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        self._subscribers: List[Tuple[Optional[str], Callable[[FrozenConfig], None]]] = []
+        self._stamp = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._snapshot = FrozenConfig({})
+        self.reload(raise_errors=True)
+
+    # ============= MAPEAMENTO =============
+
+    @property
+    def snapshot(self) -> FrozenConfig:
+        """Snapshot atual; guarde-o para leituras consistentes de várias chaves."""
+        return self._snapshot
+
+    def __getitem__(self, key):
+        return self._snapshot[key]
+
+    def __contains__(self, key):
+        return key in self._snapshot
+
+    def __iter__(self):
+        return iter(self._snapshot)
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def __getattr__(self, name):
+        snapshot = self.__dict__.get("_snapshot")
+        if snapshot is None or name not in snapshot:
+            raise AttributeError(name)
+        return snapshot[name]
+
+    def get(self, key, default=None):
+        return self._snapshot.get(key, default)
+
+    def keys(self):
+        return self._snapshot.keys()
+
+    def items(self):
+        return self._snapshot.items()
+
+    def values(self):
+        return self._snapshot.values()
+
+    def get_path(self, path: str, default: Any = None) -> Any:
+        return get_path(self._snapshot, path, default)
+
+    def __repr__(self):
+        return f"<ConfigService {self.path} v{self.version}>"
+
+    # ============= RECARGA =============
+
+    def _file_stamp(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def reload(self, raise_errors: bool = False) -> bool:
+        """Relê o arquivo; retorna True se o snapshot mudou."""
+        with self._lock:
+            try:
+                stamp = self._file_stamp()
+                raw = load_config(self.path)
+                validate_config(_merge(raw or {}, self._overrides))
+            except (OSError, yaml.YAMLError, ConfigError) as e:
+                if raise_errors:
+                    raise
+                logger.error(f"Configuração não recarregada ({self.path}): {e}")
+                return False
+            self._stamp = stamp
+            self._raw = raw
+            return self._swap()
+
+    def check_for_changes(self) -> bool:
+        """Recarrega se o mtime/tamanho do arquivo mudou."""
+        try:
+            stamp = self._file_stamp()
+        except OSError as e:
+            logger.error(f"Erro ao verificar {self.path}: {e}")
+            return False
+        if stamp == self._stamp:
+            return False
+        return self.reload()
+
+    def override(self, values: Dict[str, Any]) -> bool:
+        """
+        Sobrepõe valores ao arquivo neste processo (testes, ferramentas).
+
+        As sobreposições persistem entre recargas do arquivo.
+        """
+        with self._lock:
+            overrides = _merge(self._overrides, values)
+            validate_config(_merge(self._raw, overrides))
+            self._overrides = overrides
+            return self._swap()
+
+    def clear_overrides(self) -> bool:
+        with self._lock:
+            self._overrides = {}
+            return self._swap()
+
+    def _swap(self) -> bool:
+        new = FrozenConfig(_merge(self._raw, self._overrides))
+        old = self._snapshot
+        if new == old:
+            return False
+        self._snapshot = new
+        self.version += 1
+        if self.version > 1:
+            logger.info(f"Configuração recarregada (versão {self.version})")
+        self._notify(old, new)
+        return True
+
+    # ============= ASSINANTES =============
+
+    def subscribe(
+        self, callback: Callable[[FrozenConfig], None], path: Optional[str] = None
+    ) -> Callable[[], None]:
+        """
+        Registra ``callback(config)`` para mudanças (opcionalmente só em ``path``).
+
+        O callback é chamado imediatamente com o snapshot atual, para que o
+        assinante inicialize seus valores no mesmo lugar em que os atualiza.
+        Retorna uma função que cancela a assinatura.
+        """
+        entry = (path, callback)
+        with self._lock:
+            self._subscribers.append(entry)
+            snapshot = self._snapshot
+        callback(snapshot)
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def _notify(self, old: FrozenConfig, new: FrozenConfig):
+        for path, callback in list(self._subscribers):
+            if path and get_path(old, path) == get_path(new, path):
+                continue
+            try:
+                callback(new)
+            except Exception as e:
+                logger.error(f"Erro em assinante da configuração ({path or '*'}): {e}")
+
+    # ============= OBSERVADOR =============
+
+    def start_watching(self, interval: Optional[float] = None) -> bool:
+        """Inicia (uma vez por processo) a thread que observa o arquivo."""
+        if interval is None:
+            interval = float(
+                self._snapshot.get("project", {}).get("config_watch_seconds", DEFAULT_WATCH_SECONDS)
+            )
+        if interval <= 0:
+            return False
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return False
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name="config-watcher", daemon=True
+            )
+            self._watcher.start()
+        logger.info(f"Observando {self.path} a cada {interval}s")
+        return True
+
+    def stop_watching(self):
+        self._stop.set()
+        watcher = self._watcher
+        if watcher is not None:
+            watcher.join(timeout=5)
+        self._watcher = None
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            self.check_for_changes()
+
+
+CONFIG = ConfigService()
 
-# Para acessar: CONFIG['project']['name'], CONFIG['postgres']['host'], etc.
+# Para acessar: CONFIG['project']['name'], CONFIG.postgres.host, etc.
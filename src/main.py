@@ -1,17 +1,19 @@
 import sys
 import os
+import signal
 import subprocess
+import time
 from pathlib import Path
 import logging
 
 # Caminhos relativos robustos
 BASE_DIR = Path(__file__).parent.resolve()
-BACKEND_DIR = BASE_DIR.parent / "backend"
-DB_SCHEMA = BACKEND_DIR / "database" / "schema.sql"
-DB_POPULATE = BACKEND_DIR / "database" / "populate.sql"
 
-DASH_PATH = str(BACKEND_DIR / "apps" / "dashboard.py")
-ADMIN_API_PATH = str(BACKEND_DIR / "apps" / "admin_api.py")
+# Cada serviço roda num servidor WSGI multi-worker (src/serve.py)
+SERVE_PATH = str(BASE_DIR / "serve.py")
+SERVICES = (("dashboard", 8050), ("admin_api", 5000))
+READY_FD_ENV = "SUREBETS_READY_FD"
+GRACEFUL_TIMEOUT = 35
 
 processes = []
 
@@ -27,59 +29,56 @@ logging.basicConfig(
 
 
 def init_database():
-    """Inicializa o banco de dados SQLite com schema e dados"""
-    logging.info("Inicializando banco de dados SQLite...")
+    """Aplica as migrações pendentes do banco PostgreSQL."""
+    logging.info("Verificando migrações do banco de dados...")
     try:
-        backend_path = str(BACKEND_DIR)
-        if backend_path not in sys.path:
-            sys.path.insert(0, backend_path)
         project_root = str(BASE_DIR.parent)
         if project_root not in sys.path:
             sys.path.insert(0, project_root)
-        from backend.database.database import DatabaseManager
-
-        db = DatabaseManager()
-        result = db.fetch_one(
-            "SELECT COUNT(*) as count FROM sqlite_master WHERE type='table'"
-        )
-        if result and result["count"] > 0:
-            logging.info("Banco de dados já existe e está configurado.")
-            return
-        logging.info("Criando estrutura do banco...")
-        with open(DB_SCHEMA, "r", encoding="utf-8") as f:
-            schema_sql = f.read()
-            for statement in schema_sql.split(";"):
-                statement = statement.strip()
-                if statement:
-                    db.execute(statement)
-        if DB_POPULATE.exists():
-            logging.info("Populando banco com dados iniciais...")
-            with open(DB_POPULATE, "r", encoding="utf-8") as f:
-                populate_sql = f.read()
-                for statement in populate_sql.split(";"):
-                    statement = statement.strip()
-                    if statement:
-                        db.execute(statement)
-        logging.info("Banco de dados SQLite inicializado com sucesso!")
+        from backend.database.migrations import migrate
+
+        applied = migrate()
+        if applied:
+            logging.info(
+                f"Migrações aplicadas: {', '.join(str(m.version) for m in applied)}"
+            )
     except Exception as e:
         logging.error(f"Erro ao inicializar banco de dados: {e}")
-        import traceback
-
-        traceback.print_exc()
         sys.exit(1)
 
 
-def run_dash():
+def start_service(service):
+    """
+    Inicia ``src/serve.py <service>`` e retorna ``(processo, fd_de_readiness)``.
+
+    O serviço escreve ``ready`` no pipe quando está aceitando conexões; se o
+    processo morrer antes, o pipe fecha e a falha é detectada na hora.
+    """
     env = os.environ.copy()
-    return subprocess.Popen([sys.executable, DASH_PATH], env=env)
+    if os.name == "nt":
+        return subprocess.Popen([sys.executable, SERVE_PATH, service], env=env), None
+    read_fd, write_fd = os.pipe()
+    env[READY_FD_ENV] = str(write_fd)
+    process = subprocess.Popen(
+        [sys.executable, SERVE_PATH, service], env=env, pass_fds=(write_fd,)
+    )
+    os.close(write_fd)
+    return process, read_fd
 
 
-def run_admin_api():
-    env = os.environ.copy()
-    return subprocess.Popen([sys.executable, ADMIN_API_PATH], env=env)
+def wait_ready(read_fd, timeout=40):
+    """Aguarda o aviso de readiness do serviço pelo pipe."""
+    import select
+
+    try:
+        readable, _, _ = select.select([read_fd], [], [], timeout)
+        return bool(readable) and os.read(read_fd, 16).startswith(b"ready")
+    finally:
+        os.close(read_fd)
 
 
 def wait_service_ready(url, timeout=30):
+    """Sondagem HTTP de ``/health/ready`` (apenas Windows, sem pipe de readiness)."""
     import requests
     import time
 
@@ -90,39 +89,71 @@ def wait_service_ready(url, timeout=30):
             if resp.status_code == 200:
                 return True
         except Exception:
-            time.sleep(1)
+            pass
+        time.sleep(1)
     return False
 
 
+def stop_services(signum=signal.SIGTERM):
+    """Repassa o sinal aos mestres (SIGTERM encerra com graceful shutdown)."""
+    for p in processes:
+        if p.poll() is None:
+            p.send_signal(signum)
+    for p in processes:
+        try:
+            p.wait(timeout=GRACEFUL_TIMEOUT)
+        except Exception:
+            p.kill()
+
+
+def reload_services(signum, frame):
+    """
+    SIGHUP: substitui os workers dos serviços sem derrubar conexões.
+
+    O app pré-carregado no mestre não é recarregado: código novo exige
+    reiniciar o serviço (ver ``src/serve.py``).
+    """
+    logging.info("Recarregando workers dos serviços...")
+    for p in processes:
+        if p.poll() is None:
+            p.send_signal(signal.SIGHUP)
+
+
 if __name__ == "__main__":
     logging.info("Iniciando Surebets System (Versão Unificada)...")
     logging.info(
         "Se o antivírus acusar falso positivo, adicione uma exceção para este executável."
     )
     init_database()
-    processes.append(run_dash())
-    processes.append(run_admin_api())
+    started = []
+    for service, port in SERVICES:
+        process, ready_fd = start_service(service)
+        processes.append(process)
+        started.append((service, port, ready_fd))
+    for service, port, ready_fd in started:
+        logging.info(f"Aguardando {service}...")
+        if ready_fd is not None:
+            ready = wait_ready(ready_fd, timeout=40)
+        else:
+            ready = wait_service_ready(
+                f"http://localhost:{port}/health/ready", timeout=40
+            )
+        if not ready:
+            logging.error(f"{service} não ficou pronto a tempo. Encerrando...")
+            stop_services()
+            sys.exit(1)
     logging.info("Dashboard Unificado: http://localhost:8050")
     logging.info("Admin API Unificada: http://localhost:5000")
-    logging.info("Aguardando backend Dash...")
-    if not wait_service_ready("http://localhost:8050", timeout=40):
-        logging.error("Dash não respondeu a tempo. Encerrando...")
-        for p in processes:
-            p.terminate()
-        sys.exit(1)
-    logging.info("Aguardando backend Admin API...")
-    if not wait_service_ready("http://localhost:5000/api/games/live", timeout=40):
-        logging.error("Admin API não respondeu a tempo. Encerrando...")
-        for p in processes:
-            p.terminate()
-        sys.exit(1)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, reload_services)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     try:
-        input("Pressione Enter para encerrar...")
+        logging.info("Pressione Ctrl+C para encerrar.")
+        while all(p.poll() is None for p in processes):
+            time.sleep(1)
+        logging.error("Um dos serviços terminou inesperadamente. Encerrando...")
+    except KeyboardInterrupt:
+        pass
     finally:
-        for p in processes:
-            p.terminate()
-            try:
-                p.wait(timeout=5)
-            except Exception:
-                pass
+        stop_services()
         logging.info("Surebets System finalizado.")
@@ -0,0 +1,199 @@
+"""
+Servidor de produção do dashboard e da API administrativa.
+
+Cada serviço roda num mestre Gunicorn próprio com ``server.workers`` workers
+(classe ``gthread``, para que os streams SSE do dashboard não prendam o
+worker inteiro). A aplicação é carregada uma vez no mestre (``preload``) e
+herdada pelos workers via fork; workers são reciclados após
+``server.max_requests`` requisições (com jitter) e substituídos sem queda com
+``SIGHUP`` no mestre.
+
+Com o ``preload``, o ``SIGHUP`` apenas recria os workers a partir do app já
+carregado no mestre: código, adaptadores, schemas e migrações não são
+recarregados (o config.yaml já é acompanhado pelo observador). Para publicar
+código novo, reinicie o serviço ou envie ``USR2`` ao mestre, que executa um
+mestre novo com o código atual; depois de ele ficar pronto, encerre o antigo
+com ``QUIT``.
+
+Uso::
+
+    python src/serve.py dashboard
+    python src/serve.py admin_api
+
+Se ``SUREBETS_READY_FD`` estiver definido, o mestre escreve ``ready`` nesse
+descritor quando está aceitando conexões (usado por ``src/main.py``). Sem o
+Gunicorn (ex.: Windows) cai no servidor de desenvolvimento, com aviso.
+"""
+
+from pathlib import Path
+import argparse
+import logging
+import os
+import sys
+
+BASE_DIR = Path(__file__).parent.resolve()
+PROJECT_ROOT = str(BASE_DIR.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from config.config_loader import CONFIG  # noqa: E402
+from config import settings  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+READY_FD_ENV = "SUREBETS_READY_FD"
+
+SERVICES = {
+    "dashboard": {"port": settings.UNIFIED_DASHBOARD_PORT},
+    "admin_api": {"port": settings.UNIFIED_ADMIN_API_PORT},
+}
+
+
+def load_wsgi_app(service: str):
+    """Importa o app WSGI do serviço (executado uma vez no mestre)."""
+    if service == "dashboard":
+        from backend.apps import dashboard
+
+        return dashboard.app.server
+    from backend.apps import admin_api
+    from backend.core.validation import build_schemas
+
+    apply_migrations()
+    # Constrói no mestre o que os workers herdam prontos via fork
+    build_schemas()
+    return admin_api.app
+
+
+def apply_migrations():
+    """
+    Aplica migrações pendentes antes de aceitar conexões
+    (``postgres.migrate_on_start``).
+
+    Vários serviços/containers podem fazer isso ao mesmo tempo: o advisory
+    lock das migrações serializa a aplicação. Com o banco fora do ar o
+    serviço sobe mesmo assim e o readiness indica a falha.
+    """
+    if not CONFIG["postgres"].get("migrate_on_start", True):
+        return
+    from backend.database.migrations import migrate
+
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Migrações não aplicadas na inicialização: {e}")
+
+
+def on_worker_start(service: str):
+    """Reinicia no worker as threads do mestre, que não sobrevivem ao fork."""
+    CONFIG.start_watching()
+    if service == "dashboard":
+        from backend.apps.dashboard import DASHBOARD_DATA
+
+        DASHBOARD_DATA.start_background()
+
+
+def on_worker_exit(service: str):
+    """Tira o worker do balanceamento antes de encerrar."""
+    module = sys.modules.get(
+        "backend.apps.dashboard" if service == "dashboard" else "backend.apps.admin_api"
+    )
+    app = getattr(module, "app", None)
+    flask_app = getattr(app, "server", app)
+    health = getattr(flask_app, "health", None)
+    if health is not None:
+        health.mark_draining()
+
+
+def notify_ready():
+    """Avisa o processo pai (``src/main.py``) de que o serviço está no ar."""
+    fd = os.environ.pop(READY_FD_ENV, None)
+    if not fd:
+        return
+    try:
+        os.write(int(fd), b"ready\n")
+        os.close(int(fd))
+    except OSError as e:
+        logger.warning(f"Não foi possível avisar readiness ao processo pai: {e}")
+
+
+def gunicorn_options(service: str, port: int = None) -> dict:
+    """Opções do Gunicorn a partir da seção ``server`` do config.yaml."""
+    from backend.database.database import close_pools
+
+    server = CONFIG["server"]
+    return {
+        "bind": f"{server.get('host', '0.0.0.0')}:{port or SERVICES[service]['port']}",
+        "workers": int(server.get("workers", 4)),
+        "worker_class": "gthread",
+        "threads": int(server.get("threads", 4)),
+        # SIGHUP não recarrega o código pré-carregado (ver docstring do módulo)
+        "preload_app": True,
+        "max_requests": int(server.get("max_requests", 1000)),
+        "max_requests_jitter": int(server.get("max_requests_jitter", 100)),
+        "timeout": int(server.get("worker_timeout_seconds", 60)),
+        "graceful_timeout": int(server.get("graceful_timeout_seconds", 30)),
+        "keepalive": int(server.get("keepalive_seconds", 5)),
+        "proc_name": f"surebets-{service}",
+        "accesslog": "-" if server.get("access_log", False) else None,
+        # Conexões abertas no carregamento não podem ser herdadas pelos workers
+        "pre_fork": lambda arbiter, worker: close_pools(),
+        "post_fork": lambda arbiter, worker: on_worker_start(service),
+        "worker_exit": lambda arbiter, worker: on_worker_exit(service),
+        "when_ready": lambda arbiter: notify_ready(),
+    }
+
+
+def run_gunicorn(service: str, port: int = None):
+    from gunicorn.app.base import BaseApplication
+
+    class SurebetsApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            return load_wsgi_app(service)
+
+    options = gunicorn_options(service, port)
+    logger.info(
+        f"Iniciando {service} em {options['bind']} "
+        f"({options['workers']} workers x {options['threads']} threads)"
+    )
+    SurebetsApplication(options).run()
+
+
+def run_development(service: str, port: int = None):
+    logger.warning(
+        f"Gunicorn indisponível; {service} no servidor de desenvolvimento "
+        "(processo único)"
+    )
+    app = load_wsgi_app(service)
+    on_worker_start(service)
+    notify_ready()
+    app.run(host="0.0.0.0", port=port or SERVICES[service]["port"], threaded=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de produção do Surebets")
+    parser.add_argument("service", choices=sorted(SERVICES))
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        run_development(args.service, args.port)
+    else:
+        run_gunicorn(args.service, args.port)
+
+
+if __name__ == "__main__":
+    main()